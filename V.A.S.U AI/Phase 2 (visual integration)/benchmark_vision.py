@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Vision pipeline benchmark.
+
+Drives ObjectDetector, SceneAnalyzer and the futuristic HUD overlay / Qt
+conversion over synthetic or recorded frames and reports throughput and
+p50/p95/p99 latency per stage. Results are written as JSON + CSV so
+builds can be compared:
+
+    python benchmark_vision.py --frames 300
+    python benchmark_vision.py --source clips/lobby.mp4 --compare data/benchmarks/baseline.json
+"""
+import argparse
+import csv
+import json
+import os
+import platform
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent))
+
+# No window is shown, Qt only converts images
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import cv2
+import numpy as np
+from config.settings import Settings
+
+STAGES = ["capture", "preprocess", "forward", "postprocess", "nms", "scene", "overlay", "conversion"]
+BATCHED_STAGES = {"preprocess", "forward"}  # One sample covers a whole batch of frames
+
+
+class StageTimer:
+    """Collects per-stage samples (seconds)."""
+    def __init__(self):
+        self.samples = {stage: [] for stage in STAGES}
+
+    def time(self, stage, func, *args):
+        start = time.perf_counter()
+        result = func(*args)
+        self.samples[stage].append(time.perf_counter() - start)
+        return result
+
+    def summary(self, batch=1):
+        results = {}
+        for stage, values in self.samples.items():
+            if not values:
+                continue
+            ms = np.array(values) * 1000
+            frames_per_sample = batch if stage in BATCHED_STAGES else 1
+            results[stage] = {
+                "count": len(values),
+                "mean_ms": round(float(ms.mean()), 3),
+                "p50_ms": round(float(np.percentile(ms, 50)), 3),
+                "p95_ms": round(float(np.percentile(ms, 95)), 3),
+                "p99_ms": round(float(np.percentile(ms, 99)), 3),
+                "max_ms": round(float(ms.max()), 3),
+                "throughput_fps": round(1000.0 * frames_per_sample / float(ms.mean()), 1) if ms.mean() > 0 else None
+            }
+        return results
+
+
+def load_frames(settings, source_spec, count):
+    """Reads `count` frames up front so decoding doesn't skew the other stages."""
+    from phase2_vision_system.frame_sources import create_source
+
+    settings.PLAYBACK_SPEED = 0  # As fast as possible
+    source = create_source(source_spec, settings)
+    if not source.open():
+        raise RuntimeError(f"Could not open source {source_spec}")
+
+    timer_frames = []
+    frames = []
+    while len(frames) < count:
+        start = time.perf_counter()
+        frame = source.read()
+        if frame is None:
+            break
+        timer_frames.append(time.perf_counter() - start)
+        frames.append(frame.copy())
+    source.release()
+    return frames, timer_frames
+
+
+def run_benchmark(args):
+    settings = Settings()
+    frames, capture_times = load_frames(settings, args.source, args.frames + args.warmup)
+    if not frames:
+        raise RuntimeError("Source produced no frames")
+
+    timer = StageTimer()
+    timer.samples["capture"] = capture_times[args.warmup:]
+
+    from phase2_vision_system.object_detector import ObjectDetector
+    from phase2_vision_system.scene_analyzer import SceneAnalyzer
+    from phase2_vision_system.detections import DetectionBatch
+
+    detector = ObjectDetector()
+    detector.input_size = args.input_size
+    if not detector.initialize():
+        print("⚠️ Detector unavailable (run setup_models.py), skipping detector stages.")
+        detector = None
+    analyzer = SceneAnalyzer()
+
+    try:
+        from phase2_vision_system.overlay_renderer import OverlayRenderer
+        from phase2_vision_system.hud_video import frame_to_pixmap
+        from PyQt6.QtWidgets import QApplication
+        from PyQt6.QtGui import QPainter
+        app = QApplication.instance() or QApplication(sys.argv)
+    except ImportError as e:
+        print(f"⚠️ PyQt6 unavailable ({e}), skipping overlay/conversion stages.")
+        frame_to_pixmap = None
+    else:
+        overlay = OverlayRenderer("futuristic")
+
+    def draw_overlay(pixmap, batch, scale):
+        # Same layer the HUD paints on top of the video
+        painter = QPainter(pixmap)
+        overlay.paint(painter, batch, scale, pixmap.size())
+        painter.end()
+
+    # Fallback boxes so the overlay is still exercised without a model
+    dummy_tracks = [(i, "person", 0.9, [40 + 100 * i, 60, 80, 160]) for i in range(5)]
+
+    class_names = detector.classes if detector else ("person",)
+    batch = max(1, args.batch)
+    for start in range(0, len(frames), batch):
+        chunk = frames[start:start + batch]
+        record = start >= args.warmup
+        stage_timer = timer if record else StageTimer()
+
+        chunk_tracks = [dummy_tracks] * len(chunk)
+        if detector:
+            blob = stage_timer.time("preprocess", detector._preprocess, chunk)
+            outs = stage_timer.time("forward", detector._forward, blob)
+            for i, frame in enumerate(chunk):
+                h, w = frame.shape[:2]
+                boxes, confidences, class_ids = stage_timer.time(
+                    "postprocess", detector._postprocess, outs, i, len(chunk), w, h)
+                detections = stage_timer.time("nms", detector._nms, boxes, confidences, class_ids)
+                chunk_tracks[i] = [(n, label, conf, box) for n, (label, conf, box) in enumerate(detections)]
+
+        for frame, tracks in zip(chunk, chunk_tracks):
+            stage_timer.time("scene", analyzer.analyze_scene, frame)
+            if frame_to_pixmap:
+                pixmap = stage_timer.time(
+                    "conversion", frame_to_pixmap, frame, args.display_width, args.display_height)
+                overlay_batch = DetectionBatch.from_tracks(tracks, class_names, seq=start)
+                stage_timer.time("overlay", draw_overlay, pixmap, overlay_batch, pixmap.width() / frame.shape[1])
+
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "label": args.label,
+        "environment": {
+            "python": platform.python_version(),
+            "opencv": cv2.__version__,
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "processor": platform.processor(),
+            "cpu_count": os.cpu_count(),
+            "opencv_threads": cv2.getNumThreads()
+        },
+        "config": {
+            "source": str(args.source),
+            "frames": len(frames) - args.warmup,
+            "warmup": args.warmup,
+            "batch": batch,
+            "input_size": args.input_size,
+            "frame_shape": list(frames[0].shape)
+        },
+        "stages": timer.summary(batch)
+    }
+
+
+def write_results(results, output_dir):
+    output_dir.mkdir(parents=True, exist_ok=True)
+    stem = f"bench_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    if results["label"]:
+        stem += f"_{results['label']}"
+
+    json_path = output_dir / f"{stem}.json"
+    json_path.write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+    csv_path = output_dir / f"{stem}.csv"
+    with open(csv_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["stage", "count", "mean_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms", "throughput_fps"])
+        for stage, row in results["stages"].items():
+            writer.writerow([stage] + [row[k] for k in ("count", "mean_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms", "throughput_fps")])
+    return json_path, csv_path
+
+
+def compare(results, baseline_path, tolerance):
+    """Prints p95 changes against a baseline. Returns False if any stage regressed."""
+    baseline = json.loads(Path(baseline_path).read_text(encoding="utf-8"))
+    ok = True
+    print(f"\n--- COMPARED TO {baseline_path} (tolerance {tolerance:.0%}) ---")
+    for stage, row in results["stages"].items():
+        old = baseline.get("stages", {}).get(stage)
+        if not old or not old["p95_ms"]:
+            continue
+        change = row["p95_ms"] / old["p95_ms"] - 1
+        flag = "❌" if change > tolerance else "✅"
+        if change > tolerance:
+            ok = False
+        print(f"{flag} {stage:<12} p95 {old['p95_ms']:>8.2f} -> {row['p95_ms']:>8.2f} ms ({change:+.1%})")
+    return ok
+
+
+def print_table(results):
+    print(f"\n{'STAGE':<12} {'p50':>8} {'p95':>8} {'p99':>8} {'FPS':>8}")
+    for stage, row in results["stages"].items():
+        print(f"{stage:<12} {row['p50_ms']:>8.2f} {row['p95_ms']:>8.2f} {row['p99_ms']:>8.2f} {row['throughput_fps'] or 0:>8.1f}")
+
+
+def main():
+    settings = Settings()
+    parser = argparse.ArgumentParser(description="Benchmark the V.A.S.U vision pipeline")
+    parser.add_argument("--source", default="synthetic", help="synthetic, video file or image folder")
+    parser.add_argument("--frames", type=int, default=200, help="Frames to measure")
+    parser.add_argument("--warmup", type=int, default=10, help="Frames to run before measuring")
+    parser.add_argument("--batch", type=int, default=1, help="Frames per forward pass")
+    parser.add_argument("--input-size", type=int, default=settings.YOLO_INPUT_SIZE, help="YOLO input size (256/320/416/608)")
+    parser.add_argument("--display-width", type=int, default=854, help="Size the HUD scales the video to")
+    parser.add_argument("--display-height", type=int, default=640)
+    parser.add_argument("--label", default="", help="Tag added to the result file name")
+    parser.add_argument("--output", default=str(settings.DATA_DIR / "benchmarks"))
+    parser.add_argument("--compare", help="Baseline JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="Allowed p95 slowdown (0.10 = 10%%)")
+    args = parser.parse_args()
+
+    try:
+        print("⏱️ Benchmarking V.A.S.U vision pipeline")
+        results = run_benchmark(args)
+    except Exception as e:
+        print(f"❌ Benchmark failed: {e}")
+        return 1
+
+    print_table(results)
+    json_path, csv_path = write_results(results, Path(args.output))
+    print(f"\n💾 Results saved to {json_path} and {csv_path.name}")
+
+    if args.compare and not compare(results, args.compare, args.tolerance):
+        return 2
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -1,12 +1,75 @@
+import re
+import time
+from pathlib import Path
 import google.generativeai as genai
 from utils.logger import get_logger
+from utils.metrics import get_metrics
+from .response_cache import ResponseCache
 
 logger = get_logger(__name__)
+metrics = get_metrics()
+
+# A full stop after these is not the end of a sentence
+ABBREVIATIONS = {"mr", "mrs", "ms", "dr", "prof", "sr", "jr", "st", "vs", "e.g", "i.e", "approx"}
+
+# Sentence end: . ! ? (plus closing quotes/brackets) and the whitespace after it
+SENTENCE_END = re.compile(r"[.!?]+[\"')\]]*(?=\s)")
+
+
+class SentenceSplitter:
+    """
+    Cuts streamed text into sentences as it arrives. feed() returns the
+    sentences completed by a chunk; flush() returns whatever is left. A
+    sentence only ends once the whitespace after its punctuation has arrived,
+    so "3.5" or "e.g. this" split across chunks stay whole. Text running past
+    `max_chars` without a full stop is cut after a comma or semicolon so the
+    first words can be spoken sooner.
+    """
+    def __init__(self, max_chars=200):
+        self.max_chars = max_chars
+        self.buffer = ""
+
+    def feed(self, text):
+        self.buffer += text.replace("\n", " ")
+        sentences = []
+        start = 0
+        for match in SENTENCE_END.finditer(self.buffer):
+            candidate = self.buffer[start:match.end()]
+            last_word = candidate.rstrip(".!?\"')]").rsplit(" ", 1)[-1].lower()
+            initial = len(last_word) == 1 and last_word.isalpha()
+            if match.group().startswith(".") and (last_word in ABBREVIATIONS or initial):
+                continue  # "Dr. Smith", "J. R. R." (but "The answer is 5." ends)
+            sentences.append(candidate.strip())
+            start = match.end()
+        self.buffer = self.buffer[start:]
+
+        while len(self.buffer) > self.max_chars:
+            cut = max(self.buffer.rfind(", ", 0, self.max_chars), self.buffer.rfind("; ", 0, self.max_chars))
+            if cut <= 0:
+                break
+            sentences.append(self.buffer[:cut + 1].strip())
+            self.buffer = self.buffer[cut + 1:]
+        return [s for s in sentences if s]
+
+    def flush(self):
+        rest, self.buffer = self.buffer.strip(), ""
+        return [rest] if rest else []
+
 
 class AIInterface:
     def __init__(self, settings):
         self.settings = settings
         self.model = None
+
+        # Repeated questions are answered without a round trip
+        self.cache = None
+        if settings.AI_CACHE:
+            self.cache = ResponseCache(
+                Path(settings.DATA_DIR) / "ai_cache.json" if settings.AI_CACHE_PERSIST else None,
+                ttl=settings.AI_CACHE_TTL,
+                volatile_ttl=settings.AI_CACHE_VOLATILE_TTL,
+                max_bytes=int(settings.AI_CACHE_MB * 1024 * 1024)
+            )
         
         # Initialize Google Gemini Client
         try:
@@ -20,30 +83,77 @@ class AIInterface:
         except Exception as e:
             logger.error(f"Failed to connect to Google AI: {e}")
 
+    def build_prompt(self, user_text, visual_context=None):
+        """System prompt + camera context + the user's words."""
+        full_prompt = f"{self.settings.SYSTEM_PROMPT}\n\n"
+
+        if visual_context and visual_context != "Nothing specific.":
+            full_prompt += f"[SYSTEM DATA: Camera detects: {visual_context}]\n"
+
+        full_prompt += f"User: {user_text}"
+        return full_prompt
+
     def get_response(self, user_text, visual_context=None):
         """
-        Sends text + visual context to Google Gemini.
+        Sends text + visual context to Google Gemini and returns the whole answer.
+        """
+        return " ".join(self.stream_response(user_text, visual_context))
+
+    def stream_response(self, user_text, visual_context=None):
+        """
+        Same request, streamed: yields the answer one sentence at a time as
+        Gemini writes it, so the first sentence can be spoken while the rest
+        is still being generated. Cached answers are yielded straight away.
         """
         if not self.model:
-            return "I am unable to access the cloud brain. Please check your API key."
+            yield "I am unable to access the cloud brain. Please check your API key."
+            return
+
+        splitter = SentenceSplitter(self.settings.AI_SENTENCE_MAX_CHARS)
+        key = None
+        if self.cache:
+            key = self.cache.key(user_text, visual_context, self.settings.GEMINI_MODEL, self.settings.SYSTEM_PROMPT)
+            answer = self.cache.get(key)
+            if answer is not None:
+                yield from splitter.feed(answer) + splitter.flush()
+                return
 
+        started = time.monotonic()
+        sentences = []
         try:
-            # 1. Construct the Prompt with Context
-            full_prompt = f"{self.settings.SYSTEM_PROMPT}\n\n"
-            
-            if visual_context and visual_context != "Nothing specific.":
-                full_prompt += f"[SYSTEM DATA: Camera detects: {visual_context}]\n"
-            
-            full_prompt += f"User: {user_text}"
-
-            # 2. Call Gemini
-            response = self.model.generate_content(full_prompt)
-            
-            # 3. Extract Answer safely
-            if response and response.text:
-                return response.text.strip().replace("\n", " ")
-            return "I received an empty response from the network."
+            response = self.model.generate_content(self.build_prompt(user_text, visual_context), stream=True)
+            for chunk in response:
+                try:
+                    text = chunk.text
+                except ValueError:
+                    continue  # Chunk without text parts (e.g. only a finish reason)
+                for sentence in splitter.feed(text):
+                    if not sentences:
+                        metrics.record("ai.first_sentence", time.monotonic() - started)
+                    sentences.append(sentence)
+                    yield sentence
+            for sentence in splitter.flush():
+                sentences.append(sentence)
+                yield sentence
+            metrics.record("ai.response", time.monotonic() - started)
+            # Only complete answers are cached, never errors or fallbacks
+            if key and sentences:
+                self.cache.put(key, " ".join(sentences), self.cache.ttl_for(user_text))
 
         except Exception as e:
             logger.error(f"Gemini Error: {e}")
-            return "I am having trouble connecting to the neural network."
\ No newline at end of file
+            metrics.increment("ai.errors")
+            if not sentences:
+                sentences.append("I am having trouble connecting to the neural network.")
+                yield sentences[0]
+
+        if not sentences:
+            yield "I received an empty response from the network."
+
+    def get_status(self):
+        return {
+            "connected": self.model is not None,
+            "model": self.settings.GEMINI_MODEL,
+            "cache": self.cache.get_status() if self.cache else None,
+            "timings": metrics.snapshot("ai.")
+        }
\ No newline at end of file
@@ -0,0 +1,176 @@
+import queue
+import threading
+import time
+from collections import deque
+import numpy as np
+import speech_recognition as sr
+from utils.logger import get_logger
+from utils.metrics import get_metrics
+
+logger = get_logger(__name__)
+metrics = get_metrics()
+
+
+class AudioStream:
+    """
+    One microphone stream that stays open for the whole session.
+
+    A capture thread reads the mic continuously into a ring buffer, so
+    nothing said while VASU is thinking or speaking is lost. A cheap
+    energy-based voice activity detector (RMS against a threshold that follows
+    the background noise) finds where speech starts and ends, and each
+    utterance is queued as an sr.AudioData as soon as the speaker pauses.
+    The floor keeps following the quietest recent chunk during an utterance
+    too, so background noise that rises mid-sentence still lets it end.
+
+    While VASU itself is talking (`output_active`), speech has to be
+    `barge_in_ratio` times louder to count, so the speaker's own voice coming
+    back through the mic isn't taken for the user. `on_speech_start()` is
+    called on the capture thread whenever an utterance begins (barge-in).
+    """
+    def __init__(self, microphone, energy_threshold=300, pause_seconds=0.8, preroll_seconds=0.3,
+                 min_speech_seconds=0.15, max_utterance_seconds=10.0, buffer_seconds=30.0,
+                 barge_in_ratio=3.0, on_speech_start=None):
+        self.microphone = microphone
+        self.sample_rate = microphone.SAMPLE_RATE
+        self.sample_width = microphone.SAMPLE_WIDTH  # 2 (16-bit) for sr.Microphone
+        self.chunk = microphone.CHUNK
+
+        self.energy_threshold = energy_threshold  # Lowest threshold: never more sensitive than this
+        self.noise_ratio = 1.5                    # Speech = this much louder than the noise floor
+        self.noise_alpha = 0.05                   # EMA weight of each silent chunk
+        self.noise = energy_threshold / self.noise_ratio
+        self.barge_in_ratio = barge_in_ratio
+        self.output_active = False                # Set while TTS is playing
+        self.on_speech_start = on_speech_start
+
+        rate = self.sample_rate
+        self.pause_samples = int(pause_seconds * rate)
+        self.preroll_samples = int(preroll_seconds * rate)
+        self.min_speech_samples = int(min_speech_seconds * rate)
+        self.max_samples = int(max_utterance_seconds * rate)
+        # Must hold the longest utterance plus the audio around it
+        self.capacity = max(int(buffer_seconds * rate), self.max_samples + self.preroll_samples + self.pause_samples)
+        self.ring = np.zeros(self.capacity, dtype=np.int16)
+        self.written = 0            # Samples ever written (absolute position of the next sample)
+
+        # VAD state, in absolute sample positions
+        self.voiced_since = None    # Start of the current run of voiced chunks
+        self.speech_start = None    # Set while an utterance is open
+        self.silence = 0            # Unvoiced samples since the last voiced chunk
+        # Energies of the last two pauses' worth of chunks inside the current utterance
+        self.speech_energies = deque(maxlen=max(1, int(2 * self.pause_samples / self.chunk)))
+
+        self.utterances = queue.Queue()
+        self.stop_event = threading.Event()
+        self.thread = None
+        self.error = None
+        self.emitted = 0
+
+    def start(self):
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self._capture_loop, name="audio-capture", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+        if self.thread:
+            self.thread.join()
+            self.thread = None
+
+    def get(self, timeout=None):
+        """Next complete utterance as sr.AudioData, or None on timeout."""
+        try:
+            audio, ended_at = self.utterances.get(timeout=timeout)
+        except queue.Empty:
+            return None
+        metrics.record("voice.queue_wait", time.monotonic() - ended_at)
+        return audio
+
+    def _capture_loop(self):
+        try:
+            with self.microphone as source:
+                while not self.stop_event.is_set():
+                    self.process(source.stream.read(self.chunk))
+        except Exception as e:
+            self.error = str(e)
+            logger.error(f"Microphone stream stopped: {e}")
+
+    def process(self, data):
+        """Feeds one chunk of raw 16-bit audio through the ring buffer and the VAD."""
+        samples = np.frombuffer(data, dtype=np.int16)
+        if not len(samples):
+            return
+        position = self.written
+        self._write(samples)
+
+        energy = float(np.sqrt(np.mean(samples.astype(np.float32) ** 2)))
+        threshold = max(self.energy_threshold, self.noise * self.noise_ratio)
+        if self.output_active:
+            threshold *= self.barge_in_ratio
+        voiced = energy > threshold
+
+        if self.speech_start is None:
+            if not voiced:
+                self.voiced_since = None
+                self.noise += self.noise_alpha * (energy - self.noise)
+                return
+            if self.voiced_since is None:
+                self.voiced_since = position
+            if self.written - self.voiced_since >= self.min_speech_samples:
+                oldest = max(0, self.written - self.capacity)
+                self.speech_start = max(oldest, self.voiced_since - self.preroll_samples)
+                self.silence = 0
+                self.speech_energies.clear()
+                if self.on_speech_start:
+                    self.on_speech_start()
+            return
+
+        # Speech always dips between words; if even the quietest recent chunk is
+        # above the floor, the background got louder: follow it (slowly, as above)
+        self.speech_energies.append(energy)
+        if len(self.speech_energies) == self.speech_energies.maxlen:
+            quietest = min(self.speech_energies)
+            if quietest > self.noise:
+                self.noise += self.noise_alpha * (quietest - self.noise)
+
+        self.silence = 0 if voiced else self.silence + len(samples)
+        if self.silence >= self.pause_samples:
+            # Keep a short tail of the pause, like the pre-roll at the start
+            self._emit(self.speech_start, self.written - self.silence + min(self.silence, self.preroll_samples))
+            self.speech_start = self.voiced_since = None
+        elif self.written - self.speech_start >= self.max_samples:
+            # Still talking: send what we have and carry on seamlessly
+            self._emit(self.speech_start, self.written)
+            self.speech_start = self.written
+
+    def _write(self, samples):
+        start = self.written % self.capacity
+        end = start + len(samples)
+        if end <= self.capacity:
+            self.ring[start:end] = samples
+        else:
+            split = self.capacity - start
+            self.ring[start:] = samples[:split]
+            self.ring[:end - self.capacity] = samples[split:]
+        self.written += len(samples)
+
+    def _read(self, start, end):
+        positions = np.arange(start, end) % self.capacity
+        return self.ring[positions]
+
+    def _emit(self, start, end):
+        audio = sr.AudioData(self._read(start, end).tobytes(), self.sample_rate, self.sample_width)
+        self.utterances.put((audio, time.monotonic()))
+        self.emitted += 1
+        metrics.increment("voice.utterances")
+
+    def get_status(self):
+        return {
+            "running": self.thread is not None and self.thread.is_alive(),
+            "error": self.error,
+            "in_speech": self.speech_start is not None,
+            "noise_floor": round(self.noise, 1),
+            "utterances": self.emitted,
+            "queued": self.utterances.qsize()
+        }
\ No newline at end of file
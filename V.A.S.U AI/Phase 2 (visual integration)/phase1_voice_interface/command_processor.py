@@ -1,24 +1,65 @@
+import re
+import time
 from datetime import datetime
 from .ai_interface import AIInterface
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Spoken words that mean a YOLO label
+LABEL_ALIASES = {
+    "people": "person", "persons": "person", "someone": "person", "anyone": "person",
+    "phone": "cell phone", "mobile": "cell phone", "tv": "tvmonitor", "television": "tvmonitor",
+    "couch": "sofa", "plant": "pottedplant", "table": "diningtable", "bike": "bicycle"
+}
+
+# Questions about the past, answered from the detection history instead of the AI
+HISTORY_TRIGGERS = ("last see", "last saw", "last seen", "how many", "how long")
+
+# ...but only when they are about what the cameras saw, or about a recent period
+# ("how many people live in new york" is a question for the AI)
+VISION_CUES = re.compile(r"\b(?:see|seen|saw|spotted|noticed|in view|came in|come in|walked in|camera)\b")
+RECENT_WINDOW = re.compile(r"\b(?:last|past|this) (?:\d+ )?(?:minute|hour)s?\b")
+
+# Fixed replies (pre-rendered into the TTS cache, see common_phrases)
+WELCOME_REPLY = "Welcome back, Boss. Visual and Audio systems are online."
+IDENTITY_REPLY = "I am VASU, your virtual autonomous system utility."
+SHUTDOWN_REPLY = "Shutting down systems."
+TOO_DARK_REPLY = "It is too dark for me to see anything clearly right now."
+NOTHING_SEEN_REPLY = "I am looking, but I do not see any specific objects right now."
+
 class CommandProcessor:
     def __init__(self, settings, vision_manager=None):
         self.settings = settings
         self.ai = AIInterface(settings)
         self.vision_manager = vision_manager
+        # Kept up to date by the vision system, reading it costs nothing
+        self.summary = getattr(vision_manager, "summary", None)
+        self.history = getattr(vision_manager, "history", None)
         self.user_name = "Sir" # Default name for memory feature
 
-    def process_command(self, command):
-        """Decide what to do with the text."""
+    def process_command(self, command, stream=False):
+        """
+        Decide what to do with the text. With stream=True the reply is an
+        iterator of sentences (AI answers arrive one sentence at a time).
+        """
+        reply = self._answer(command, stream)
+        if stream and isinstance(reply, str):
+            return iter([reply])
+        return reply
+
+    def _answer(self, command, stream=False):
         if not command:
             return None
             
         logger.info(f"Processing: {command}")
         command = command.lower()
 
+        # --- 0. TEMPORAL VISION QUESTIONS (detection history) ---
+        answer = self._answer_from_history(command)
+        if answer:
+            return answer
+
         # --- 1. MEMORY & IDENTITY (For Demos) ---
         if "my name is" in command:
             # Extract name (simple split)
@@ -30,7 +71,7 @@ class CommandProcessor:
             return f"You are {self.user_name}, the authorized administrator of this system."
             
         elif "who are you" in command:
-            return "I am VASU, your virtual autonomous system utility."
+            return IDENTITY_REPLY
 
         # --- 2. SYSTEM COMMANDS ---
         elif "time" in command:
@@ -40,27 +81,99 @@ class CommandProcessor:
             return f"Today is {datetime.now().strftime('%A, %B %d')}."
             
         elif "terminate" in command or "exit" in command:
-            return "Shutting down systems."
+            return SHUTDOWN_REPLY
 
         # --- 3. VISION & AI CONTEXT PREPARATION ---
         # We prepare the 'visual_context' to send to ChatGPT
-        visual_context = "Nothing specific."
-        if self.vision_manager:
-            detections = self.vision_manager.get_detections()
-            if detections:
-                # Get unique labels (e.g., ['person', 'bottle'])
-                labels = [d[0] for d in detections]
-                unique_labels = list(set(labels))
-                visual_context = ", ".join(unique_labels)
+        # Debounced counts in a fixed order (e.g. "1 bottle, 2 people")
+        visual_context = self.summary.get_context() if self.summary else "Nothing specific."
 
         # --- 4. VISION SPECIFIC QUERY ---
         # If user explicitly asks what is in front, we answer directly using vision data
         if "what is this" in command or "what do you see" in command:
             if visual_context != "Nothing specific.":
                 return f"I see {visual_context}."
+            elif self.summary and self.summary.scene.get("is_dark"):
+                return TOO_DARK_REPLY
             else:
-                return "I am looking, but I do not see any specific objects right now."
+                return NOTHING_SEEN_REPLY
 
         # --- 5. ADVANCED AI (ChatGPT) ---
         # Send the command AND the visual context to the AI
-        return self.ai.get_response(command, visual_context)
\ No newline at end of file
+        if stream:
+            return self.ai.stream_response(command, visual_context)
+        return self.ai.get_response(command, visual_context)
+
+    def common_phrases(self):
+        """Replies worth keeping pre-synthesized (templates filled in with the current values)."""
+        return [
+            WELCOME_REPLY, IDENTITY_REPLY, SHUTDOWN_REPLY, TOO_DARK_REPLY, NOTHING_SEEN_REPLY,
+            f"You are {self.user_name}, the authorized administrator of this system."
+        ]
+
+    def _find_label(self, command):
+        """The YOLO label mentioned in the command, if any (longest match wins)."""
+        words = re.findall(r"[a-z]+", command)
+        for word in words:
+            if word in LABEL_ALIASES:
+                return LABEL_ALIASES[word]
+        text = " " + " ".join(words) + " "
+        for label in sorted(self.history.class_ids, key=len, reverse=True):
+            if f" {label} " in text or f" {label}s " in text:
+                return label
+        return None
+
+    @staticmethod
+    def _parse_window(command):
+        """(start time, spoken description) of the period a question is about."""
+        now = time.time()
+        match = re.search(r"(?:last|past) (\d+) (minute|hour)s?", command)
+        if match:
+            amount, unit = int(match.group(1)), match.group(2)
+            return now - amount * (60 if unit == "minute" else 3600), f"in the last {amount} {unit}s"
+        if "minute" in command:
+            return now - 60, "in the last minute"
+        if "hour" in command:
+            return now - 3600, "in the last hour"
+        if "today" in command:
+            midnight = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+            return midnight.timestamp(), "today"
+        return None, "so far"
+
+    @staticmethod
+    def _ago(timestamp):
+        seconds = int(time.time() - timestamp)
+        if seconds < 60:
+            return "just now"
+        if seconds < 3600:
+            return f"{seconds // 60} minutes ago"
+        return f"at {datetime.fromtimestamp(timestamp).strftime('%H:%M')}"
+
+    def _answer_from_history(self, command):
+        if not self.history or not any(trigger in command for trigger in HISTORY_TRIGGERS):
+            return None
+        if not (VISION_CUES.search(command) or RECENT_WINDOW.search(command)):
+            return None
+        label = self._find_label(command)
+        if not label:
+            return None
+
+        start, period = self._parse_window(command)
+        if "how many" in command:
+            count = self.history.count(label, start)
+            noun = label if count == 1 else ("people" if label == "person" else f"{label}s")
+            return f"I have seen {count} {noun} {period}."
+
+        if "how long" in command:
+            intervals = self.history.presence_intervals(label, start)
+            if not intervals:
+                return f"I have not seen a {label} {period}."
+            total = sum(end - begin for begin, end in intervals)
+            if total < 60:
+                return f"A {label} was in view for about {int(total)} seconds {period}."
+            return f"A {label} was in view for about {round(total / 60)} minutes {period}."
+
+        seen = self.history.last_seen_at(label)
+        if not seen:
+            return f"I have not seen a {label} yet."
+        return f"I last saw a {label} {self._ago(seen['time'])}."
\ No newline at end of file
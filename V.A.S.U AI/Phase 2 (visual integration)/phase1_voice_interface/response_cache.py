@@ -0,0 +1,140 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from utils.logger import get_logger
+from utils.metrics import get_metrics
+
+logger = get_logger(__name__)
+metrics = get_metrics()
+
+# Questions containing these words get the short TTL (the answer goes stale)
+TIME_SENSITIVE = {
+    "weather", "temperature", "forecast", "rain", "news", "today", "tonight", "tomorrow",
+    "now", "current", "currently", "latest", "score", "price", "stock", "traffic"
+}
+
+ENTRY_OVERHEAD = 200  # Rough bytes per entry besides the answer text (key, tuple, dict slot)
+
+
+class ResponseCache:
+    """
+    AI answers kept for repeated questions.
+
+    The key is the normalized question (lower case, no punctuation, single
+    spaces) plus the camera context, model name and system prompt, so a
+    different scene or persona never gets a stale answer. Every entry has its
+    own expiry: `volatile_ttl` for time-sensitive questions, `ttl` otherwise.
+    Least recently used entries are dropped past `max_bytes`. With a `path`
+    the cache is saved as JSON and survives restarts.
+    """
+    def __init__(self, path=None, ttl=86400.0, volatile_ttl=300.0, max_bytes=1024 * 1024):
+        self.path = Path(path) if path else None
+        self.ttl = ttl
+        self.volatile_ttl = volatile_ttl
+        self.max_bytes = max_bytes
+
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()  # LRU: key -> (answer, expires at (time.time()))
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._load()
+
+    @staticmethod
+    def normalize(text):
+        return " ".join(re.findall(r"[a-z0-9']+", text.lower()))
+
+    def key(self, user_text, visual_context, model, system_prompt):
+        raw = "\x1f".join([self.normalize(user_text), visual_context or "", model, system_prompt])
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def ttl_for(self, user_text):
+        words = set(self.normalize(user_text).split())
+        return self.volatile_ttl if words & TIME_SENSITIVE else self.ttl
+
+    def get(self, key):
+        """The cached answer, or None if missing or expired."""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[1] <= time.time():
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                metrics.increment("ai.cache_misses")
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+        metrics.increment("ai.cache_hits")
+        return entry[0]
+
+    def put(self, key, answer, ttl):
+        if ttl <= 0 or not answer:
+            return
+        with self.lock:
+            if key in self.entries:
+                self._remove(key)
+            self.entries[key] = (answer, time.time() + ttl)
+            self.size += self._cost(answer)
+            while self.size > self.max_bytes and len(self.entries) > 1:
+                self._remove(next(iter(self.entries)))
+            snapshot = dict(self.entries) if self.path else None
+        if snapshot is not None:
+            self._save(snapshot)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+        if self.path:
+            self._save({})
+
+    def _remove(self, key):
+        answer, _ = self.entries.pop(key)
+        self.size -= self._cost(answer)
+
+    @staticmethod
+    def _cost(answer):
+        return len(answer.encode("utf-8")) + ENTRY_OVERHEAD
+
+    def _save(self, entries):
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump([[key, answer, expires] for key, (answer, expires) in entries.items()], f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Could not save the AI response cache: {e}")
+
+    def _load(self):
+        if not self.path:
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                rows = json.load(f)
+        except (OSError, ValueError):
+            return
+        now = time.time()
+        for key, answer, expires in rows:  # Saved least recently used first
+            if expires > now:
+                self.entries[key] = (answer, expires)
+                self.size += self._cost(answer)
+        while self.size > self.max_bytes and len(self.entries) > 1:
+            self._remove(next(iter(self.entries)))
+
+    def get_status(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self.entries),
+                "kilobytes": round(self.size / 1024, 1),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 2) if lookups else None
+            }
\ No newline at end of file
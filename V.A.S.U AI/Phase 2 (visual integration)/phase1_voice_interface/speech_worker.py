@@ -0,0 +1,270 @@
+import itertools
+import queue
+import threading
+import time
+import wave
+from collections import deque
+import pyttsx3
+from utils.logger import get_logger
+from utils.metrics import get_metrics
+
+logger = get_logger(__name__)
+metrics = get_metrics()
+
+# Utterance priorities (lower is spoken first)
+URGENT, NORMAL, LOW = 0, 1, 2
+
+
+class Utterance:
+    """One piece of text queued for speech; wait() blocks until it's done."""
+    def __init__(self, text, priority=NORMAL):
+        self.text = text
+        self.priority = priority
+        self.state = "queued"       # queued / speaking / finished / interrupted / failed
+        self.spoken_chars = 0
+        self.queued_at = time.monotonic()
+        self.interrupt_requested = False
+        self.done = threading.Event()
+
+    @property
+    def progress(self):
+        """Fraction of the text spoken so far (0.0 - 1.0)."""
+        return min(1.0, self.spoken_chars / len(self.text)) if self.text else 1.0
+
+    def wait(self, timeout=None):
+        return self.done.wait(timeout)
+
+
+class SpeechWorker:
+    """
+    Speech output on a thread of its own. The pyttsx3 engine is created once,
+    on that thread, and used for every utterance, so there is no per-sentence
+    init cost and the engine never touches a Qt thread.
+
+    Utterances are spoken in priority order; interrupt() (barge-in) cuts the
+    current one short and drops everything queued. on_progress(utterance,
+    event) is called on the speech thread with "started", "word", "finished",
+    "interrupted" or "failed".
+
+    With a TTSCache, phrases already on disk are played straight from their
+    WAV file through PyAudio instead of being synthesized. Phrases passed to
+    prerender() and replies the cache wants to keep are rendered while the
+    queue is idle.
+    """
+    def __init__(self, rate=170, volume=1.0, on_progress=None, cache=None):
+        self.rate = rate
+        self.volume = volume
+        self.on_progress = on_progress
+        self.cache = cache
+        self.to_render = deque()  # Texts to put in the cache when idle
+
+        self.queue = queue.PriorityQueue()
+        self.counter = itertools.count()  # FIFO within a priority
+        self.engine = None
+        self.current = None
+        self.thread = None
+        self.ready = threading.Event()
+        self.error = None
+
+        # Cached playback (opened on the speech thread on first use)
+        self.audio = None
+        self.output = None
+        self.output_format = None
+
+        self.spoken = 0
+        self.interrupted = 0
+        self.played = 0  # Utterances played from the cache
+
+    def start(self):
+        self.thread = threading.Thread(target=self._run, name="speech", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.interrupt()
+        if self.thread:
+            self.queue.put((-1, next(self.counter), None))
+            self.thread.join()
+            self.thread = None
+
+    def speak(self, text, priority=NORMAL):
+        """Queues text and returns its Utterance straight away."""
+        utterance = Utterance(text, priority)
+        if self.error:
+            self._finish(utterance, "failed")
+        else:
+            self.queue.put((priority, next(self.counter), utterance))
+        return utterance
+
+    def prerender(self, texts):
+        """Renders texts into the cache in idle time (no-op without a cache)."""
+        if self.cache:
+            self.to_render.extend(texts)
+
+    def interrupt(self):
+        """Barge-in: stops the utterance being spoken and drops the queued ones."""
+        while True:
+            try:
+                _, _, utterance = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if utterance is None:
+                # Keep the stop request
+                self.queue.put((-1, next(self.counter), None))
+                break
+            self._finish(utterance, "interrupted")
+
+        current = self.current
+        if current is not None:
+            # Acted on at the next word boundary, on the speech thread
+            current.interrupt_requested = True
+
+    def is_speaking(self):
+        return self.current is not None or not self.queue.empty()
+
+    def _run(self):
+        try:
+            self.engine = pyttsx3.init()
+            self.engine.setProperty('rate', self.rate)
+            self.engine.setProperty('volume', self.volume)
+            self.engine.connect('started-word', self._on_word)
+            if self.cache:
+                self.cache.voice = self.engine.getProperty('voice')
+        except Exception as e:
+            self.error = str(e)
+            logger.error(f"TTS Error: {e}")
+        self.ready.set()
+
+        while True:
+            try:
+                # Wake up now and then to fill the cache while nothing is said
+                _, _, utterance = self.queue.get(timeout=0.5)
+            except queue.Empty:
+                if self.to_render and self.cache and not self.error:
+                    self.cache.store(self.engine, self.to_render.popleft())
+                continue
+            if utterance is None:
+                break
+            if self.error:
+                self._finish(utterance, "failed")
+                continue
+            self._say(utterance)
+        self._close_output()
+
+    def _say(self, utterance):
+        self.current = utterance
+        utterance.state = "speaking"
+        metrics.record("voice.tts_wait", time.monotonic() - utterance.queued_at)
+        self._report(utterance, "started")
+        path = self.cache.get(utterance.text) if self.cache else None
+        try:
+            with metrics.span("voice.tts"):
+                if path and self._play(path, utterance):
+                    self.played += 1
+                else:
+                    path = None
+                    self.engine.say(utterance.text)
+                    self.engine.runAndWait()
+            state = "interrupted" if utterance.interrupt_requested else "finished"
+        except Exception as e:
+            logger.error(f"TTS Error: {e}")
+            state = "failed"
+        self.current = None
+        self._finish(utterance, state)
+
+        if state == "finished" and not path and self.cache and self.cache.wants(utterance.text):
+            self.to_render.append(utterance.text)
+
+    def _play(self, path, utterance):
+        """Plays a cached WAV; False if it can't be played (speak it live instead)."""
+        try:
+            with wave.open(str(path), "rb") as wav:
+                stream = self._open_output(wav.getsampwidth(), wav.getnchannels(), wav.getframerate())
+                if stream is None:
+                    return False
+                total = max(1, wav.getnframes())
+                chunk = max(1, wav.getframerate() // 20)  # 50 ms: how quickly a barge-in is heard
+                played = 0
+                while not utterance.interrupt_requested:
+                    data = wav.readframes(chunk)
+                    if not data:
+                        break
+                    stream.write(data)
+                    played += chunk
+                    utterance.spoken_chars = int(len(utterance.text) * min(1.0, played / total))
+        except (OSError, EOFError, wave.Error) as e:
+            logger.warning(f"Cached speech unplayable, speaking live: {e}")
+            self.cache.discard(utterance.text)
+            return False
+        return True
+
+    def _open_output(self, width, channels, rate):
+        """One PyAudio output stream, reopened only when the WAV format changes."""
+        audio_format = (width, channels, rate)
+        if self.output is not None and self.output_format == audio_format:
+            return self.output
+        self._close_output(keep_audio=True)
+        try:
+            if self.audio is None:
+                import pyaudio
+                self.audio = pyaudio.PyAudio()
+            self.output = self.audio.open(format=self.audio.get_format_from_width(width),
+                                          channels=channels, rate=rate, output=True)
+        except Exception as e:
+            # No usable output device: keep speaking live from now on
+            logger.warning(f"Audio output unavailable, TTS cache disabled: {e}")
+            self.cache = None
+            return None
+        self.output_format = audio_format
+        return self.output
+
+    def _close_output(self, keep_audio=False):
+        if self.output is not None:
+            self.output.close()
+            self.output = None
+        if self.audio is not None and not keep_audio:
+            self.audio.terminate()
+            self.audio = None
+
+    def _on_word(self, name, location, length):
+        utterance = self.current
+        if utterance is None:
+            return
+        if utterance.interrupt_requested:
+            # Only safe from the engine's own callbacks
+            self.engine.stop()
+            return
+        utterance.spoken_chars = location + length
+        self._report(utterance, "word")
+
+    def _finish(self, utterance, state):
+        utterance.state = state
+        if state == "finished":
+            utterance.spoken_chars = len(utterance.text)
+            self.spoken += 1
+        elif state == "interrupted":
+            self.interrupted += 1
+            metrics.increment("voice.tts_interrupted")
+        utterance.done.set()
+        self._report(utterance, state)
+
+    def _report(self, utterance, event):
+        if self.on_progress:
+            try:
+                self.on_progress(utterance, event)
+            except Exception as e:
+                logger.warning(f"Speech progress listener failed: {e}")
+
+    def get_status(self):
+        current = self.current
+        return {
+            "ready": self.ready.is_set(),
+            "error": self.error,
+            "speaking": current.text[:40] if current else None,
+            "progress": round(current.progress, 2) if current else None,
+            "queued": self.queue.qsize(),
+            "spoken": self.spoken,
+            "interrupted": self.interrupted,
+            "played_from_cache": self.played,
+            "to_render": len(self.to_render),
+            "cache": self.cache.get_status() if self.cache else None
+        }
\ No newline at end of file
@@ -0,0 +1,148 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class TTSCache:
+    """
+    Synthesized speech on disk, one WAV per phrase, so common replies play
+    without going through the TTS engine at all.
+
+    Files are named by a hash of (text, voice, rate, volume); changing any of
+    the voice settings simply misses. Fixed phrases are rendered up front
+    (prerender on the speech thread); other replies are admitted once they
+    have been spoken `admit_after` times. The least recently played files are
+    deleted when the cache grows past `max_bytes`.
+    """
+    def __init__(self, directory, voice="", rate=170, volume=1.0, max_bytes=50 * 1024 * 1024, admit_after=2):
+        self.directory = Path(directory)
+        self.voice = voice        # Engine voice id, set once the engine exists
+        self.rate = rate
+        self.volume = volume
+        self.max_bytes = max_bytes
+        self.admit_after = admit_after
+
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()  # LRU: key -> file size, most recently played last
+        self.size = 0
+        self.spoken = OrderedDict()   # key -> times spoken without a cache entry (bounded)
+        self.hits = 0
+        self.misses = 0
+        self._scan()
+
+    @staticmethod
+    def normalize(text):
+        return " ".join(text.split())
+
+    def key(self, text):
+        raw = f"{self.voice}|{self.rate}|{self.volume}|{self.normalize(text)}"
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def path(self, key):
+        return self.directory / f"{key}.wav"
+
+    def get(self, text):
+        """Path of the cached WAV for text, or None."""
+        key = self.key(text)
+        with self.lock:
+            if key not in self.entries:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+        path = self.path(key)
+        try:
+            os.utime(path)  # Recency survives restarts
+        except OSError:
+            self.discard(text)
+            return None
+        return path
+
+    def wants(self, text):
+        """Counts one live rendition of text; True once it has earned a cache entry."""
+        key = self.key(text)
+        with self.lock:
+            if key in self.entries:
+                return False
+            count = self.spoken.pop(key, 0) + 1
+            self.spoken[key] = count
+            if len(self.spoken) > 1024:
+                self.spoken.popitem(last=False)
+        return count >= self.admit_after
+
+    def store(self, engine, text):
+        """
+        Renders text to a WAV with the (already configured) engine. Call it on
+        the thread that owns the engine, while it isn't speaking.
+        """
+        key = self.key(text)
+        with self.lock:
+            if key in self.entries:
+                return self.path(key)
+        path = self.path(key)
+        tmp_path = self.directory / f"{key}.tmp.wav"
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            engine.save_to_file(self.normalize(text), str(tmp_path))
+            engine.runAndWait()
+            size = tmp_path.stat().st_size
+            if not size:
+                raise OSError("engine wrote no audio")
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"Could not cache speech for '{text[:40]}': {e}")
+            tmp_path.unlink(missing_ok=True)
+            return None
+
+        with self.lock:
+            self.spoken.pop(key, None)
+            self.entries[key] = size
+            self.size += size
+            evicted = self._evict()
+        for old_key in evicted:
+            self.path(old_key).unlink(missing_ok=True)
+        return path
+
+    def discard(self, text):
+        """Drops an entry that turned out to be unplayable."""
+        key = self.key(text)
+        with self.lock:
+            size = self.entries.pop(key, None)
+            if size is not None:
+                self.size -= size
+        self.path(key).unlink(missing_ok=True)
+
+    def _evict(self):
+        evicted = []
+        while self.size > self.max_bytes and len(self.entries) > 1:
+            key, size = self.entries.popitem(last=False)
+            self.size -= size
+            evicted.append(key)
+        return evicted
+
+    def _scan(self):
+        """Rebuilds the LRU from the files on disk, least recently played first."""
+        try:
+            files = sorted((p.stat().st_mtime, p.stat().st_size, p) for p in self.directory.glob("*.wav")
+                           if not p.name.endswith(".tmp.wav"))
+        except OSError:
+            return
+        for _, size, p in files:
+            self.entries[p.stem] = size
+            self.size += size
+        for key in self._evict():
+            self.path(key).unlink(missing_ok=True)
+
+    def get_status(self):
+        with self.lock:
+            return {
+                "entries": len(self.entries),
+                "megabytes": round(self.size / (1024 * 1024), 2),
+                "hits": self.hits,
+                "misses": self.misses
+            }
\ No newline at end of file
@@ -1,24 +1,60 @@
+import time
+from pathlib import Path
 import speech_recognition as sr
-import pyttsx3
 from utils.logger import get_logger
+from utils.metrics import get_metrics
+from .audio_stream import AudioStream
+from .speech_worker import SpeechWorker, NORMAL
+from .tts_cache import TTSCache
 
 logger = get_logger(__name__)
+metrics = get_metrics()
 
 class VoiceManager:
     def __init__(self, settings):
         self.settings = settings
         self.recognizer = sr.Recognizer()
         self.microphone = None
-        # We do NOT init the engine here to avoid threading locks
+        self.stream = None  # Continuous capture, opened once in initialize()
+        # Common phrases are played from disk instead of being synthesized every time
+        self.tts_cache = None
+        if settings.TTS_CACHE:
+            self.tts_cache = TTSCache(
+                Path(settings.DATA_DIR) / "tts",
+                rate=settings.SPEECH_RATE,
+                volume=settings.SPEECH_VOLUME,
+                max_bytes=int(settings.TTS_CACHE_MB * 1024 * 1024),
+                admit_after=settings.TTS_CACHE_ADMIT_AFTER
+            )
+        # The TTS engine lives on the speech thread (never a Qt thread) for the whole session
+        self.speech = SpeechWorker(settings.SPEECH_RATE, settings.SPEECH_VOLUME,
+                                   on_progress=self._on_speech_progress, cache=self.tts_cache)
+        self.on_speech_progress = None  # Forwarded progress: callback(utterance, event)
         self.is_initialized = False
 
     def initialize(self):
         try:
-            # Only init the microphone here
+            self.speech.start()
+
+            # Microphone (VASU can still talk without one)
             try:
                 self.microphone = sr.Microphone()
+                self.recognizer.energy_threshold = self.settings.ENERGY_THRESHOLD
                 with self.microphone as source:
                     self.recognizer.adjust_for_ambient_noise(source, duration=0.5)
+
+                self.stream = AudioStream(
+                    self.microphone,
+                    energy_threshold=self.recognizer.energy_threshold,
+                    pause_seconds=self.settings.PAUSE_THRESHOLD,
+                    preroll_seconds=self.settings.VAD_PREROLL_SECONDS,
+                    min_speech_seconds=self.settings.VAD_MIN_SPEECH_SECONDS,
+                    max_utterance_seconds=self.settings.VAD_MAX_UTTERANCE_SECONDS,
+                    buffer_seconds=self.settings.AUDIO_BUFFER_SECONDS,
+                    barge_in_ratio=self.settings.BARGE_IN_RATIO,
+                    on_speech_start=self._on_speech_start if self.settings.BARGE_IN else None
+                )
+                self.stream.start()
             except Exception as e:
                 logger.warning(f"Microphone setup issue: {e}")
                 
@@ -28,46 +64,76 @@ class VoiceManager:
             logger.error(f"Voice Manager Init Failed: {e}")
             return False
 
-    def listen(self):
-        """Listens for a single command."""
-        if not self.microphone:
+    def listen(self, timeout=0.5):
+        """
+        Next spoken command, or None if nothing was said within `timeout`.
+        Audio is captured all the time, so this returns as soon as an
+        utterance has ended (plus recognition time).
+        """
+        if not self.stream:
+            # No microphone: still take the full timeout so the caller's loop doesn't spin
+            time.sleep(timeout)
             return None
 
         try:
-            with self.microphone as source:
-                # Reduced timeout for snappier GUI
-                audio = self.recognizer.listen(source, timeout=3, phrase_time_limit=5)
-            
+            audio = self.stream.get(timeout)
+            if audio is None:
+                return None
+
             try:
-                text = self.recognizer.recognize_google(audio)
+                with metrics.span("voice.asr"):
+                    text = self.recognizer.recognize_google(audio)
                 return text.lower()
             except sr.UnknownValueError:
+                metrics.increment("voice.asr_unrecognized")
                 return None
             except sr.RequestError:
+                metrics.increment("voice.asr_errors")
                 return None
         except Exception:
             return None
 
-    def speak(self, text):
+    def stop(self):
+        if self.stream:
+            self.stream.stop()
+        self.speech.stop()
+
+    def speak(self, text, priority=NORMAL):
         """
-        Speak text using a fresh engine instance to prevent 
-        PyQt thread lockups on Windows.
+        Queues text on the speech thread and returns its Utterance right away
+        (utterance.wait() blocks until it has been spoken).
         """
         if not text:
-            return
-            
-        try:
-            # Re-initialize engine locally for thread safety
-            engine = pyttsx3.init()
-            engine.setProperty('rate', 170)
-            engine.setProperty('volume', 1.0)
-            
-            # Queue and play
-            engine.say(text)
-            engine.runAndWait()
-            
-            # Explicitly cleanup
-            engine.stop()
-            del engine
-        except Exception as e:
-            logger.error(f"TTS Error: {e}")
\ No newline at end of file
+            return None
+        return self.speech.speak(text, priority)
+
+    def prerender(self, phrases):
+        """Synthesizes fixed phrases into the TTS cache in idle time (first startup only)."""
+        self.speech.prerender(phrases)
+
+    def interrupt(self):
+        """Stops whatever is being said and drops the queued replies."""
+        self.speech.interrupt()
+
+    def _on_speech_start(self):
+        # The user started talking over VASU: stop talking and listen
+        if self.speech.is_speaking():
+            metrics.increment("voice.barge_in")
+            self.speech.interrupt()
+
+    def _on_speech_progress(self, utterance, event):
+        if self.stream and event != "word":
+            # Queued utterances dropped by interrupt() report "interrupted" while the
+            # current one may still be playing: only the speech thread's state counts
+            self.stream.output_active = self.speech.current is not None
+        if self.on_speech_progress:
+            self.on_speech_progress(utterance, event)
+
+    def get_status(self):
+        return {
+            "is_initialized": self.is_initialized,
+            "microphone": self.microphone is not None,
+            "stream": self.stream.get_status() if self.stream else None,
+            "speech": self.speech.get_status(),
+            "timings": metrics.snapshot("voice.")
+        }
\ No newline at end of file
@@ -1,40 +1,60 @@
-import cv2
 from utils.logger import get_logger
+from utils.metrics import get_metrics
+from .frame_sources import create_source
 
 logger = get_logger(__name__)
+metrics = get_metrics()
 
 class CameraManager:
-    def __init__(self):
-        self.cap = None
+    """
+    Opens and reads a set of frame sources (webcams, video files, image
+    folders or the synthetic generator) listed in Settings.CAMERA_SOURCES.
+    Camera IDs are positions in that list.
+    """
+    def __init__(self, settings):
+        self.settings = settings
+        self.sources = {}
         self.is_initialized = False
 
     def initialize(self):
-        try:
-            self.cap = cv2.VideoCapture(0) # Index 0 is usually default webcam
-            if not self.cap.isOpened():
-                logger.error("Could not open video device")
-                return False
-            
-            # Set resolution
-            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
-            self.is_initialized = True
-            return True
-        except Exception as e:
-            logger.error(f"Camera init failed: {e}")
-            return False
-
-    def get_frame(self):
-        if self.is_initialized and self.cap:
-            ret, frame = self.cap.read()
-            if ret:
-                return frame
+        for camera_id, spec in enumerate(self.settings.CAMERA_SOURCES):
+            try:
+                source = create_source(spec, self.settings)
+                if not source.open():
+                    logger.error(f"Could not open video source {spec}")
+                    continue
+                self.sources[camera_id] = source
+                logger.info(f"Camera {camera_id}: {source.describe()}")
+            except Exception as e:
+                logger.error(f"Camera init failed for {spec}: {e}")
+
+        # One working source is enough to run
+        self.is_initialized = bool(self.sources)
+        return self.is_initialized
+
+    def camera_ids(self):
+        return list(self.sources)
+
+    def get_frame(self, out=None, camera_id=0):
+        """Reads the next frame, into `out` if given (avoids a new allocation)."""
+        source = self.sources.get(camera_id)
+        if self.is_initialized and source:
+            with metrics.span("camera.read"):
+                frame = source.read(out)
+            if frame is None:
+                metrics.increment("camera.failed_reads")
+            return frame
         return None
 
     def release(self):
-        if self.cap:
-            self.cap.release()
+        for source in self.sources.values():
+            source.release()
+        self.sources = {}
         self.is_initialized = False
 
     def get_status(self):
-        return {"is_initialized": self.is_initialized}
\ No newline at end of file
+        return {
+            "is_initialized": self.is_initialized,
+            "cameras": {cid: source.describe() for cid, source in self.sources.items()},
+            "timings": metrics.snapshot("camera.")
+        }
\ No newline at end of file
@@ -0,0 +1,252 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+import numpy as np
+from utils.logger import get_logger
+from .detections import load_class_names
+
+logger = get_logger(__name__)
+
+# One row per sighting; 24 bytes, so 100k rows is ~2.4 MB
+ROW_DTYPE = np.dtype([
+    ("time", "f8"),       # Wall-clock seconds (time.time())
+    ("camera", "i2"),
+    ("class_id", "i2"),
+    ("track_id", "i4"),
+    ("conf", "f4"),
+    ("x", "i2"), ("y", "i2")
+])
+
+
+class DetectionHistory:
+    """
+    Memory-bounded time series of what the cameras saw.
+
+    Rows live in a fixed-size ring buffer with a per-label index of row numbers,
+    so last-seen, count-in-window and presence queries only touch the rows of
+    one label. A track is recorded at most once per `resolution` seconds.
+    New rows are appended to a compact binary file per day under
+    DATA_DIR/history every `spill_interval` seconds, optionally thinned out to
+    `spill_resolution` seconds per track; last-seen times survive restarts.
+    """
+    def __init__(self, settings, capacity=100000, resolution=1.0,
+                 spill_interval=60.0, spill_resolution=10.0):
+        self.settings = settings
+        self.capacity = capacity
+        self.resolution = resolution
+        self.spill_interval = spill_interval
+        self.spill_resolution = spill_resolution
+        self.directory = Path(settings.DATA_DIR) / "history"
+
+        self.lock = threading.Lock()
+        self.rows = np.zeros(capacity, dtype=ROW_DTYPE)
+        self.written = 0            # Rows ever written (absolute row number of the next row)
+        self.spilled = 0            # Absolute row number up to which rows are on disk
+        self.index = {}             # class_id -> deque of absolute row numbers, oldest first
+        self.last_recorded = {}     # (camera, track_id) -> time of the last row
+        self.last_seen = {}         # label -> {"time", "camera", "conf"}
+
+        try:
+            self.class_names = load_class_names(str(settings.YOLO_CLASSES))
+        except OSError:
+            self.class_names = ()
+        self.class_ids = {name: i for i, name in enumerate(self.class_names)}
+
+        self.bus = None
+        self.subscription = None
+        self.thread = None
+        self.stop_event = threading.Event()
+        self._load_last_seen()
+
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+    def start(self, bus):
+        """Records every batch published on the bus, on a thread of its own."""
+        self.bus = bus
+        self.subscription = bus.subscribe("history", maxsize=64)
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self._record_loop, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+        if self.thread:
+            self.thread.join()
+            self.thread = None
+        if self.subscription:
+            self.bus.unsubscribe(self.subscription)
+            # Whatever was still queued
+            batch = self.subscription.get(timeout=0)
+            while batch is not None:
+                self.record(batch)
+                batch = self.subscription.get(timeout=0)
+        self.spill()
+
+    def _record_loop(self):
+        last_spill = time.monotonic()
+        while not self.stop_event.is_set():
+            batch = self.subscription.get(timeout=0.5)
+            if batch is not None:
+                self.record(batch)
+            now = time.monotonic()
+            if now - last_spill >= self.spill_interval or self.written - self.spilled >= self.capacity // 2:
+                self.spill()
+                last_spill = now
+
+    def record(self, batch):
+        """Adds the tracked objects of one DetectionBatch."""
+        if not batch:
+            return
+        # Batches carry monotonic capture times; history is kept in wall-clock time
+        wall_time = time.time() - (time.monotonic() - batch.timestamp) if batch.timestamp else time.time()
+        camera = batch.camera_id or 0
+
+        with self.lock:
+            for i, (class_id, track_id, conf) in enumerate(zip(
+                    batch.class_ids.tolist(), batch.track_ids.tolist(), batch.scores.tolist())):
+                if not 0 <= class_id < len(batch.class_names):
+                    continue  # Unknown label, nothing to answer questions about
+                key = (camera, track_id)
+                if track_id >= 0 and wall_time - self.last_recorded.get(key, 0.0) < self.resolution:
+                    continue
+                self.last_recorded[key] = wall_time
+
+                position = self.written % self.capacity
+                if self.written >= self.capacity:
+                    # The ring overwrites the oldest row, which is also the oldest of its label
+                    self.index[int(self.rows[position]["class_id"])].popleft()
+                x, y = batch.boxes[i, :2].tolist()
+                self.rows[position] = (wall_time, camera, class_id, track_id, conf, x, y)
+                self.index.setdefault(class_id, deque()).append(self.written)
+                self.written += 1
+
+                label = batch.class_names[class_id]
+                self.last_seen[label] = {"time": wall_time, "camera": camera, "conf": round(conf, 3)}
+
+            # Forget tracks that haven't been seen for a while
+            if len(self.last_recorded) > 1000:
+                cutoff = wall_time - 60.0
+                self.last_recorded = {k: t for k, t in self.last_recorded.items() if t >= cutoff}
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    def _label_rows(self, label, start=None, end=None, camera_id=None):
+        """Rows of one label (oldest first) within [start, end], via the index."""
+        class_id = self.class_ids.get(label)
+        if class_id is None:
+            return self.rows[:0]
+        with self.lock:
+            positions = self.index.get(class_id)
+            if not positions:
+                return self.rows[:0]
+            rows = self.rows[np.fromiter(positions, dtype=np.int64, count=len(positions)) % self.capacity]
+
+        mask = np.ones(len(rows), dtype=bool)
+        if start is not None:
+            mask &= rows["time"] >= start
+        if end is not None:
+            mask &= rows["time"] <= end
+        if camera_id is not None:
+            mask &= rows["camera"] == camera_id
+        return rows[mask]
+
+    def last_seen_at(self, label, camera_id=None):
+        """{"time", "camera", "conf"} of the newest sighting, or None. O(1) without a camera filter."""
+        if camera_id is None:
+            return self.last_seen.get(label)
+        rows = self._label_rows(label, camera_id=camera_id)
+        if not len(rows):
+            return None
+        row = rows[-1]
+        return {"time": float(row["time"]), "camera": int(row["camera"]), "conf": round(float(row["conf"]), 3)}
+
+    def count(self, label, start, end=None, camera_id=None):
+        """Distinct objects (tracks) of a label seen in the window."""
+        rows = self._label_rows(label, start, end, camera_id)
+        if not len(rows):
+            return 0
+        keys = (rows["camera"].astype(np.int64) << 32) | rows["track_id"].astype(np.int64)
+        return len(np.unique(keys))
+
+    def presence_intervals(self, label, start=None, end=None, gap=5.0, camera_id=None):
+        """[(from, to), ...] wall-clock spans during which the label was in view."""
+        rows = self._label_rows(label, start, end, camera_id)
+        if not len(rows):
+            return []
+        times = np.sort(rows["time"])
+        breaks = np.flatnonzero(np.diff(times) > gap)
+        starts = np.concatenate(([times[0]], times[breaks + 1]))
+        ends = np.concatenate((times[breaks], [times[-1]]))
+        return list(zip(starts.tolist(), ends.tolist()))
+
+    def oldest_time(self):
+        with self.lock:
+            if self.written == 0:
+                return None
+            return float(self.rows[max(0, self.written - self.capacity) % self.capacity]["time"])
+
+    # ------------------------------------------------------------------
+    # Disk spill
+    # ------------------------------------------------------------------
+    def spill(self):
+        """Appends rows that aren't on disk yet to today's file, thinned to spill_resolution."""
+        with self.lock:
+            first = max(self.spilled, self.written - self.capacity)
+            count = self.written - first
+            if count <= 0:
+                return
+            positions = np.arange(first, self.written) % self.capacity
+            rows = self.rows[positions].copy()
+            self.spilled = self.written
+            last_seen = dict(self.last_seen)
+
+        if self.spill_resolution:
+            # Keep the first row of every (camera, track, time bucket)
+            buckets = (rows["time"] // self.spill_resolution).astype(np.int64)
+            keys = np.stack([rows["camera"].astype(np.int64), rows["track_id"].astype(np.int64), buckets], axis=1)
+            _, keep = np.unique(keys, axis=0, return_index=True)
+            rows = rows[np.sort(keep)]
+
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            day = datetime.fromtimestamp(float(rows["time"][0])).strftime("%Y-%m-%d")
+            with open(self.directory / f"detections-{day}.bin", "ab") as f:
+                f.write(rows.tobytes())
+            self._save_last_seen(last_seen)
+        except OSError as e:
+            logger.warning(f"Could not spill detection history: {e}")
+
+    def load_day(self, day):
+        """Rows spilled on a given day ("YYYY-MM-DD") as a structured array."""
+        path = self.directory / f"detections-{day}.bin"
+        if not path.exists():
+            return np.zeros(0, dtype=ROW_DTYPE)
+        return np.fromfile(path, dtype=ROW_DTYPE)
+
+    def _save_last_seen(self, last_seen):
+        tmp_path = self.directory / "last_seen.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(last_seen, f)
+        os.replace(tmp_path, self.directory / "last_seen.json")
+
+    def _load_last_seen(self):
+        try:
+            with open(self.directory / "last_seen.json", "r") as f:
+                self.last_seen = json.load(f)
+        except (OSError, ValueError):
+            self.last_seen = {}
+
+    def get_status(self):
+        return {
+            "rows": min(self.written, self.capacity),
+            "capacity": self.capacity,
+            "labels": len(self.index),
+            "unspilled": self.written - self.spilled,
+            "subscription": self.subscription.get_status() if self.subscription else None
+        }
\ No newline at end of file
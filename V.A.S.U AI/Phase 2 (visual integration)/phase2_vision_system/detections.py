@@ -0,0 +1,167 @@
+import threading
+from collections import deque
+from functools import lru_cache
+import numpy as np
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+@lru_cache(maxsize=4)
+def load_class_names(path):
+    """Class names from coco.names as a tuple, read once and shared by every batch."""
+    with open(path, "r") as f:
+        return tuple(line.strip() for line in f.readlines())
+
+
+@lru_cache(maxsize=4)
+def _class_index(class_names):
+    return {name: i for i, name in enumerate(class_names)}
+
+
+def class_name(class_names, class_id):
+    """Label of a class ID; "unknown" for -1 (label not in the class list) or any other bad ID."""
+    return class_names[class_id] if 0 <= class_id < len(class_names) else "unknown"
+
+
+class DetectionBatch:
+    """
+    Immutable detections of one frame, stored as arrays instead of tuples:
+    boxes (N, 4) int32 x/y/w/h, scores (N,) float32, class_ids (N,) int32 and
+    track_ids (N,) int32 (-1 = not tracked), plus the camera, frame sequence
+    number, capture timestamp and scene state they belong to.
+
+    Iterating still yields (label, conf, [x, y, w, h]) with plain Python values,
+    so code written for the old lists keeps working.
+    """
+    __slots__ = ("boxes", "scores", "class_ids", "track_ids", "class_names",
+                 "camera_id", "seq", "timestamp", "scene")
+
+    def __init__(self, boxes, scores, class_ids, class_names, track_ids=None,
+                 camera_id=None, seq=0, timestamp=0.0, scene=None):
+        self.boxes = np.asarray(boxes, dtype=np.int32).reshape(-1, 4)
+        self.scores = np.asarray(scores, dtype=np.float32).reshape(-1)
+        self.class_ids = np.asarray(class_ids, dtype=np.int32).reshape(-1)
+        if track_ids is None:
+            track_ids = np.full(len(self.scores), -1)
+        self.track_ids = np.asarray(track_ids, dtype=np.int32).reshape(-1)
+        for array in (self.boxes, self.scores, self.class_ids, self.track_ids):
+            array.flags.writeable = False
+
+        self.class_names = class_names
+        self.camera_id = camera_id
+        self.seq = seq
+        self.timestamp = timestamp
+        self.scene = scene or {}
+
+    @classmethod
+    def empty(cls, class_names=(), **kwargs):
+        return cls(np.empty((0, 4)), (), (), class_names, **kwargs)
+
+    @classmethod
+    def from_tracks(cls, tracks, class_names, **kwargs):
+        """Builds a batch from ObjectTracker.get_tracks() rows: (track_id, label, conf, box)."""
+        if not tracks:
+            return cls.empty(class_names, **kwargs)
+        index = _class_index(class_names)
+        track_ids, labels, scores, boxes = zip(*tracks)
+        return cls(boxes, scores, [index.get(label, -1) for label in labels], class_names,
+                   track_ids=track_ids, **kwargs)
+
+    def __len__(self):
+        return len(self.scores)
+
+    def __bool__(self):
+        return len(self.scores) > 0
+
+    def __getitem__(self, i):
+        return (self.label(i), float(self.scores[i]), self.boxes[i].tolist())
+
+    def __iter__(self):
+        names = self.class_names
+        for class_id, score, box in zip(self.class_ids.tolist(), self.scores.tolist(), self.boxes.tolist()):
+            yield (class_name(names, class_id), score, box)
+
+    def label(self, i):
+        return class_name(self.class_names, int(self.class_ids[i]))
+
+    @property
+    def labels(self):
+        return [class_name(self.class_names, c) for c in self.class_ids.tolist()]
+
+    def tracks(self):
+        """[(track_id, label, conf, [x, y, w, h]), ...] as fresh Python values."""
+        return [(track_id,) + row for track_id, row in zip(self.track_ids.tolist(), self)]
+
+
+class Subscription:
+    """
+    One consumer of a DetectionBus. Either a callback is invoked for each
+    batch, or up to `maxsize` batches are queued for get(); when a consumer
+    falls behind the oldest is dropped, so it never blocks the detector.
+    `latest` is always the newest batch published.
+    """
+    def __init__(self, name, maxsize=4, callback=None):
+        self.name = name
+        self.queue = deque(maxlen=max(1, maxsize))
+        self.callback = callback
+        self.available = threading.Condition()
+        self.latest = None
+        self.delivered = 0
+        self.dropped = 0
+
+    def put(self, batch):
+        self.latest = batch
+        self.delivered += 1
+        if self.callback:
+            # Push-style consumer, nothing is queued
+            self.callback(batch)
+            return
+        with self.available:
+            if len(self.queue) == self.queue.maxlen:
+                self.dropped += 1
+            self.queue.append(batch)
+            self.available.notify()
+
+    def get(self, timeout=None):
+        """Next pending batch in publish order, or None on timeout."""
+        with self.available:
+            if not self.available.wait_for(lambda: self.queue, timeout):
+                return None
+            return self.queue.popleft()
+
+    def get_status(self):
+        return {"pending": len(self.queue), "delivered": self.delivered, "dropped": self.dropped}
+
+
+class DetectionBus:
+    """
+    Pushes each new DetectionBatch to every subscriber (GUI, command processor,
+    recorder, analytics) instead of everyone polling VisionManager under its lock.
+    Callbacks run on the publishing (detector) thread, so keep them short, e.g.
+    emit a Qt signal.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.subscribers = []
+
+    def subscribe(self, name, maxsize=4, callback=None):
+        subscription = Subscription(name, maxsize, callback)
+        with self.lock:
+            self.subscribers = self.subscribers + [subscription]
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self.lock:
+            self.subscribers = [s for s in self.subscribers if s is not subscription]
+
+    def publish(self, batch):
+        # Copy-on-write list: publishing never takes the lock
+        for subscription in self.subscribers:
+            try:
+                subscription.put(batch)
+            except Exception as e:
+                logger.warning(f"Detection subscriber '{subscription.name}' failed: {e}")
+
+    def get_status(self):
+        return {s.name: s.get_status() for s in self.subscribers}
\ No newline at end of file
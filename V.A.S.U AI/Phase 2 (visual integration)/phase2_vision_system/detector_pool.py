@@ -0,0 +1,289 @@
+import multiprocessing as mp
+import os
+import queue
+import threading
+import time
+from multiprocessing import shared_memory
+import numpy as np
+from utils.logger import get_logger
+from .detections import load_class_names
+from .inference_backends import select_backend_name
+
+logger = get_logger(__name__)
+
+
+def _attach_slots(name, num_slots, slot_bytes):
+    shm = shared_memory.SharedMemory(name=name)
+    slots = np.ndarray((num_slots, slot_bytes), dtype=np.uint8, buffer=shm.buf)
+    return shm, slots
+
+
+def _worker_main(worker_id, num_threads, backend_name, generations, tasks, results):
+    """
+    Entry point of a detector process. Every worker owns its own net, on the
+    backend the parent picked (workers never benchmark against each other).
+    generations[slot] is the seq that currently owns a ring slot: a task whose
+    frame the parent gave up on (and whose slot now holds another frame) is
+    skipped instead of detected on the wrong pixels.
+    """
+    import cv2
+    from phase2_vision_system.object_detector import ObjectDetector
+    from phase2_vision_system.detections import DetectionBatch
+
+    cv2.setNumThreads(num_threads)
+    detector = ObjectDetector()
+    results.put(("ready", worker_id, detector.initialize(backend_name) and detector.warm_up()))
+
+    shm, slots, shm_name = None, None, None
+    while True:
+        task = tasks.get()
+        if task is None:
+            break
+
+        seq, name, num_slots, slot_bytes, slot, shape = task
+        if name != shm_name:
+            # The parent re-allocated the ring (bigger frames), re-attach
+            if shm is not None:
+                del slots
+                shm.close()
+            shm, slots = _attach_slots(name, num_slots, slot_bytes)
+            shm_name = name
+
+        if generations[slot] != seq:
+            continue
+        frame = slots[slot, :int(np.prod(shape))].reshape(shape)
+        try:
+            detections = detector.detect_objects(frame)
+        except Exception as e:
+            logger.error(f"Detector worker {worker_id} failed on frame {seq}: {e}")
+            detections = DetectionBatch.empty(detector.classes)
+        if generations[slot] != seq:
+            continue  # Overwritten during the pass: these boxes belong to no frame
+        results.put(("result", seq, slot, detections))
+
+    if shm is not None:
+        del slots
+        shm.close()
+
+
+class DetectorPool:
+    """
+    Optional multi-process detection backend.
+    Frames are copied once into shared-memory ring slots (never pickled),
+    N worker processes run YOLO on them, and results come back in the
+    order the frames were submitted.
+    """
+    def __init__(self, settings, num_workers, num_slots=0):
+        self.settings = settings
+        self.num_workers = num_workers
+        self.num_slots = num_slots or num_workers * 2
+        self.ctx = mp.get_context("spawn")
+        self.tasks = None
+        self.results = None
+        self.workers = []
+        self.num_threads = 1
+        self.backend_name = None      # Chosen once in the parent, loaded by every worker
+        self.restarts = 0
+        self.max_restarts = num_workers * 3  # Then a worker that keeps dying is dropped
+        self.is_initialized = False
+
+        # Shared-memory ring
+        self.shm = None
+        self.slots = None
+        self.slot_bytes = settings.FRAME_WIDTH * settings.FRAME_HEIGHT * 3
+        self.free_slots = []
+        self.slot_free = threading.Condition()
+        # seq owning each slot, shared with the workers (-1 = free)
+        self.generations = self.ctx.Array("q", [-1] * self.num_slots, lock=False)
+
+        # Re-ordering
+        self.next_seq = 0             # Sequence number for the next submit
+        self.emit_seq = 0             # Next sequence number handed to the consumer
+        self.pending = {}             # seq -> (tag, submit_time, slot)
+        self.finished = {}            # seq -> detections, waiting for older frames
+        self.output = queue.Queue()
+        self.result_timeout = 5.0     # Give up on a frame with no result by then
+        self.collector = None
+        self.stop_event = threading.Event()
+
+    def initialize(self, timeout=60.0):
+        try:
+            self._allocate_ring(self.slot_bytes)
+            self.tasks = self.ctx.Queue()
+            self.results = self.ctx.Queue()
+
+            # Benchmark here, with all cores, instead of in N competing workers
+            num_classes = len(load_class_names(str(self.settings.YOLO_CLASSES)))
+            self.backend_name = select_backend_name(self.settings, num_classes)
+            if self.backend_name is None:
+                raise RuntimeError("no usable inference backend")
+
+            # Split the cores between workers instead of letting each one grab them all
+            self.num_threads = max(1, (os.cpu_count() or 1) // self.num_workers)
+            for worker_id in range(self.num_workers):
+                self.workers.append(self._start_worker(worker_id))
+
+            ready = 0
+            deadline = time.monotonic() + timeout
+            while ready < self.num_workers:
+                kind, worker_id, ok = self.results.get(timeout=max(0.1, deadline - time.monotonic()))
+                if kind == "ready" and not ok:
+                    raise RuntimeError(f"worker {worker_id} could not load the model")
+                ready += 1
+
+            self.stop_event.clear()
+            self.collector = threading.Thread(target=self._collect_loop, daemon=True)
+            self.collector.start()
+            self.is_initialized = True
+            logger.info(f"Detector pool started with {self.num_workers} workers, {self.num_slots} slots")
+            return True
+
+        except Exception as e:
+            logger.error(f"Failed to start detector pool: {e}")
+            self.stop()
+            return False
+
+    def submit(self, frame, tag=None, timeout=None):
+        """
+        Copies the frame into a free ring slot and queues it for detection.
+        Blocks until a slot is free; returns False on timeout.
+        """
+        if not self.is_initialized or frame is None:
+            return False
+
+        with self.slot_free:
+            if frame.nbytes > self.slot_bytes:
+                # Only resize the ring once nothing is in flight
+                if not self.slot_free.wait_for(lambda: not self.pending, timeout):
+                    return False
+                self._allocate_ring(frame.nbytes)
+
+            if not self.slot_free.wait_for(lambda: self.free_slots, timeout):
+                return False
+            slot = self.free_slots.pop()
+
+            seq = self.next_seq
+            self.next_seq += 1
+            self.pending[seq] = (tag, time.monotonic(), slot)
+            self.generations[slot] = seq
+
+        np.copyto(self.slots[slot, :frame.nbytes].reshape(frame.shape), frame)
+        self.tasks.put((seq, self.shm.name, self.num_slots, self.slot_bytes, slot, frame.shape))
+        return True
+
+    def get_result(self, timeout=None):
+        """Returns (tag, detections) in submit order, or None on timeout."""
+        try:
+            return self.output.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def _start_worker(self, worker_id):
+        process = self.ctx.Process(
+            target=_worker_main,
+            args=(worker_id, self.num_threads, self.backend_name, self.generations, self.tasks, self.results),
+            daemon=True
+        )
+        process.start()
+        return process
+
+    def _collect_loop(self):
+        last_check = time.monotonic()
+        while not self.stop_event.is_set():
+            try:
+                message = self.results.get(timeout=0.1)
+            except (queue.Empty, OSError, EOFError):
+                message = None
+
+            with self.slot_free:
+                if message and message[0] == "result":
+                    _, seq, slot, detections = message
+                    # A late result of an abandoned frame: its slot was already handed back
+                    if seq in self.pending:
+                        self.free_slots.append(slot)
+                        self.finished[seq] = detections
+                    self.slot_free.notify_all()
+                elif message and message[0] == "ready" and not message[2]:
+                    logger.error(f"Restarted detector worker {message[1]} could not load the model")
+                self._emit_in_order()
+
+            if time.monotonic() - last_check >= 1.0:
+                last_check = time.monotonic()
+                self._replace_dead_workers()
+
+    def _emit_in_order(self):
+        while self.emit_seq in self.pending:
+            tag, submitted, slot = self.pending[self.emit_seq]
+            if self.emit_seq in self.finished:
+                detections = self.finished.pop(self.emit_seq)
+            elif time.monotonic() - submitted > self.result_timeout:
+                # No result in time: its worker died, or it is still queued behind slow
+                # ones. Don't stall everything behind it; the slot is reused, and a
+                # worker that still picks the task up sees the new owner and skips it
+                logger.warning(f"Detector pool dropped frame {self.emit_seq} (no result)")
+                detections = None
+                self.generations[slot] = -1
+                self.free_slots.append(slot)
+            else:
+                break
+            del self.pending[self.emit_seq]
+            self.emit_seq += 1
+            if detections is not None:
+                self.output.put((tag, detections))
+        self.slot_free.notify_all()
+
+    def _replace_dead_workers(self):
+        """Respawns crashed workers, up to max_restarts; after that they are dropped."""
+        for index, process in enumerate(self.workers):
+            if process is None or process.is_alive():
+                continue
+            if self.restarts >= self.max_restarts:
+                logger.error(f"Detector worker {index} died (exit code {process.exitcode}), not restarting")
+                self.workers[index] = None
+                continue
+            logger.warning(f"Detector worker {index} died (exit code {process.exitcode}), restarting")
+            self.restarts += 1
+            self.workers[index] = self._start_worker(index)
+
+    def _allocate_ring(self, slot_bytes):
+        if self.shm is not None:
+            self.slots = None
+            self.shm.close()
+            self.shm.unlink()
+        self.slot_bytes = slot_bytes
+        self.shm = shared_memory.SharedMemory(create=True, size=self.num_slots * slot_bytes)
+        self.slots = np.ndarray((self.num_slots, slot_bytes), dtype=np.uint8, buffer=self.shm.buf)
+        self.free_slots = list(range(self.num_slots))
+
+    def stop(self):
+        self.stop_event.set()
+        self.is_initialized = False
+        if self.collector:
+            self.collector.join()
+            self.collector = None
+
+        self.workers = [p for p in self.workers if p is not None]
+        for _ in self.workers:
+            self.tasks.put(None)
+        for process in self.workers:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        self.workers = []
+
+        if self.shm is not None:
+            self.slots = None
+            self.shm.close()
+            self.shm.unlink()
+            self.shm = None
+
+    def get_detector_status(self):
+        return {
+            "is_initialized": self.is_initialized,
+            "model": "YOLOv4-Tiny",
+            "backend": self.backend_name,
+            "workers": sum(1 for p in self.workers if p is not None and p.is_alive()),
+            "restarts": self.restarts,
+            "in_flight": len(self.pending),
+            "free_slots": len(self.free_slots)
+        }
\ No newline at end of file
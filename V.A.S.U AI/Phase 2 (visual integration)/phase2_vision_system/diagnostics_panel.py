@@ -0,0 +1,49 @@
+from PyQt6.QtWidgets import QLabel
+from PyQt6.QtCore import QTimer
+from PyQt6.QtGui import QFont
+from utils.metrics import get_metrics
+
+
+class DiagnosticsPanel(QLabel):
+    """On-screen timing table for capture, inference, GUI, ASR, Gemini and TTS. Toggle with F3."""
+    def __init__(self, vision_manager, visible=False):
+        super().__init__()
+        self.vision_manager = vision_manager
+        self.setFont(QFont("Consolas", 9))
+        self.setStyleSheet("color: #00ffcc; background: #000; border: 1px solid #004444; padding: 5px;")
+
+        # Refreshed once a second, only while visible
+        self.timer = QTimer()
+        self.timer.timeout.connect(self.refresh)
+        self.setVisible(visible)
+        if visible:
+            self.refresh()
+            self.timer.start(1000)
+
+    def toggle(self):
+        visible = not self.isVisible()
+        self.setVisible(visible)
+        if visible:
+            self.refresh()
+            self.timer.start(1000)
+        else:
+            self.timer.stop()
+
+    def refresh(self):
+        lines = ["DIAGNOSTICS            last    p50    p95"]
+
+        status = self.vision_manager.get_status() if self.vision_manager else {}
+        for camera_id, camera in status.get("cameras", {}).items():
+            lines.append(
+                f"cam{camera_id}: {camera['capture_fps']} fps / det {camera['detection_fps']} fps"
+                f" / {camera['detection_latency_ms']} ms"
+            )
+
+        snapshot = get_metrics().snapshot()
+        for name, span in snapshot["spans"].items():
+            if "p50_ms" in span:
+                lines.append(f"{name:<20} {span['last_ms']:>6.1f} {span['p50_ms']:>6.1f} {span['p95_ms']:>6.1f}")
+        for name, value in snapshot["counters"].items():
+            lines.append(f"{name:<20} {value:>6}")
+
+        self.setText("\n".join(lines))
\ No newline at end of file
@@ -0,0 +1,108 @@
+import threading
+import numpy as np
+
+
+class FrameBuffer:
+    """
+    A pooled frame. Consumers only ever see the read-only `view`;
+    the writable `array` belongs to the capture side.
+    Use as a context manager (or call release()) when done with it.
+    """
+    def __init__(self, pool, array):
+        self.pool = pool
+        self.refs = 0
+        self.version = 0       # Frame sequence number of the contents
+        self.timestamp = 0.0   # Capture time (time.monotonic)
+        self.adopt(array)
+
+    def adopt(self, array):
+        """Makes `array` the backing store (e.g. when the camera changed size)."""
+        self.array = array
+        self.view = array.view()
+        self.view.flags.writeable = False
+
+    def acquire(self):
+        self.pool._acquire(self)
+        return self
+
+    def release(self):
+        self.pool._release(self)
+
+    def copy(self):
+        """A private, writable copy for consumers that really need one."""
+        return self.array.copy()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+class FramePool:
+    """
+    Preallocated, reference-counted frame buffers.
+    The camera reads straight into a free buffer; a buffer only goes back
+    to the pool once every reader has released it.
+    """
+    def __init__(self, shape, size=4, dtype=np.uint8):
+        self.shape = tuple(shape)
+        self.dtype = dtype
+        self.lock = threading.Lock()
+        self.free = []
+        self.total = 0
+        self.allocations = 0
+        for _ in range(size):
+            self.free.append(self._new_buffer())
+
+    def get_buffer(self):
+        """Returns a free buffer owned by the caller (refs = 1)."""
+        with self.lock:
+            buffer = self.free.pop() if self.free else self._new_buffer()
+            buffer.refs = 1
+            return buffer
+
+    def _new_buffer(self):
+        # Only grows when every buffer is held by someone
+        self.allocations += 1
+        self.total += 1
+        return FrameBuffer(self, np.empty(self.shape, dtype=self.dtype))
+
+    def set_shape(self, shape):
+        """Called when the source changes resolution; old free buffers are dropped."""
+        with self.lock:
+            shape = tuple(shape)
+            if shape != self.shape:
+                self.shape = shape
+                self.total -= len(self.free)
+                self.free.clear()
+
+    def _acquire(self, buffer):
+        with self.lock:
+            buffer.refs += 1
+
+    def _release(self, buffer):
+        with self.lock:
+            buffer.refs -= 1
+            if buffer.refs == 0:
+                if buffer.array.shape == self.shape:
+                    self.free.append(buffer)
+                else:
+                    # Left over from before a resolution change
+                    self.total -= 1
+
+    def get_status(self):
+        with self.lock:
+            return {
+                "buffers": self.total,
+                "free": len(self.free),
+                "allocations": self.allocations
+            }
+
+
+def reuse_copy(src, dst=None):
+    """Copies src into dst, allocating a new array only when the shape changes."""
+    if dst is None or dst.shape != src.shape or dst.dtype != src.dtype:
+        return src.copy()
+    np.copyto(dst, src)
+    return dst
\ No newline at end of file
@@ -0,0 +1,235 @@
+import time
+from pathlib import Path
+import cv2
+import numpy as np
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".bmp"}
+
+
+class FrameSource:
+    """
+    Something that produces BGR frames: a webcam, a file, a folder, a generator.
+    `speed` controls playback of recorded sources: 1.0 = real-time,
+    2.0 = twice as fast, 0 = as fast as possible (benchmarks).
+    """
+    def __init__(self, speed=1.0, loop=True):
+        self.speed = speed
+        self.loop = loop
+        self.fps = 30.0
+        self.frame_index = 0
+        self.finished = False
+        self.clock_start = None
+
+    def open(self):
+        raise NotImplementedError
+
+    def read(self, out=None):
+        raise NotImplementedError
+
+    def release(self):
+        pass
+
+    def describe(self):
+        return self.__class__.__name__
+
+    def _pace(self):
+        """Sleeps until the current frame is due at the configured speed."""
+        if self.speed <= 0:
+            return
+        now = time.monotonic()
+        if self.clock_start is None:
+            self.clock_start = now
+        due = self.clock_start + self.frame_index / (self.fps * self.speed)
+        if due > now:
+            time.sleep(due - now)
+        elif now - due > 1.0:
+            # We fell far behind (e.g. debugger pause); restart the clock instead of rushing
+            self.clock_start = now - self.frame_index / (self.fps * self.speed)
+
+    def _restart(self):
+        self.frame_index = 0
+        self.clock_start = None
+
+
+class WebcamSource(FrameSource):
+    """A live camera. Paced by the device itself, `speed` is ignored."""
+    def __init__(self, index=0, width=640, height=480):
+        super().__init__(speed=0)
+        self.index = index
+        self.width = width
+        self.height = height
+        self.cap = None
+
+    def open(self):
+        self.cap = cv2.VideoCapture(self.index)
+        if not self.cap.isOpened():
+            return False
+        # Set resolution
+        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
+        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
+        # Keep the driver queue short so reads return the newest frame
+        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        return True
+
+    def read(self, out=None):
+        ret, frame = self.cap.read(out)
+        return frame if ret else None
+
+    def release(self):
+        if self.cap:
+            self.cap.release()
+
+    def describe(self):
+        return f"webcam:{self.index}"
+
+
+class VideoFileSource(FrameSource):
+    """A recorded video file, replayed at its own FPS times `speed`."""
+    def __init__(self, path, speed=1.0, loop=True):
+        super().__init__(speed, loop)
+        self.path = Path(path)
+        self.cap = None
+
+    def open(self):
+        self.cap = cv2.VideoCapture(str(self.path))
+        if not self.cap.isOpened():
+            return False
+        self.fps = self.cap.get(cv2.CAP_PROP_FPS) or 30.0
+        return True
+
+    def read(self, out=None):
+        if self.finished:
+            return None
+        self._pace()
+        ret, frame = self.cap.read(out)
+        if not ret and self.loop:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            self._restart()
+            ret, frame = self.cap.read(out)
+        if not ret:
+            self.finished = True
+            return None
+        self.frame_index += 1
+        return frame
+
+    def release(self):
+        if self.cap:
+            self.cap.release()
+
+    def describe(self):
+        return f"video:{self.path.name}"
+
+
+class ImageDirectorySource(FrameSource):
+    """Every image in a folder (sorted by name), played back like a video."""
+    def __init__(self, path, speed=1.0, loop=True, fps=30.0):
+        super().__init__(speed, loop)
+        self.path = Path(path)
+        self.fps = fps
+        self.files = []
+
+    def open(self):
+        self.files = sorted(p for p in self.path.iterdir() if p.suffix.lower() in IMAGE_EXTENSIONS)
+        return bool(self.files)
+
+    def read(self, out=None):
+        if self.finished:
+            return None
+        if self.frame_index >= len(self.files):
+            if not self.loop:
+                self.finished = True
+                return None
+            self._restart()
+        self._pace()
+        frame = cv2.imread(str(self.files[self.frame_index]), cv2.IMREAD_COLOR)
+        self.frame_index += 1
+        if frame is None:
+            logger.warning(f"Could not read image {self.files[self.frame_index - 1]}")
+            return None
+        if out is not None and out.shape == frame.shape:
+            np.copyto(out, frame)
+            return out
+        return frame
+
+    def describe(self):
+        return f"images:{self.path.name}"
+
+
+class SyntheticSource(FrameSource):
+    """
+    Deterministic test pattern: a few coloured shapes moving over a gradient.
+    Frame N always looks the same for a given seed, so runs are reproducible.
+    """
+    def __init__(self, width=640, height=480, speed=1.0, seed=0, num_frames=None, fps=30.0):
+        super().__init__(speed, loop=num_frames is None)
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.num_frames = num_frames
+        rng = np.random.default_rng(seed)
+        self.shapes = [
+            {
+                "pos": rng.uniform([0, 0], [width, height]),
+                "vel": rng.uniform(-4, 4, size=2),
+                "size": int(rng.integers(30, 120)),
+                "color": tuple(int(c) for c in rng.integers(40, 255, size=3))
+            }
+            for _ in range(4)
+        ]
+        # Background is computed once, frames only paint the shapes on top
+        gradient = np.linspace(20, 90, width, dtype=np.uint8)
+        self.background = np.repeat(np.tile(gradient, (height, 1))[:, :, None], 3, axis=2)
+
+    def open(self):
+        return True
+
+    def read(self, out=None):
+        if self.num_frames is not None and self.frame_index >= self.num_frames:
+            self.finished = True
+            return None
+        self._pace()
+        if out is None or out.shape != self.background.shape:
+            out = np.empty_like(self.background)
+        np.copyto(out, self.background)
+
+        for shape in self.shapes:
+            # Bounce around the frame (position is a pure function of frame_index)
+            x, y = shape["pos"] + shape["vel"] * self.frame_index
+            x = int(abs((x % (2 * self.width)) - self.width))
+            y = int(abs((y % (2 * self.height)) - self.height))
+            s = shape["size"]
+            cv2.rectangle(out, (x - s // 2, y - s // 2), (x + s // 2, y + s // 2), shape["color"], -1)
+
+        self.frame_index += 1
+        return out
+
+    def describe(self):
+        return "synthetic"
+
+
+def create_source(spec, settings):
+    """
+    Builds a frame source from a CAMERA_SOURCES entry:
+    0 / "1"           -> webcam index
+    "synthetic"       -> generated test pattern ("synthetic:42" sets the seed)
+    "path/to/folder"  -> image directory
+    "path/to/clip.mp4"-> video file
+    """
+    speed = settings.PLAYBACK_SPEED
+    loop = settings.PLAYBACK_LOOP
+
+    if isinstance(spec, int) or str(spec).isdigit():
+        return WebcamSource(int(spec), settings.FRAME_WIDTH, settings.FRAME_HEIGHT)
+
+    spec = str(spec)
+    if spec.startswith("synthetic"):
+        seed = int(spec.split(":", 1)[1]) if ":" in spec else 0
+        return SyntheticSource(settings.FRAME_WIDTH, settings.FRAME_HEIGHT, speed, seed, fps=settings.FPS)
+
+    path = Path(spec)
+    if path.is_dir():
+        return ImageDirectorySource(path, speed, loop, fps=settings.FPS)
+    return VideoFileSource(path, speed, loop)
\ No newline at end of file
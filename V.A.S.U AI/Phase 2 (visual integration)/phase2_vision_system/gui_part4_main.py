@@ -1,16 +1,20 @@
 import sys
-import cv2
-from PyQt6.QtWidgets import QApplication, QMainWindow, QLabel, QVBoxLayout, QWidget, QTextEdit
-from PyQt6.QtCore import QTimer, Qt
-from PyQt6.QtGui import QImage, QPixmap, QFont
+from PyQt6.QtWidgets import QApplication, QMainWindow, QLabel, QVBoxLayout, QWidget
+from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtGui import QFont
 from config.settings import Settings
-from phase2_vision_system.vision_manager import VisionManager
+from phase2_vision_system.hud_video import VideoLabel
+from phase2_vision_system.log_console import LogConsole
+from phase2_vision_system.diagnostics_panel import DiagnosticsPanel
+from utils.startup import get_startup
 
 class ModernHUD(QMainWindow):
+    subsystem_ready = pyqtSignal(str, bool)  # Emitted from startup threads, handled on the GUI thread
+
     def __init__(self):
         super().__init__()
         self.settings = Settings()
-        self.vision_manager = VisionManager(self.settings)
+        self.vision_manager = None  # Created by the "vision core" startup task (cv2/numpy load after the window shows)
         
         self.setWindowTitle("V.A.S.U - VISION SYSTEMS")
         self.setGeometry(100, 100, 1000, 700)
@@ -28,63 +32,81 @@ class ModernHUD(QMainWindow):
         layout.addWidget(self.header)
 
         # Video Feed Label
-        self.video_label = QLabel("Initializing Camera...")
+        # Redraws itself whenever the camera has a new frame (overlay added in attach_vision)
+        self.video_label = VideoLabel(text="Initializing Camera...")
         self.video_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.video_label.setStyleSheet("border: 2px solid #00ffcc; background: #000;")
         self.video_label.setMinimumSize(640, 480)
         layout.addWidget(self.video_label)
 
-        # Logs
-        self.log_box = QTextEdit()
-        self.log_box.setReadOnly(True)
+        # Logs (bounded, older lines stay in logs/vasu.log)
+        self.log_box = LogConsole(self.settings.LOG_CONSOLE_LINES, timestamps=False)
         self.log_box.setMaximumHeight(150)
         self.log_box.setStyleSheet("border: 1px solid #005544; font-family: Consolas;")
         layout.addWidget(self.log_box)
 
-        # Start System
+        # Diagnostics (F3)
+        self.diagnostics = DiagnosticsPanel(None, self.settings.SHOW_DIAGNOSTICS)
+        layout.addWidget(self.diagnostics)
+
+        # Start System (camera and detector in parallel, the window doesn't wait)
         self.log("Initializing core systems...")
-        if self.vision_manager.start_vision_system():
-            self.log("Vision System: ONLINE")
-            self.log("Camera Feed: ACQUIRED")
-        else:
-            self.log("CRITICAL ERROR: Camera initialization failed!")
+        self.startup = get_startup()
+        self.subsystem_ready.connect(self.on_subsystem_ready)
+        self.startup.subscribe(self.subsystem_ready.emit)
+        self.startup.add("vision core", self.load_vision)
+        self.startup.add("camera", lambda: self.vision_manager.initialize_camera(), after=("vision core",))
+        self.startup.add("detector", lambda: self.vision_manager.initialize_detector(), after=("vision core",))
+        self.startup.add("vision", lambda: self.vision_manager.start_vision_system(), after=("camera", "detector"))
+        self.startup.start(self.settings.STARTUP_BUDGET)
 
-        # Timer for updating UI
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.update_frame)
-        self.timer.start(30)
+    def load_vision(self):
+        # Startup thread: cv2, numpy and the detector stack are the slowest imports
+        with self.startup.phase("import vision"):
+            from phase2_vision_system.vision_manager import VisionManager
+        self.vision_manager = VisionManager(self.settings)
+
+    def attach_vision(self):
+        # GUI thread, once the vision core is loaded
+        from phase2_vision_system.overlay_renderer import OverlayRenderer
+        self.overlay = OverlayRenderer("modern")
+        self.video_label.attach(self.vision_manager, overlay=self.overlay.paint)
+        self.diagnostics.vision_manager = self.vision_manager
 
     def log(self, message):
-        self.log_box.append(f">> {message}")
+        self.log_box.log(None, message)
 
-    def update_frame(self):
-        frame = self.vision_manager.get_frame()
-        detections = self.vision_manager.get_detections()
-        
-        if frame is not None:
-            # Draw detections (Mock HUD overlay)
-            for (label, conf, (x, y, w, h)) in detections:
-                cv2.rectangle(frame, (x, y), (x+w, y+h), (0, 255, 204), 2)
-                cv2.putText(frame, f"{label} {int(conf*100)}%", (x, y-10), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 204), 2)
-
-            # Convert to Qt Format
-            rgb_image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            h, w, ch = rgb_image.shape
-            bytes_per_line = ch * w
-            qt_image = QImage(rgb_image.data, w, h, bytes_per_line, QImage.Format.Format_RGB888)
-            self.video_label.setPixmap(QPixmap.fromImage(qt_image).scaled(
-                self.video_label.width(), self.video_label.height(), 
-                Qt.AspectRatioMode.KeepAspectRatio))
+    def on_subsystem_ready(self, name, ok):
+        if name == "vision core" and ok:
+            self.attach_vision()
+        if name == "vision":
+            if ok:
+                self.log("Vision System: ONLINE")
+                self.log("Camera Feed: ACQUIRED")
+            else:
+                self.log("CRITICAL ERROR: Camera initialization failed!")
+        elif name == "detector" and not ok:
+            self.log("WARNING: Object detector unavailable")
+
+    def keyPressEvent(self, event):
+        # F3 toggles the diagnostics panel
+        if event.key() == Qt.Key.Key_F3:
+            self.diagnostics.toggle()
+        else:
+            super().keyPressEvent(event)
 
     def closeEvent(self, event):
-        self.vision_manager.stop_vision_system()
+        # Let any subsystem that is still starting finish before shutting it down (a hung one is abandoned)
+        self.startup.wait_all(timeout=self.settings.SHUTDOWN_WAIT)
+        if self.vision_manager:
+            self.vision_manager.stop_vision_system()
         event.accept()
 
 def main():
     app = QApplication(sys.argv)
     window = ModernHUD()
     window.show()
+    get_startup().mark("window shown")
     sys.exit(app.exec())
 
 if __name__ == "__main__":
@@ -1,95 +1,138 @@
 import sys
-import cv2
 import threading
 import time
-from datetime import datetime
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QLabel, QVBoxLayout, 
-                             QWidget, QTextEdit, QHBoxLayout)
-from PyQt6.QtCore import QTimer, Qt, pyqtSignal, QThread
-from PyQt6.QtGui import QImage, QPixmap, QFont
+                             QWidget, QHBoxLayout)
+from PyQt6.QtCore import Qt, pyqtSignal, QThread
+from PyQt6.QtGui import QFont
 
 # Import Project Settings
 from config.settings import Settings
-from phase2_vision_system.vision_manager import VisionManager
+from phase2_vision_system.hud_video import VideoLabel
+from phase2_vision_system.log_console import LogConsole
+from phase2_vision_system.diagnostics_panel import DiagnosticsPanel
+from utils.startup import get_startup
 
 # --- Voice Worker Thread ---
 class VoiceWorker(QThread):
     text_received = pyqtSignal(str, str) # type (User/AI), message
     status_update = pyqtSignal(str)      # Listening/Processing/etc
     
-    def __init__(self, settings, vision_manager):
+    def __init__(self, settings, vision_manager=None):
         super().__init__()
         self.settings = settings
-        self.vision_manager = vision_manager 
+        self.vision_manager = vision_manager  # Set by the HUD before the "ai" task runs
         self.is_running = True
         self.voice_manager = None
         self.command_processor = None
+        self.startup = get_startup()
+
+    # Startup tasks: run on background threads while the window is already up
+    def init_microphone(self):
+        with self.startup.phase("import voice"):
+            from phase1_voice_interface.voice_manager import VoiceManager
+        self.voice_manager = VoiceManager(self.settings)
+        self.voice_manager.on_speech_progress = self.on_speech_progress
+        
+        # Init Mic
+        if hasattr(self.voice_manager, 'initialize'):
+            return self.voice_manager.initialize()
+        return True
+
+    def init_ai(self):
+        with self.startup.phase("import ai"):
+            from phase1_voice_interface.command_processor import CommandProcessor
+        
+        # Pass vision manager to command processor
+        self.command_processor = CommandProcessor(self.settings, self.vision_manager)
+        return self.command_processor.ai.model is not None
 
     def run(self):
         self.status_update.emit("Initializing Audio...")
         try:
-            from phase1_voice_interface.voice_manager import VoiceManager
-            from phase1_voice_interface.command_processor import CommandProcessor
-            
-            self.voice_manager = VoiceManager(self.settings)
-            
-            # Pass vision manager to command processor
-            self.command_processor = CommandProcessor(self.settings, self.vision_manager)
-            
-            # Init Mic
-            if hasattr(self.voice_manager, 'initialize'):
-                self.voice_manager.initialize()
+            # Wait for the mic and the AI client, but stay responsive to stop()
+            for name in ("microphone", "ai"):
+                while self.is_running and not self.startup.wait(name, timeout=0.2):
+                    pass
+            if not self.is_running:
+                return
+            if self.voice_manager is None or self.command_processor is None:
+                self.text_received.emit("Error", "Voice systems failed to start.")
+                return
 
             self.text_received.emit("System", "Voice Systems Online.")
             
             # ========================================================
             # 🔔 WELCOME PROTOCOL (The New Addition)
             # ========================================================
-            welcome_message = "Welcome back, Boss. All systems are online and ready."
-            self.text_received.emit("VASU", welcome_message)
-            self.status_update.emit("Speaking...")
+            # Same text as the pre-rendered phrase, so it plays from the TTS cache
+            from phase1_voice_interface.command_processor import WELCOME_REPLY
+            self.text_received.emit("VASU", WELCOME_REPLY)
             if hasattr(self.voice_manager, 'speak'):
-                self.voice_manager.speak(welcome_message)
+                self.voice_manager.speak(WELCOME_REPLY)  # Queued: we go straight on to listening
+            if hasattr(self.voice_manager, 'prerender'):
+                self.voice_manager.prerender(self.command_processor.common_phrases())
             # ========================================================
             
-            # Main Loop
+            # Main Loop (the mic records all the time, listen() hands over the next utterance)
+            # While VASU talks the speech progress drives the status instead
+            listening = False
             while self.is_running:
-                self.status_update.emit("Listening...")
+                if not listening:
+                    self.status_update.emit("Listening...")
+                    listening = True
                 
                 if hasattr(self.voice_manager, 'listen'):
-                    command = self.voice_manager.listen() 
+                    command = self.voice_manager.listen(timeout=0.5)
                 else:
                     time.sleep(1)
                     command = None
                 
                 if command:
+                    listening = False
                     self.status_update.emit("Processing...")
                     self.text_received.emit("User", command)
                     
-                    response = self.command_processor.process_command(command)
-                    if response:
-                        self.text_received.emit("VASU", response)
-                        self.status_update.emit("Speaking...")
+                    # Each sentence is logged and spoken as soon as it arrives
+                    response = self.command_processor.process_command(command, stream=self.settings.AI_STREAMING)
+                    if isinstance(response, str):
+                        response = [response]
+                    utterance = None
+                    for sentence in response or ():
+                        if not self.is_running or (utterance and utterance.state == "interrupted"):
+                            break  # Barge-in: don't speak the rest of this answer
+                        self.text_received.emit("VASU", sentence)
                         if hasattr(self.voice_manager, 'speak'):
-                            self.voice_manager.speak(response)
-                
-                time.sleep(0.1)
+                            utterance = self.voice_manager.speak(sentence)
+                            listening = True
 
         except Exception as e:
             self.text_received.emit("Error", str(e))
 
+    def on_speech_progress(self, utterance, event):
+        # Speech thread: Qt queues the signal over to the GUI
+        if event == "started":
+            self.status_update.emit("Speaking...")
+        elif event != "word":
+            self.status_update.emit("Listening...")
+
     def stop(self):
         self.is_running = False
         self.wait()
+        if self.voice_manager and hasattr(self.voice_manager, 'stop'):
+            self.voice_manager.stop()
 
 # --- Main GUI Class ---
 class IntegratedHUD(QMainWindow):
+    subsystem_ready = pyqtSignal(str, bool)  # Emitted from startup threads, handled on the GUI thread
+    detections_ready = pyqtSignal(object)    # DetectionBatch pushed by the vision system
+
     def __init__(self):
         super().__init__()
         self.settings = Settings()
         
         # Initialize Core Managers
-        self.vision_manager = VisionManager(self.settings)
+        self.vision_manager = None  # Created by the "vision core" startup task (cv2/numpy load after the window shows)
         
         # UI Setup
         self.setWindowTitle("V.A.S.U - PHASE 3 INTEGRATION")
@@ -110,7 +153,8 @@ class IntegratedHUD(QMainWindow):
         self.header.setAlignment(Qt.AlignmentFlag.AlignCenter)
         left_layout.addWidget(self.header)
 
-        self.video_label = QLabel("Initializing Camera...")
+        # Redraws itself whenever the camera has a new frame (overlay added in attach_vision)
+        self.video_label = VideoLabel(text="Initializing Camera...")
         self.video_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.video_label.setStyleSheet("border: 2px solid #00ffcc; background: #000;")
         self.video_label.setMinimumSize(640, 480)
@@ -134,37 +178,70 @@ class IntegratedHUD(QMainWindow):
         self.status_label.setStyleSheet("background-color: #003333; padding: 10px; border-radius: 5px;")
         right_layout.addWidget(self.status_label)
 
-        self.log_box = QTextEdit()
-        self.log_box.setReadOnly(True)
+        # Bounded chat log, older lines stay in logs/vasu.log
+        self.log_box = LogConsole(self.settings.LOG_CONSOLE_LINES)
         self.log_box.setStyleSheet("border: none; font-family: Consolas; font-size: 14px; padding: 10px;")
         right_layout.addWidget(self.log_box)
 
-        main_layout.addWidget(right_panel, stretch=1)
+        # Diagnostics (F3)
+        self.diagnostics = DiagnosticsPanel(None, self.settings.SHOW_DIAGNOSTICS)
+        right_layout.addWidget(self.diagnostics)
 
-        # Start Vision System
-        if self.vision_manager.start_vision_system():
-            self.log("System", "Vision System: ONLINE")
-        else:
-            self.log("System", "CRITICAL: Vision System Failed")
+        main_layout.addWidget(right_panel, stretch=1)
 
-        # Start Voice Thread
-        self.voice_thread = VoiceWorker(self.settings, self.vision_manager)
+        # Voice Thread
+        self.voice_thread = VoiceWorker(self.settings)
         self.voice_thread.text_received.connect(self.log)
         self.voice_thread.status_update.connect(self.update_status)
+
+        # Camera, detector, mic and Gemini come up in parallel; the window doesn't wait
+        self.startup = get_startup()
+        self.subsystem_ready.connect(self.on_subsystem_ready)
+        self.startup.subscribe(self.subsystem_ready.emit)
+        self.startup.add("vision core", self.load_vision)
+        self.startup.add("camera", lambda: self.vision_manager.initialize_camera(), after=("vision core",))
+        self.startup.add("detector", lambda: self.vision_manager.initialize_detector(), after=("vision core",))
+        self.startup.add("vision", lambda: self.vision_manager.start_vision_system(), after=("camera", "detector"))
+        self.startup.add("microphone", self.voice_thread.init_microphone)
+        self.startup.add("ai", self.voice_thread.init_ai, after=("vision core",))
+        self.startup.start(self.settings.STARTUP_BUDGET)
+
+        self.detections_ready.connect(self.on_detections)
         self.voice_thread.start()
 
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.update_frame)
-        self.timer.start(30)
+    def load_vision(self):
+        # Startup thread: cv2, numpy and the detector stack are the slowest imports
+        with self.startup.phase("import vision"):
+            from phase2_vision_system.vision_manager import VisionManager
+        self.vision_manager = VisionManager(self.settings)
+        self.voice_thread.vision_manager = self.vision_manager
+
+    def attach_vision(self):
+        # GUI thread, once the vision core is loaded
+        from phase2_vision_system.overlay_renderer import OverlayRenderer
+        self.overlay = OverlayRenderer("integrated")
+        self.video_label.attach(self.vision_manager, overlay=self.overlay.paint)
+        self.diagnostics.vision_manager = self.vision_manager
+        # The info line only changes when the detector has something new
+        self.vision_manager.bus.subscribe("hud", maxsize=1, callback=self.detections_ready.emit)
 
     def log(self, sender, message):
-        color = "#00ffcc"
-        if sender == "User": color = "#ffffff"
-        elif sender == "Error": color = "#ff3333"
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        html = f'<div style="margin-bottom: 5px;"><span style="color: #666;">[{timestamp}]</span> <b style="color: {color}">{sender}:</b> {message}</div>'
-        self.log_box.append(html)
-        self.log_box.verticalScrollBar().setValue(self.log_box.verticalScrollBar().maximum())
+        self.log_box.log(sender, message)
+
+    def on_subsystem_ready(self, name, ok):
+        if name == "vision core" and ok:
+            self.attach_vision()
+        if name == "vision":
+            self.log("System", "Vision System: ONLINE" if ok else "CRITICAL: Vision System Failed")
+        elif ok:
+            self.log("System", f"{name.capitalize()}: READY")
+        else:
+            self.log("Error", f"{name.capitalize()}: FAILED")
+
+    def on_detections(self, batch):
+        label_text = "".join(f"• {label} ({int(conf*100)}%)  " for (label, conf, _) in batch)
+        if label_text: self.info_label.setText(label_text)
+        else: self.info_label.setText("Scanning area...")
 
     def update_status(self, status):
         self.status_label.setText(status.upper())
@@ -175,32 +252,18 @@ class IntegratedHUD(QMainWindow):
         else:
             self.status_label.setStyleSheet("background-color: #003333; color: #0fc; padding: 10px;")
 
-    def update_frame(self):
-        frame = self.vision_manager.get_frame()
-        detections = self.vision_manager.get_detections()
-        
-        if frame is not None:
-            label_text = ""
-            for (label, conf, (x, y, w, h)) in detections:
-                cv2.rectangle(frame, (x, y), (x+w, y+h), (0, 255, 204), 2)
-                label_str = f"{label} {int(conf*100)}%"
-                (tw, th), _ = cv2.getTextSize(label_str, cv2.FONT_HERSHEY_SIMPLEX, 0.6, 1)
-                cv2.rectangle(frame, (x, y-20), (x+tw, y), (0, 255, 204), -1)
-                cv2.putText(frame, label_str, (x, y-5), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 0, 0), 2)
-                label_text += f"• {label} ({int(conf*100)}%)  "
-
-            if label_text: self.info_label.setText(label_text)
-            else: self.info_label.setText("Scanning area...")
-
-            rgb_image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            h, w, ch = rgb_image.shape
-            bytes_per_line = ch * w
-            qt_image = QImage(rgb_image.data, w, h, bytes_per_line, QImage.Format.Format_RGB888)
-            self.video_label.setPixmap(QPixmap.fromImage(qt_image).scaled(
-                self.video_label.width(), self.video_label.height(), Qt.AspectRatioMode.KeepAspectRatio))
+    def keyPressEvent(self, event):
+        # F3 toggles the diagnostics panel
+        if event.key() == Qt.Key.Key_F3:
+            self.diagnostics.toggle()
+        else:
+            super().keyPressEvent(event)
 
     def closeEvent(self, event):
-        self.vision_manager.stop_vision_system()
+        # Let any subsystem that is still starting finish before shutting it down (a hung one is abandoned)
+        self.startup.wait_all(timeout=self.settings.SHUTDOWN_WAIT)
+        if self.vision_manager:
+            self.vision_manager.stop_vision_system()
         self.voice_thread.stop()
         event.accept()
 
@@ -208,6 +271,7 @@ def main():
     app = QApplication(sys.argv)
     window = IntegratedHUD()
     window.show()
+    get_startup().mark("window shown")
     sys.exit(app.exec())
 
 if __name__ == "__main__":
@@ -0,0 +1,260 @@
+import json
+import os
+import platform
+import time
+import cv2
+import numpy as np
+from pathlib import Path
+from utils.logger import get_logger
+from .frame_sources import SyntheticSource
+
+logger = get_logger(__name__)
+
+
+class InferenceBackend:
+    """
+    One way of running the YOLO network. load() returns False when the
+    backend is not usable on this host; forward() takes a blob and returns
+    the raw YOLO output arrays (rows of x, y, w, h, objectness, class scores).
+    """
+    name = "base"
+
+    def __init__(self):
+        # Set when the model only accepts one input size (disables adaptive resolution)
+        self.fixed_input_size = None
+
+    def load(self, settings):
+        raise NotImplementedError
+
+    def forward(self, blob):
+        raise NotImplementedError
+
+
+class OpenCVBackend(InferenceBackend):
+    """Darknet weights through cv2.dnn with a given backend/target pair."""
+    def __init__(self, name, backend_id, target_id):
+        super().__init__()
+        self.name = name
+        self.backend_id = backend_id
+        self.target_id = target_id
+        self.net = None
+        self.output_layers = []
+
+    def load(self, settings):
+        if not Path(settings.YOLO_WEIGHTS).exists():
+            return False
+
+        self.net = cv2.dnn.readNet(str(settings.YOLO_WEIGHTS), str(settings.YOLO_CONFIG))
+        self.net.setPreferableBackend(self.backend_id)
+        self.net.setPreferableTarget(self.target_id)
+
+        layer_names = self.net.getLayerNames()
+        self.output_layers = [layer_names[i - 1] for i in self.net.getUnconnectedOutLayers()]
+        return True
+
+    def forward(self, blob):
+        self.net.setInput(blob)
+        return self.net.forward(self.output_layers)
+
+
+class OnnxRuntimeBackend(InferenceBackend):
+    """An exported ONNX model (FP32 or INT8-quantized) through ONNX Runtime."""
+    def __init__(self, name, model_attr):
+        super().__init__()
+        self.name = name
+        self.model_attr = model_attr
+        self.session = None
+        self.input_name = None
+        self.fixed_batch_size = None  # Static batch dimension of the export, if any
+
+    def load(self, settings):
+        model_path = Path(getattr(settings, self.model_attr))
+        if not model_path.exists():
+            return False
+        try:
+            import onnxruntime
+        except ImportError:
+            return False
+
+        self.session = onnxruntime.InferenceSession(str(model_path), providers=["CPUExecutionProvider"])
+        model_input = self.session.get_inputs()[0]
+        self.input_name = model_input.name
+
+        # Exported models usually have a static NCHW shape
+        height = model_input.shape[2]
+        if isinstance(height, int):
+            self.fixed_input_size = height
+        batch = model_input.shape[0]
+        if isinstance(batch, int):
+            self.fixed_batch_size = batch
+        return True
+
+    def forward(self, blob):
+        step = self.fixed_batch_size
+        if not step or len(blob) == step:
+            return self.session.run(None, {self.input_name: blob})
+
+        # Static batch size (usually 1): run the frames in model-sized chunks,
+        # padding the last one, and stack the outputs as (batch, rows, values)
+        parts = []
+        for i in range(0, len(blob), step):
+            chunk = blob[i:i + step]
+            count = len(chunk)
+            if count < step:
+                chunk = np.concatenate([chunk, np.zeros((step - count,) + chunk.shape[1:], dtype=chunk.dtype)])
+            outs = self.session.run(None, {self.input_name: chunk})
+            parts.append([out.reshape(step, -1, out.shape[-1])[:count] for out in outs])
+        return [np.concatenate(outs) for outs in zip(*parts)]
+
+
+def _opencv_candidates():
+    """(name, backend, target) combinations this OpenCV build can run."""
+    candidates = [("opencv-cpu", cv2.dnn.DNN_BACKEND_OPENCV, cv2.dnn.DNN_TARGET_CPU)]
+    # Only where the CPU really has an FP16 path (elsewhere OpenCV quietly falls back to FP32)
+    if hasattr(cv2.dnn, "DNN_TARGET_CPU_FP16") and \
+            cv2.dnn.DNN_TARGET_CPU_FP16 in cv2.dnn.getAvailableTargets(cv2.dnn.DNN_BACKEND_OPENCV):
+        candidates.append(("opencv-cpu-fp16", cv2.dnn.DNN_BACKEND_OPENCV, cv2.dnn.DNN_TARGET_CPU_FP16))
+    # OpenVINO build of OpenCV
+    if cv2.dnn.getAvailableTargets(cv2.dnn.DNN_BACKEND_INFERENCE_ENGINE):
+        candidates.append(("openvino-cpu", cv2.dnn.DNN_BACKEND_INFERENCE_ENGINE, cv2.dnn.DNN_TARGET_CPU))
+    return candidates
+
+
+# name -> factory; everything registered here takes part in the startup benchmark
+BACKENDS = {}
+
+
+def register_backend(name, factory):
+    BACKENDS[name] = factory
+
+
+for _name, _backend_id, _target_id in _opencv_candidates():
+    register_backend(_name, lambda n=_name, b=_backend_id, t=_target_id: OpenCVBackend(n, b, t))
+register_backend("onnxruntime-cpu", lambda: OnnxRuntimeBackend("onnxruntime-cpu", "YOLO_ONNX"))
+register_backend("onnxruntime-int8", lambda: OnnxRuntimeBackend("onnxruntime-int8", "YOLO_ONNX_INT8"))
+
+
+def _host_key(settings):
+    """Identifies the machine + model combination a cached choice is valid for."""
+    models = []
+    for path in (settings.YOLO_WEIGHTS, settings.YOLO_ONNX, settings.YOLO_ONNX_INT8):
+        path = Path(path)
+        if path.exists():
+            stat = path.stat()
+            models.append(f"{path.name}:{stat.st_size}:{int(stat.st_mtime)}")
+    return "|".join([
+        platform.node(), platform.machine(), platform.processor(), str(os.cpu_count()),
+        cv2.__version__, ",".join(sorted(BACKENDS)), ";".join(models)
+    ])
+
+
+def _load_cache(settings):
+    try:
+        with open(settings.BACKEND_CACHE_FILE, "r") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if cache.get("host") != _host_key(settings):
+        return None
+    return cache
+
+
+def _save_cache(settings, name, results):
+    cache = {"host": _host_key(settings), "backend": name, "results": results, "created": time.time()}
+    tmp_path = Path(settings.BACKEND_CACHE_FILE).with_suffix(".tmp")
+    try:
+        with open(tmp_path, "w") as f:
+            json.dump(cache, f, indent=2)
+        os.replace(tmp_path, settings.BACKEND_CACHE_FILE)
+    except OSError as e:
+        logger.warning(f"Could not cache inference backend choice: {e}")
+
+
+def create_backend(name, settings):
+    """Loads the named backend, or None if it doesn't work here."""
+    factory = BACKENDS.get(name)
+    if factory is None:
+        logger.error(f"Unknown inference backend: {name}")
+        return None
+    backend = factory()
+    try:
+        if backend.load(settings):
+            return backend
+    except Exception as e:
+        logger.warning(f"Inference backend {name} failed to load: {e}")
+    return None
+
+
+def _benchmark(backend, settings, num_classes, runs):
+    """Average forward time in seconds, or None if the outputs don't look like YOLO rows."""
+    size = backend.fixed_input_size or settings.YOLO_INPUT_SIZE
+    frame = SyntheticSource(width=640, height=480).read()
+    blob = cv2.dnn.blobFromImage(frame, 0.00392, (size, size), (0, 0, 0), True, crop=False)
+
+    outs = backend.forward(blob)  # Warm-up, also allocates the backend's buffers
+    for out in outs:
+        out = np.asarray(out)
+        if out.shape[-1] != 5 + num_classes or not np.isfinite(out).all():
+            logger.warning(f"Inference backend {backend.name} produced unexpected output {out.shape}")
+            return None
+
+    start = time.perf_counter()
+    for _ in range(runs):
+        backend.forward(blob)
+    return (time.perf_counter() - start) / runs
+
+
+def select_backend(settings, num_classes):
+    """
+    Returns a loaded backend. With INFERENCE_BACKEND = "auto" every registered
+    backend that loads is timed on a synthetic frame and the fastest one wins;
+    the choice is cached so later launches skip the benchmark.
+    """
+    if settings.INFERENCE_BACKEND != "auto":
+        return create_backend(settings.INFERENCE_BACKEND, settings)
+
+    cache = _load_cache(settings)
+    if cache:
+        backend = create_backend(cache["backend"], settings)
+        if backend:
+            logger.info(f"Using cached inference backend: {backend.name}")
+            return backend
+
+    results = {}
+    best, best_time = None, None
+    for name in BACKENDS:
+        backend = create_backend(name, settings)
+        if backend is None:
+            continue
+        try:
+            elapsed = _benchmark(backend, settings, num_classes, settings.BACKEND_BENCHMARK_RUNS)
+        except Exception as e:
+            logger.warning(f"Inference backend {name} failed the warm-up run: {e}")
+            continue
+        if elapsed is None:
+            continue
+
+        results[name] = round(elapsed * 1000, 2)
+        logger.info(f"Inference backend {name}: {results[name]} ms per frame")
+        if best_time is None or elapsed < best_time:
+            best, best_time = backend, elapsed
+
+    if best:
+        logger.info(f"Selected inference backend: {best.name}")
+        _save_cache(settings, best.name, results)
+    return best
+
+
+def select_backend_name(settings, num_classes):
+    """
+    Name of the backend select_backend() picks, for processes that load it
+    themselves (detector pool workers): they all get the same answer without
+    each running the benchmark.
+    """
+    if settings.INFERENCE_BACKEND != "auto":
+        return settings.INFERENCE_BACKEND
+    cache = _load_cache(settings)
+    if cache and cache["backend"] in BACKENDS:
+        return cache["backend"]
+    backend = select_backend(settings, num_classes)
+    return backend.name if backend else None
\ No newline at end of file
@@ -0,0 +1,86 @@
+import html
+from collections import deque
+from datetime import datetime
+from PyQt6.QtWidgets import QPlainTextEdit
+from PyQt6.QtCore import QTimer
+from PyQt6.QtGui import QTextCursor
+from utils.logger import get_logger
+
+logger = get_logger("console")
+
+SENDER_COLORS = {"User": "#ffffff", "Error": "#ff3333"}
+
+
+class LogConsole(QPlainTextEdit):
+    """
+    HUD chat / telemetry log.
+
+    Messages wait in a bounded ring buffer and are added to the view in one
+    edit per frame, however many arrive. The view keeps at most `max_lines`
+    lines (older ones are dropped by Qt), so memory and layout time stay flat
+    over a long shift. Every message also goes to logs/vasu.log, where older
+    entries remain searchable. Call log() from the GUI thread.
+    """
+    def __init__(self, max_lines=500, timestamps=True, color="#00ffcc", flush_ms=33):
+        super().__init__()
+        self.setReadOnly(True)
+        self.setMaximumBlockCount(max_lines)
+        self.timestamps = timestamps
+        self.color = color  # Sender colour unless SENDER_COLORS has one
+
+        # Never more pending than the view would keep anyway
+        self.pending = deque(maxlen=max_lines)
+        self.logged = 0
+        self.dropped = 0
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(flush_ms)
+        self.timer.timeout.connect(self.flush)
+
+    def log(self, sender, message):
+        """Queues one line. sender=None gives a plain '>> message' line."""
+        message = str(message)
+        logger.info(f"{sender}: {message}" if sender else message)
+        if len(self.pending) == self.pending.maxlen:
+            self.dropped += 1
+        self.pending.append((datetime.now(), sender, message))
+        self.logged += 1
+        if not self.timer.isActive():
+            self.timer.start()
+
+    def flush(self):
+        if not self.pending:
+            return
+        scrollbar = self.verticalScrollBar()
+        follow = scrollbar.value() >= scrollbar.maximum() - 4  # Don't yank the view if the user scrolled up
+
+        # One edit block: the document is laid out once for the whole batch
+        cursor = QTextCursor(self.document())
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        cursor.beginEditBlock()
+        while self.pending:
+            if not self.document().isEmpty():
+                cursor.insertBlock()
+            cursor.insertHtml(self._format(*self.pending.popleft()))
+        cursor.endEditBlock()
+
+        if follow:
+            scrollbar.setValue(scrollbar.maximum())
+
+    def _format(self, when, sender, message):
+        text = html.escape(message)
+        stamp = f'<span style="color: #555;">[{when:%H:%M:%S}]</span> ' if self.timestamps else ""
+        if sender is None:
+            return f"{stamp}&gt;&gt; {text}"
+        color = SENDER_COLORS.get(sender, self.color)
+        return f'{stamp}<b style="color: {color}">{html.escape(sender)}:</b> {text}'
+
+    def get_status(self):
+        return {
+            "lines": self.document().blockCount(),
+            "max_lines": self.maximumBlockCount(),
+            "pending": len(self.pending),
+            "logged": self.logged,
+            "dropped": self.dropped
+        }
\ No newline at end of file
@@ -0,0 +1,47 @@
+import cv2
+import numpy as np
+
+class MotionGate:
+    """
+    Decides whether a frame is worth a YOLO forward pass.
+    Compares small grayscale frames against the last frame that was
+    actually detected on; static scenes reuse the previous detections.
+    """
+    def __init__(self, threshold=0.01, pixel_delta=15, refresh_interval=5.0):
+        self.threshold = threshold                # Fraction of pixels that must change
+        self.pixel_delta = pixel_delta            # Per-pixel change that counts as motion
+        self.refresh_interval = refresh_interval  # Force a detection every K seconds
+        self.reference = None
+        self.last_run = 0.0
+
+        # Counters to verify the CPU savings
+        self.gated_frames = 0
+        self.executed_frames = 0
+
+    def should_run(self, gray, timestamp):
+        if (self.reference is None
+                or self.reference.shape != gray.shape
+                or timestamp - self.last_run >= self.refresh_interval
+                or self._changed_fraction(gray) > self.threshold):
+            self.reference = gray
+            self.last_run = timestamp
+            self.executed_frames += 1
+            return True
+
+        self.gated_frames += 1
+        return False
+
+    def reset(self):
+        self.reference = None
+
+    def _changed_fraction(self, gray):
+        diff = cv2.absdiff(gray, self.reference)
+        return np.count_nonzero(diff > self.pixel_delta) / diff.size
+
+    def get_status(self):
+        total = self.gated_frames + self.executed_frames
+        return {
+            "gated_frames": self.gated_frames,
+            "executed_frames": self.executed_frames,
+            "gated_ratio": round(self.gated_frames / total, 3) if total else 0.0
+        }
\ No newline at end of file
@@ -1,113 +1,165 @@
+import time
 import cv2
 import numpy as np
-from pathlib import Path
 from config.settings import Settings
 from utils.logger import get_logger
+from utils.metrics import get_metrics, timed
+from .resolution_controller import ResolutionController
+from .inference_backends import create_backend, select_backend
+from .detections import DetectionBatch, load_class_names
 
 logger = get_logger(__name__)
+metrics = get_metrics()
 
 class ObjectDetector:
     def __init__(self):
         self.settings = Settings()
-        self.net = None
-        self.classes = []
-        self.output_layers = []
+        self.backend = None
+        self.classes = ()
         self.is_initialized = False
 
-    def initialize(self):
+        # Network input size, adapted at runtime to stay inside the latency budget
+        self.input_size = self.settings.YOLO_INPUT_SIZE
+        self.resolution = None
+        if self.settings.ADAPTIVE_RESOLUTION:
+            self.resolution = ResolutionController(self.settings.DETECTION_LATENCY_BUDGET, self.input_size)
+
+    def initialize(self, backend_name=None):
         try:
-            # check if files exist
-            if not Path(self.settings.YOLO_WEIGHTS).exists():
-                logger.error(f"Model weights not found: {self.settings.YOLO_WEIGHTS}")
+            # Load Class Names
+            self.classes = load_class_names(str(self.settings.YOLO_CLASSES))
+
+            # Pick the fastest backend that works on this host (cached after the first run),
+            # unless the caller already chose one (detector pool workers)
+            if backend_name:
+                self.backend = create_backend(backend_name, self.settings)
+            else:
+                self.backend = select_backend(self.settings, len(self.classes))
+            if self.backend is None:
+                logger.error(f"No usable inference backend (weights: {self.settings.YOLO_WEIGHTS})")
                 logger.error("Please run setup_models.py first!")
                 return False
 
-            # Load Class Names
-            with open(self.settings.YOLO_CLASSES, "r") as f:
-                self.classes = [line.strip() for line in f.readlines()]
-
-            # Load YOLO Network
-            self.net = cv2.dnn.readNet(
-                str(self.settings.YOLO_WEIGHTS), 
-                str(self.settings.YOLO_CONFIG)
-            )
-            
-            # Use CPU (change to CUDA if you have an NVIDIA GPU setup)
-            self.net.setPreferableBackend(cv2.dnn.DNN_BACKEND_OPENCV)
-            self.net.setPreferableTarget(cv2.dnn.DNN_TARGET_CPU)
-            
-            # Get Output Layers
-            layer_names = self.net.getLayerNames()
-            self.output_layers = [layer_names[i - 1] for i in self.net.getUnconnectedOutLayers()]
+            # Static-shape models (e.g. ONNX exports) can't change resolution
+            if self.backend.fixed_input_size:
+                self.input_size = self.backend.fixed_input_size
+                self.resolution = None
             
             self.is_initialized = True
-            logger.info("Object Detector (YOLOv4-Tiny) initialized successfully")
+            logger.info(f"Object Detector (YOLOv4-Tiny) initialized successfully on {self.backend.name}")
             return True
 
         except Exception as e:
             logger.error(f"Failed to init Object Detector: {e}")
             return False
 
+    def warm_up(self):
+        """
+        One throwaway forward pass at the current input size, so the first
+        real frame doesn't pay for lazy allocations. Not recorded in the metrics.
+        """
+        if not self.is_initialized:
+            return False
+        frame = np.zeros((self.settings.FRAME_HEIGHT, self.settings.FRAME_WIDTH, 3), dtype=np.uint8)
+        size = (self.input_size, self.input_size)
+        self.backend.forward(cv2.dnn.blobFromImage(frame, 0.00392, size, (0, 0, 0), True, crop=False))
+        return True
+
     def detect_objects(self, frame):
         if not self.is_initialized or frame is None:
-            return []
+            return DetectionBatch.empty(self.classes)
+        return self.detect_batch([frame])[0]
+
+    def detect_batch(self, frames):
+        """
+        Runs several frames (e.g. from different cameras) through a single
+        forward pass. Returns one DetectionBatch per frame, same as
+        detect_objects (iterates as (label, conf, [x, y, w, h])).
+        """
+        if not self.is_initialized or not frames:
+            return [DetectionBatch.empty(self.classes) for _ in frames]
+
+        start = time.perf_counter()
+
+        # Create Blob from Images (Preprocessing)
+        blob = self._preprocess(frames)
 
-        height, width, channels = frame.shape
-        
-        # Create Blob from Image (Preprocessing)
-        # 1/255 scales pixels to 0-1 range. (416, 416) is standard YOLO input size.
-        blob = cv2.dnn.blobFromImage(frame, 0.00392, (416, 416), (0, 0, 0), True, crop=False)
-        self.net.setInput(blob)
-        
         # Run Forward Pass
-        outs = self.net.forward(self.output_layers)
-
-        class_ids = []
-        confidences = []
-        boxes = []
-
-        # Process detections
-        for out in outs:
-            for detection in out:
-                scores = detection[5:]
-                class_id = np.argmax(scores)
-                confidence = scores[class_id]
-                
-                if confidence > self.settings.CONFIDENCE_THRESHOLD:
-                    # Object detected
-                    center_x = int(detection[0] * width)
-                    center_y = int(detection[1] * height)
-                    w = int(detection[2] * width)
-                    h = int(detection[3] * height)
-
-                    # Rectangle coordinates
-                    x = int(center_x - w / 2)
-                    y = int(center_y - h / 2)
-
-                    boxes.append([x, y, w, h])
-                    confidences.append(float(confidence))
-                    class_ids.append(class_id)
+        outs = self._forward(blob)
+
+        results = []
+        for i, frame in enumerate(frames):
+            height, width = frame.shape[:2]
+            boxes, confidences, class_ids = self._postprocess(outs, i, len(frames), width, height)
+            results.append(self._nms(boxes, confidences, class_ids))
+
+        if self.resolution:
+            # Per frame, so the batch size chosen by VisionManager doesn't move the resolution
+            self.input_size = self.resolution.update((time.perf_counter() - start) / len(frames))
+        return results
+
+    def _preprocess(self, frames):
+        # 1/255 scales pixels to 0-1 range. 416 is the standard YOLO input size.
+        size = (self.input_size, self.input_size)
+        with metrics.span("detector.blob"):
+            return cv2.dnn.blobFromImages(frames, 0.00392, size, (0, 0, 0), True, crop=False)
+
+    def _forward(self, blob):
+        with metrics.span("detector.forward"):
+            return self.backend.forward(blob)
+
+    @timed("detector.postprocess")
+    def _postprocess(self, outs, index, batch_size, width, height):
+        """Vectorized decoding of the YOLO rows belonging to one image of the batch."""
+        # Single images come back as (rows, 85), batches as (batch, rows, 85)
+        detections = np.concatenate(
+            [out.reshape(batch_size, -1, out.shape[-1])[index] for out in outs]
+        )
+
+        scores = detections[:, 5:]
+        class_ids = np.argmax(scores, axis=1)
+        confidences = scores[np.arange(len(scores)), class_ids]
+
+        # Keep only confident rows
+        mask = confidences > self.settings.CONFIDENCE_THRESHOLD
+        detections = detections[mask]
+        confidences = confidences[mask]
+        class_ids = class_ids[mask]
+
+        # Convert center/size to top-left rectangles (truncating like int())
+        center_x = (detections[:, 0] * width).astype(np.int32)
+        center_y = (detections[:, 1] * height).astype(np.int32)
+        w = (detections[:, 2] * width).astype(np.int32)
+        h = (detections[:, 3] * height).astype(np.int32)
+        x = (center_x - w / 2).astype(np.int32)
+        y = (center_y - h / 2).astype(np.int32)
+
+        boxes = np.stack([x, y, w, h], axis=1)
+        return boxes, confidences.astype(np.float32), class_ids
+
+    @timed("detector.nms")
+    def _nms(self, boxes, confidences, class_ids):
+        if len(boxes) == 0:
+            return DetectionBatch.empty(self.classes)
 
         # Apply Non-Maximum Suppression (removes overlapping boxes)
         indexes = cv2.dnn.NMSBoxes(
-            boxes, confidences, 
-            self.settings.CONFIDENCE_THRESHOLD, 
+            boxes.tolist(), confidences.tolist(),
+            self.settings.CONFIDENCE_THRESHOLD,
             self.settings.NMS_THRESHOLD
         )
 
-        results = []
-        if len(indexes) > 0:
-            for i in indexes.flatten():
-                label = str(self.classes[class_ids[i]])
-                conf = confidences[i]
-                box = boxes[i]
-                results.append((label, conf, box))
-
-        return results
+        # Keep the survivors as arrays, no per-detection tuples
+        keep = np.asarray(indexes, dtype=np.int64).reshape(-1)
+        return DetectionBatch(boxes[keep], confidences[keep], class_ids[keep], self.classes)
         
     def get_detector_status(self):
         return {
             "is_initialized": self.is_initialized, 
             "model": "YOLOv4-Tiny",
-            "classes_loaded": len(self.classes)
+            "backend": self.backend.name if self.backend else None,
+            "classes_loaded": len(self.classes),
+            "input_size": self.input_size,
+            "resolution": self.resolution.get_status() if self.resolution else None,
+            "timings": metrics.snapshot("detector.")["spans"]
         }
\ No newline at end of file
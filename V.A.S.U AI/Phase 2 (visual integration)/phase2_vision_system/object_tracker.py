@@ -0,0 +1,121 @@
+import numpy as np
+
+class Track:
+    def __init__(self, track_id, label, conf, box, timestamp):
+        self.track_id = track_id
+        self.label = label
+        self.conf = conf
+        self.box = np.array(box, dtype=np.float32)   # x, y, w, h at last_update
+        self.velocity = np.zeros(4, dtype=np.float32) # change of x, y, w, h per second
+        self.last_update = timestamp
+        self.hits = 1
+        self.misses = 0
+
+    def predict(self, timestamp, max_extrapolation):
+        dt = min(max(timestamp - self.last_update, 0.0), max_extrapolation)
+        return self.box + self.velocity * dt
+
+
+class ObjectTracker:
+    """
+    Lightweight IoU tracker with constant-velocity prediction.
+    Gives every detection a stable track ID and carries boxes forward
+    between detector runs so overlays don't jump or flicker.
+    """
+    def __init__(self, iou_threshold=0.3, max_misses=3, max_extrapolation=0.5):
+        self.iou_threshold = iou_threshold
+        self.max_misses = max_misses                # Detector runs a track may be missed
+        self.max_extrapolation = max_extrapolation  # Seconds we dare to predict ahead
+        self.tracks = []
+        self.next_id = 1
+
+    def update(self, detections, timestamp):
+        """
+        Matches a fresh detector result to the existing tracks.
+        Returns True if the scene changed (new objects or missed tracks).
+        """
+        predicted = [t.predict(timestamp, self.max_extrapolation) for t in self.tracks]
+        matches, unmatched_tracks, unmatched_dets = self._match(predicted, detections)
+
+        for t_idx, d_idx in matches:
+            track = self.tracks[t_idx]
+            label, conf, box = detections[d_idx]
+            new_box = np.array(box, dtype=np.float32)
+            dt = timestamp - track.last_update
+            if dt > 0:
+                # Smooth the velocity so a single noisy box doesn't throw it off
+                velocity = (new_box - track.box) / dt
+                track.velocity = track.velocity * 0.5 + velocity * 0.5
+            track.box = new_box
+            track.conf = conf
+            track.last_update = timestamp
+            track.hits += 1
+            track.misses = 0
+
+        for t_idx in unmatched_tracks:
+            self.tracks[t_idx].misses += 1
+        self.tracks = [t for t in self.tracks if t.misses <= self.max_misses]
+
+        for d_idx in unmatched_dets:
+            label, conf, box = detections[d_idx]
+            self.tracks.append(Track(self.next_id, label, conf, box, timestamp))
+            self.next_id += 1
+
+        return len(unmatched_tracks) > 0 or len(unmatched_dets) > 0
+
+    def get_tracks(self, timestamp):
+        """Returns [(track_id, label, conf, [x, y, w, h]), ...] predicted to timestamp."""
+        results = []
+        for track in self.tracks:
+            box = track.predict(timestamp, self.max_extrapolation).astype(np.int32).tolist()
+            results.append((track.track_id, track.label, track.conf, box))
+        return results
+
+    def get_detections(self, timestamp):
+        """Same as get_tracks but in the detector's (label, conf, box) format."""
+        return [(label, conf, box) for (_, label, conf, box) in self.get_tracks(timestamp)]
+
+    def reset(self):
+        self.tracks = []
+
+    def _match(self, predicted, detections):
+        if not predicted or not detections:
+            return [], list(range(len(predicted))), list(range(len(detections)))
+
+        ious = self._iou_matrix(np.array(predicted), np.array([d[2] for d in detections], dtype=np.float32))
+
+        # Only objects of the same class can be the same object
+        track_labels = np.array([t.label for t in self.tracks])
+        det_labels = np.array([d[0] for d in detections])
+        ious[track_labels[:, None] != det_labels[None, :]] = 0
+
+        # Greedy assignment, best overlap first
+        matches = []
+        used_tracks, used_dets = set(), set()
+        for flat in np.argsort(ious, axis=None)[::-1]:
+            t_idx, d_idx = np.unravel_index(flat, ious.shape)
+            if ious[t_idx, d_idx] < self.iou_threshold:
+                break
+            if t_idx in used_tracks or d_idx in used_dets:
+                continue
+            matches.append((int(t_idx), int(d_idx)))
+            used_tracks.add(t_idx)
+            used_dets.add(d_idx)
+
+        unmatched_tracks = [i for i in range(len(predicted)) if i not in used_tracks]
+        unmatched_dets = [i for i in range(len(detections)) if i not in used_dets]
+        return matches, unmatched_tracks, unmatched_dets
+
+    @staticmethod
+    def _iou_matrix(a, b):
+        # a: (N, 4), b: (M, 4) boxes as x, y, w, h
+        ax1, ay1 = a[:, 0:1], a[:, 1:2]
+        ax2, ay2 = ax1 + a[:, 2:3], ay1 + a[:, 3:4]
+        bx1, by1 = b[:, 0], b[:, 1]
+        bx2, by2 = bx1 + b[:, 2], by1 + b[:, 3]
+
+        inter_w = np.clip(np.minimum(ax2, bx2) - np.maximum(ax1, bx1), 0, None)
+        inter_h = np.clip(np.minimum(ay2, by2) - np.maximum(ay1, by1), 0, None)
+        inter = inter_w * inter_h
+        union = a[:, 2:3] * a[:, 3:4] + b[:, 2] * b[:, 3] - inter
+        return np.where(union > 0, inter / np.maximum(union, 1e-6), 0)
\ No newline at end of file
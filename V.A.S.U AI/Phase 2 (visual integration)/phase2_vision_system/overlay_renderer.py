@@ -0,0 +1,132 @@
+from collections import OrderedDict
+import numpy as np
+from PyQt6.QtCore import Qt, QLine, QRect
+from PyQt6.QtGui import QColor, QFont, QFontMetrics, QPainter, QPen, QPixmap
+
+
+class OverlayStyle:
+    """How one HUD draws detections: frame shape, colours and label tag."""
+    def __init__(self, name, color, frame="box", filled_tag=False, uppercase=False,
+                 show_ids=False, scan_line=False, font_size=9, bold=True, bracket=20):
+        self.name = name
+        self.color = QColor(*color)
+        self.frame = frame            # "box" or "brackets" (corners only)
+        self.filled_tag = filled_tag  # Label on a solid tag instead of plain text
+        self.uppercase = uppercase
+        self.show_ids = show_ids      # Draw the track ID next to the label
+        self.scan_line = scan_line
+        self.font_size = font_size
+        self.bold = bold
+        self.bracket = bracket        # Corner length in pixels
+
+
+STYLES = {
+    "futuristic": OverlayStyle("futuristic", (0, 255, 255), frame="brackets", uppercase=True,
+                               show_ids=True, scan_line=True, bold=False),
+    "modern": OverlayStyle("modern", (204, 255, 0)),
+    "integrated": OverlayStyle("integrated", (204, 255, 0), filled_tag=True, font_size=10),
+}
+
+
+class OverlayRenderer:
+    """
+    Paints a DetectionBatch over the video (the `overlay` of a VideoLabel).
+
+    Label text is rendered once into a sprite cached by (label, confidence
+    bucket, style) and then only blitted. Track IDs change all the time, so
+    styles that show them draw the ID as plain text next to the sprite
+    instead of caching one sprite per track. Box and bracket geometry for all detections is computed with
+    numpy and drawn in a single drawRects / drawLines call, so per-detection
+    Python work is a cache lookup and one drawPixmap.
+    """
+    def __init__(self, style="futuristic", conf_step=5, max_sprites=256):
+        self.style = STYLES[style] if isinstance(style, str) else style
+        self.conf_step = conf_step      # Confidence bucket width in percent
+        self.max_sprites = max_sprites
+        weight = QFont.Weight.Bold if self.style.bold else QFont.Weight.Normal
+        self.font = QFont("Consolas", self.style.font_size, weight)
+        self.pen = QPen(self.style.color, 2)
+        metrics = QFontMetrics(self.font)
+        self.id_baseline = metrics.ascent()  # Track IDs: plain text at the sprite's top edge
+        self.sprites = OrderedDict()    # LRU: key -> QPixmap
+        self.hits = 0
+        self.misses = 0
+
+    def paint(self, painter, batch, scale, size):
+        """overlay(painter, batch, scale, size) as VideoLabel calls it, in pixmap coordinates."""
+        style = self.style
+        painter.setPen(self.pen)
+
+        if style.scan_line:
+            # Moves with the frames
+            scan_y = (batch.seq * 5) % max(1, size.height())
+            painter.drawLine(0, scan_y, size.width(), scan_y)
+        if not batch:
+            return
+
+        boxes = np.rint(batch.boxes * scale).astype(np.int32)
+        if style.frame == "brackets":
+            painter.drawLines([QLine(*line) for line in self._bracket_lines(boxes).tolist()])
+        else:
+            painter.drawRects([QRect(*box) for box in boxes.tolist()])
+
+        percents = (batch.scores * 100).astype(np.int32) // self.conf_step * self.conf_step
+        track_ids = batch.track_ids.tolist() if style.show_ids else [None] * len(boxes)
+        gap = 0 if style.filled_tag else 6  # Tags sit on the box, plain text just above it
+        if style.show_ids:
+            painter.setFont(self.font)
+        for label, percent, track_id, (x, y) in zip(batch.labels, percents.tolist(), track_ids, boxes[:, :2].tolist()):
+            sprite = self._sprite(label, percent)
+            top = y - sprite.height() - gap
+            painter.drawPixmap(x, top, sprite)
+            if track_id is not None:
+                painter.drawText(x + sprite.width() + 4, top + self.id_baseline, f"#{track_id}")
+
+    def _bracket_lines(self, boxes):
+        """(8N, 4) x1/y1/x2/y2 rows: two short lines at each corner of every box."""
+        d = self.style.bracket
+        x, y, w, h = boxes.T
+        x2, y2 = x + w, y + h
+        return np.stack([
+            x, y, x + d, y,      x, y, x, y + d,      # Top-Left
+            x2, y, x2 - d, y,    x2, y, x2, y + d,    # Top-Right
+            x, y2, x + d, y2,    x, y2, x, y2 - d,    # Bottom-Left
+            x2, y2, x2 - d, y2,  x2, y2, x2, y2 - d   # Bottom-Right
+        ], axis=1).reshape(-1, 4)
+
+    def _sprite(self, label, percent):
+        key = (label, percent, self.style.name)
+        sprite = self.sprites.get(key)
+        if sprite is not None:
+            self.sprites.move_to_end(key)
+            self.hits += 1
+            return sprite
+
+        self.misses += 1
+        sprite = self._render_sprite(self._text(label, percent))
+        self.sprites[key] = sprite
+        if len(self.sprites) > self.max_sprites:
+            self.sprites.popitem(last=False)
+        return sprite
+
+    def _text(self, label, percent):
+        if self.style.uppercase:
+            label = label.upper()
+        return f"{label} {percent}%"
+
+    def _render_sprite(self, text):
+        metrics = QFontMetrics(self.font)
+        pad = 2 if self.style.filled_tag else 0
+        height = max(20, metrics.height()) if self.style.filled_tag else metrics.height()
+        sprite = QPixmap(metrics.horizontalAdvance(text) + 2 * pad, height)
+        sprite.fill(self.style.color if self.style.filled_tag else Qt.GlobalColor.transparent)
+
+        painter = QPainter(sprite)
+        painter.setFont(self.font)
+        painter.setPen(Qt.GlobalColor.black if self.style.filled_tag else self.style.color)
+        painter.drawText(pad, (height + metrics.ascent() - metrics.descent()) // 2, text)
+        painter.end()
+        return sprite
+
+    def get_status(self):
+        return {"style": self.style.name, "sprites": len(self.sprites), "hits": self.hits, "misses": self.misses}
\ No newline at end of file
@@ -0,0 +1,61 @@
+class ResolutionController:
+    """
+    Picks the YOLO input size at runtime so detection latency stays inside
+    a budget: drops to a smaller blob under CPU pressure, climbs back up
+    when there is headroom.
+    """
+    # Multiples of 32, all valid for yolov4-tiny.cfg
+    SIZES = (256, 320, 416, 608)
+
+    def __init__(self, budget, initial=416, sizes=SIZES, patience=5):
+        self.budget = budget          # Seconds per detection
+        self.sizes = sorted(sizes)
+        self.index = self.sizes.index(initial) if initial in self.sizes else len(self.sizes) // 2
+        self.patience = patience      # Consecutive readings before we switch
+        self.latency = None           # Smoothed latency at the current size
+        self.over_budget = 0
+        self.under_budget = 0
+        self.changes = 0
+
+    @property
+    def size(self):
+        return self.sizes[self.index]
+
+    def update(self, latency):
+        """Feeds one measured detection latency (seconds); returns the size to use next."""
+        self.latency = latency if self.latency is None else self.latency * 0.7 + latency * 0.3
+
+        if self.latency > self.budget:
+            self.over_budget += 1
+            self.under_budget = 0
+        elif self.index + 1 < len(self.sizes) and self._predict(self.index + 1) < self.budget * 0.8:
+            # The next size up would still fit comfortably
+            self.under_budget += 1
+            self.over_budget = 0
+        else:
+            self.over_budget = self.under_budget = 0
+
+        if self.over_budget >= self.patience and self.index > 0:
+            self._switch(self.index - 1)
+        elif self.under_budget >= self.patience * 2:
+            # Be slower to scale up than down so we don't oscillate
+            self._switch(self.index + 1)
+        return self.size
+
+    def _predict(self, index):
+        # Forward-pass cost grows roughly with the number of input pixels
+        return self.latency * (self.sizes[index] / self.size) ** 2
+
+    def _switch(self, index):
+        self.latency = self._predict(index)
+        self.index = index
+        self.over_budget = self.under_budget = 0
+        self.changes += 1
+
+    def get_status(self):
+        return {
+            "input_size": self.size,
+            "latency_ms": round((self.latency or 0) * 1000, 1),
+            "budget_ms": round(self.budget * 1000, 1),
+            "changes": self.changes
+        }
\ No newline at end of file
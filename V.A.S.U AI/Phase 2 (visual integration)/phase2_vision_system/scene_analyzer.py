@@ -1,24 +1,105 @@
-import numpy as np
 import cv2
 
 class SceneAnalyzer:
+    """
+    Streaming scene quality for one camera. Every frame is shrunk to a small
+    grayscale image once; brightness and sharpness are EMA-smoothed across
+    frames, and a large jump between consecutive frames is reported as a
+    scene cut. The same small image is reused by the MotionGate.
+    """
+    def __init__(self, width=160, dark_threshold=40, blur_ratio=0.5, cut_threshold=40,
+                 alpha=0.3, baseline_alpha=0.02):
+        self.width = width                    # Analysis width in pixels
+        self.dark_threshold = dark_threshold  # Smoothed mean grey level below which it's too dark
+        self.blur_ratio = blur_ratio          # Blurry = less sharp than this fraction of the usual
+        self.cut_threshold = cut_threshold    # Mean grey-level change between frames that counts as a cut
+        self.alpha = alpha                    # EMA weight of the newest frame
+        self.baseline_alpha = baseline_alpha  # Slow EMA: how sharp this camera usually is
+
+        self.previous = None
+        self.brightness = None
+        self.sharpness = None
+        self.baseline_sharpness = None
+        self.state = {}
+
+        # Counters
+        self.frames = 0
+        self.dark_frames = 0
+        self.blurry_frames = 0
+        self.scene_cuts = 0
+
+    def downsample_gray(self, frame, width=None):
+        """Small grayscale copy of the frame for cheap frame-to-frame comparisons."""
+        width = width or self.width
+        h, w = frame.shape[:2]
+        height = max(1, int(h * width / w))
+        # Shrink first, then convert: far fewer pixels go through cvtColor
+        small = cv2.resize(frame, (width, height), interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+
+    def update(self, frame, timestamp=None):
+        """
+        Feeds one frame. Returns (gray, state): the small grayscale image and
+        a dict with smoothed brightness/sharpness, lighting condition, the
+        is_dark / is_blurry / scene_cut flags and whether the frame is usable
+        for detection.
+        """
+        gray = self.downsample_gray(frame)
+        brightness = float(gray.mean())
+        sharpness = float(cv2.Laplacian(gray, cv2.CV_32F).var())
+
+        # Scene cut: most of the picture changed at once (camera switched, lights, big move)
+        scene_cut = False
+        if self.previous is not None and self.previous.shape == gray.shape:
+            scene_cut = float(cv2.absdiff(gray, self.previous).mean()) > self.cut_threshold
+        self.previous = gray
+
+        if self.brightness is None or scene_cut:
+            # Start the averages over instead of dragging the old scene along
+            self.brightness = brightness
+            self.sharpness = sharpness
+            self.baseline_sharpness = sharpness
+        else:
+            self.brightness += self.alpha * (brightness - self.brightness)
+            self.sharpness += self.alpha * (sharpness - self.sharpness)
+            self.baseline_sharpness += self.baseline_alpha * (sharpness - self.baseline_sharpness)
+
+        # Darkness is a steady condition (smoothed); blur is per frame (camera motion)
+        is_dark = self.brightness < self.dark_threshold
+        is_blurry = sharpness < self.baseline_sharpness * self.blur_ratio
+
+        self.frames += 1
+        self.dark_frames += is_dark
+        self.blurry_frames += is_blurry
+        self.scene_cuts += scene_cut
+
+        condition = "Dim"
+        if is_dark: condition = "Dark"
+        elif self.brightness > 150: condition = "Bright"
+        elif self.brightness > 80: condition = "Normal"
+
+        self.state = {
+            "brightness": round(self.brightness, 1),
+            "sharpness": round(self.sharpness, 1),
+            "condition": condition,
+            "is_dark": is_dark,
+            "is_blurry": is_blurry,
+            "scene_cut": scene_cut,
+            "usable": not (is_dark or is_blurry),
+            "timestamp": timestamp
+        }
+        return gray, self.state
+
     def analyze_scene(self, frame):
         if frame is None:
             return {}
-            
-        # 1. Lighting Analysis
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        brightness = np.mean(gray)
-        lighting_condition = "Dark"
-        if brightness > 150: lighting_condition = "Bright"
-        elif brightness > 80: lighting_condition = "Normal"
-        
-        # 2. Blur detection
-        laplacian_var = cv2.Laplacian(gray, cv2.CV_64F).var()
-        is_blurry = laplacian_var < 100
-        
+        return self.update(frame)[1]
+
+    def get_status(self):
         return {
-            "brightness": brightness,
-            "condition": lighting_condition,
-            "is_blurry": is_blurry
+            "frames": self.frames,
+            "dark_frames": self.dark_frames,
+            "blurry_frames": self.blurry_frames,
+            "scene_cuts": self.scene_cuts,
+            "state": self.state
         }
\ No newline at end of file
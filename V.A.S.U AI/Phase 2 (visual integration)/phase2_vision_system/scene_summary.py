@@ -0,0 +1,132 @@
+import threading
+from collections import Counter
+
+NOTHING = "Nothing specific."
+
+
+class LabelState:
+    """Debounced count and smoothed confidence of one label on one camera."""
+    __slots__ = ("count", "confidence", "hits", "misses", "pending", "pending_hits")
+
+    def __init__(self):
+        self.count = 0          # Published count, 0 until the label has been confirmed
+        self.confidence = 0.0
+        self.hits = 0
+        self.misses = 0
+        self.pending = 0        # A different count waiting to be confirmed
+        self.pending_hits = 0
+
+
+class SceneSummary:
+    """
+    Continuously maintained summary of what the cameras see, fed by the
+    detection bus. Labels need `enter_hits` consecutive detector results to
+    appear and `exit_misses` to disappear, and a count only changes once the
+    new value has been seen `enter_hits` times in a row, so one-frame misses
+    don't flicker. The context string ("2 people, 1 cup") is rebuilt only when
+    something changes, in a fixed alphabetical order, so reading it is O(1)
+    and the same scene always gives the same prompt.
+    """
+    def __init__(self, enter_hits=2, exit_misses=3, alpha=0.3):
+        self.enter_hits = enter_hits
+        self.exit_misses = exit_misses
+        self.alpha = alpha  # EMA weight of the newest confidence
+
+        self.lock = threading.Lock()
+        self.cameras = {}   # camera_id -> {label: LabelState}
+        self.scene = {}     # Scene state of the newest batch
+        self.counts = {}
+        self.context = NOTHING
+        self.version = 0    # Bumped whenever the context string changes
+
+    def update(self, batch):
+        """Bus callback: folds one DetectionBatch into the summary."""
+        seen = Counter(batch.labels)
+        best = {}
+        for label, score in zip(batch.labels, batch.scores.tolist()):
+            best[label] = max(best.get(label, 0.0), score)
+
+        with self.lock:
+            self.scene = batch.scene
+            states = self.cameras.setdefault(batch.camera_id, {})
+            changed = False
+            if batch.scene.get("scene_cut") and states:
+                # Different view: nothing from before the cut is still in sight
+                changed = any(state.count for state in states.values())
+                states.clear()
+
+            for label in set(states) | set(seen):
+                state = states.get(label)
+                if state is None:
+                    state = states[label] = LabelState()
+                count = seen.get(label, 0)
+
+                if count == 0:
+                    state.hits = 0
+                    state.misses += 1
+                    if state.misses >= self.exit_misses or state.count == 0:
+                        changed |= state.count > 0
+                        del states[label]
+                    continue
+
+                state.misses = 0
+                state.hits += 1
+                if state.hits == 1 and state.count == 0:
+                    state.confidence = best[label]
+                else:
+                    state.confidence += self.alpha * (best[label] - state.confidence)
+
+                if state.count == 0:
+                    if state.hits >= self.enter_hits:
+                        state.count = count
+                        changed = True
+                elif count != state.count:
+                    if count == state.pending:
+                        state.pending_hits += 1
+                    else:
+                        state.pending, state.pending_hits = count, 1
+                    if state.pending_hits >= self.enter_hits:
+                        state.count = count
+                        state.pending, state.pending_hits = 0, 0
+                        changed = True
+                else:
+                    state.pending, state.pending_hits = 0, 0
+
+            if changed:
+                self._rebuild()
+
+    def _rebuild(self):
+        # Cameras are summed; labels in alphabetical order for a deterministic string
+        counts = Counter()
+        for states in self.cameras.values():
+            for label, state in states.items():
+                if state.count:
+                    counts[label] += state.count
+        self.counts = dict(sorted(counts.items()))
+        parts = [f"{count} {self._noun(label, count)}" for label, count in self.counts.items()]
+        self.context = ", ".join(parts) if parts else NOTHING
+        self.version += 1
+
+    @staticmethod
+    def _noun(label, count):
+        if count == 1:
+            return label
+        return "people" if label == "person" else f"{label}s"
+
+    def get_context(self):
+        """Ready-made visual context for the AI prompt."""
+        return self.context
+
+    def get_status(self):
+        with self.lock:
+            confidences = {}
+            for states in self.cameras.values():
+                for label, state in states.items():
+                    if state.count:
+                        confidences[label] = max(confidences.get(label, 0.0), round(state.confidence, 3))
+            return {
+                "context": self.context,
+                "version": self.version,
+                "counts": self.counts,
+                "confidence": dict(sorted(confidences.items()))
+            }
\ No newline at end of file
@@ -4,57 +4,476 @@ import cv2
 from .camera_manager import CameraManager
 from .object_detector import ObjectDetector
 from .scene_analyzer import SceneAnalyzer
+from .object_tracker import ObjectTracker
+from .motion_gate import MotionGate
+from .detector_pool import DetectorPool
+from .frame_pool import FramePool
+from .detections import DetectionBatch, DetectionBus, load_class_names
+from .detection_history import DetectionHistory
+from .scene_summary import SceneSummary
+from utils.logger import get_logger
+from utils.metrics import get_metrics
+
+logger = get_logger(__name__)
+
+
+class CameraStream:
+    """Everything VisionManager keeps per camera: frames, tracks and stats."""
+    def __init__(self, camera_id, settings):
+        self.camera_id = camera_id
+        self.thread = None
+
+        # Latest captured frame (capture thread -> display / detector)
+        # Frames live in reused, reference-counted buffers; nobody copies unless asked
+        self.frame_pool = FramePool((settings.FRAME_HEIGHT, settings.FRAME_WIDTH, 3))
+        self.current_buffer = None
+        self.frame_seq = 0
+        self.frame_time = 0.0
+
+        # Per-frame scene quality, computed once on the capture thread
+        self.scene = SceneAnalyzer(
+            width=settings.SCENE_ANALYSIS_WIDTH,
+            dark_threshold=settings.DARK_THRESHOLD,
+            blur_ratio=settings.BLUR_RATIO,
+            cut_threshold=settings.SCENE_CUT_THRESHOLD
+        )
+        self.frame_gray = None
+        self.frame_scene = {}
+        self.latest_scene = {}  # Scene state of the last frame the detector looked at
+
+        # Latest detections (detector thread -> display / commands)
+        # Between detector runs these are the tracker's predicted boxes
+        self.tracker = ObjectTracker()
+        self.motion_gate = MotionGate(
+            threshold=settings.MOTION_THRESHOLD,
+            pixel_delta=settings.MOTION_PIXEL_DELTA,
+            refresh_interval=settings.MOTION_REFRESH_SECONDS
+        )
+        self.latest_batch = DetectionBatch.empty()  # Immutable, replaced (never mutated) on update
+        self.detection_seq = 0
+        self.scheduled_seq = 0
+        self.detection_interval = max(1, settings.DETECTION_INTERVAL)
+
+        # Statistics
+        self.capture_fps = 0.0
+        self.detection_fps = 0.0
+        self.detection_latency = 0.0
+        self.dropped_frames = 0
+        self.quality_skips = 0
+        self.last_detection_time = None
+
+    def is_due(self):
+        return self.current_buffer is not None and self.frame_seq >= self.scheduled_seq + self.detection_interval
+
+    def get_status(self):
+        return {
+            "capture_fps": round(self.capture_fps, 1),
+            "detection_fps": round(self.detection_fps, 1),
+            "detection_latency_ms": round(self.detection_latency * 1000, 1),
+            "dropped_frames": self.dropped_frames,
+            "detection_interval": self.detection_interval,
+            "tracked_objects": len(self.latest_batch),
+            "quality_skips": self.quality_skips,
+            "scene": self.scene.get_status(),
+            "motion_gate": self.motion_gate.get_status(),
+            "frame_pool": self.frame_pool.get_status()
+        }
+
 
 class VisionManager:
     def __init__(self, settings):
         self.settings = settings
-        self.camera = CameraManager()
+        self.camera = CameraManager(settings)
         self.detector = ObjectDetector()
-        self.analyzer = SceneAnalyzer()
+        self.detector_pool = None  # Optional multi-process backend (DETECTOR_WORKERS > 0)
         self.is_active = False
-        self.current_frame = None
-        self.latest_detections = []
         self.lock = threading.Lock()
-        self.thread = None
+        self.frame_ready = threading.Condition(self.lock)
         self.stop_event = threading.Event()
+        self.detection_thread = None
+        self.result_thread = None
 
-    def start_vision_system(self):
+        # One stream per opened camera; the first one is the default for the GUIs
+        self.streams = {}
+        self.primary_id = None
+
+        # New detector results are pushed to subscribers (GUI, commands, history...)
+        self.bus = DetectionBus()
+        # Told about every new frame, so displays only redraw when there is one
+        self.frame_listeners = []
+        self.class_names = ()
+        # Debounced "what's in view" for the AI prompt, kept up to date as results arrive
+        self.summary = SceneSummary(settings.SUMMARY_ENTER_HITS, settings.SUMMARY_EXIT_MISSES)
+        self.bus.subscribe("summary", callback=self.summary.update)
+        self.history = None
+        if settings.DETECTION_HISTORY:
+            self.history = DetectionHistory(
+                settings,
+                capacity=settings.HISTORY_CAPACITY,
+                resolution=settings.HISTORY_RESOLUTION,
+                spill_interval=settings.HISTORY_SPILL_SECONDS,
+                spill_resolution=settings.HISTORY_SPILL_RESOLUTION
+            )
+
+        # Scheduling: how many cameras may share one forward pass right now
+        self.max_batch = 1
+        self.batch_latency = 0.0
+
+    def initialize_camera(self):
+        """Opens the cameras. Can run in parallel with initialize_detector()."""
         if not self.camera.initialize():
             return False
-        self.detector.initialize()
+        self.streams = {cid: CameraStream(cid, self.settings) for cid in self.camera.camera_ids()}
+        self.primary_id = self.camera.camera_ids()[0]
+        self.max_batch = len(self.streams)
+        return True
+
+    def initialize_detector(self):
+        """Loads the detector (or worker pool) and runs a warm-up pass."""
+        if self.detector_pool or self.detector.is_initialized:
+            return True
+        workers = self.settings.DETECTOR_WORKERS
+        if workers > 0:
+            pool = DetectorPool(self.settings, workers, self.settings.DETECTOR_SLOTS)
+            if pool.initialize():
+                self.detector_pool = pool
+                self.class_names = load_class_names(str(self.settings.YOLO_CLASSES))
+                return True
+            # Fall back to the in-process detector
+        if not (self.detector.initialize() and self.detector.warm_up()):
+            return False
+        self.class_names = self.detector.classes
+        return True
+
+    def start_vision_system(self):
+        # Either step may already have been done by the startup orchestrator
+        if not self.camera.is_initialized and not self.initialize_camera():
+            return False
+        self.initialize_detector()
+
         self.is_active = True
         self.stop_event.clear()
-        self.thread = threading.Thread(target=self._process_loop, daemon=True)
-        self.thread.start()
+        for stream in self.streams.values():
+            stream.thread = threading.Thread(target=self._capture_loop, args=(stream,), daemon=True)
+            stream.thread.start()
+        self.detection_thread = threading.Thread(target=self._detection_loop, daemon=True)
+        self.detection_thread.start()
+        if self.history:
+            self.history.start(self.bus)
+        if self.detector_pool:
+            self.result_thread = threading.Thread(target=self._pool_result_loop, daemon=True)
+            self.result_thread.start()
         return True
 
     def stop_vision_system(self):
         self.stop_event.set()
         self.is_active = False
-        if self.thread:
-            self.thread.join()
+        with self.frame_ready:
+            self.frame_ready.notify_all()
+        threads = [s.thread for s in self.streams.values()] + [self.detection_thread, self.result_thread]
+        for thread in threads:
+            if thread:
+                thread.join()
+        if self.detector_pool:
+            self.detector_pool.stop()
+            self.detector_pool = None
+        if self.history:
+            self.history.stop()
+        with self.lock:
+            for stream in self.streams.values():
+                if stream.current_buffer:
+                    stream.current_buffer.release()
+                    stream.current_buffer = None
         self.camera.release()
 
-    def _process_loop(self):
+    def _capture_loop(self, stream):
+        """Reads frames as fast as the camera delivers them, keeping only the newest."""
+        last_time = None
+        while not self.stop_event.is_set():
+            buffer = stream.frame_pool.get_buffer()
+            frame = self.camera.get_frame(buffer.array, stream.camera_id)
+            if frame is None:
+                buffer.release()
+                # Camera hiccup, don't spin
+                self.stop_event.wait(0.01)
+                continue
+            if frame is not buffer.array:
+                # The camera delivers a different size than the pool was built for
+                stream.frame_pool.set_shape(frame.shape)
+                buffer.adopt(frame)
+
+            now = time.monotonic()
+            gray, scene = stream.scene.update(frame, now)
+            cut_batch = None
+            with self.frame_ready:
+                previous = stream.current_buffer
+                stream.frame_seq += 1
+                buffer.version = stream.frame_seq
+                buffer.timestamp = now
+                # Our reference is handed over to current_buffer
+                stream.current_buffer = buffer
+                stream.frame_time = now
+                stream.frame_gray = gray
+                stream.frame_scene = scene
+                if scene["scene_cut"]:
+                    cut_batch = self._on_scene_cut(stream, now, scene)
+                # Carry the tracked boxes forward to this frame
+                stream.latest_batch = DetectionBatch.from_tracks(
+                    stream.tracker.get_tracks(now), self.class_names,
+                    camera_id=stream.camera_id, seq=stream.frame_seq, timestamp=now, scene=stream.latest_scene
+                )
+                self.frame_ready.notify_all()
+            if previous:
+                previous.release()
+            if cut_batch is not None:
+                # Subscribers (summary, history...) drop the old scene now, not at the next detection
+                self.bus.publish(cut_batch)
+            for callback in self.frame_listeners:
+                callback(stream.camera_id, stream.frame_seq)
+
+            if last_time is not None:
+                stream.capture_fps = self._smooth_rate(stream.capture_fps, now - last_time)
+            last_time = now
+
+    def _detection_loop(self):
+        """
+        Schedules detection across cameras. Every camera whose newest frame is
+        due (detection_interval frames since its last run) is a candidate;
+        up to max_batch of them share one forward pass, the most overdue first.
+        """
         while not self.stop_event.is_set():
-            frame = self.camera.get_frame()
-            if frame is not None:
-                # Run detection
-                detections = self.detector.detect_objects(frame)
-                with self.lock:
-                    self.current_frame = frame
-                    self.latest_detections = detections
-            time.sleep(0.03) # ~30 FPS
-
-    def get_frame(self):
+            with self.frame_ready:
+                self.frame_ready.wait_for(
+                    lambda: any(s.is_due() for s in self.streams.values())
+                    or self.stop_event.is_set()
+                )
+                if self.stop_event.is_set():
+                    break
+
+                # Deadline order: the camera that waited longest goes first
+                due = sorted(
+                    (s for s in self.streams.values() if s.is_due()),
+                    key=lambda s: s.last_detection_time or 0.0
+                )[:self.max_batch]
+
+                jobs = []
+                for stream in due:
+                    # Frames that arrived while we were busy are skipped, not queued
+                    if stream.scheduled_seq:
+                        skipped = stream.frame_seq - stream.scheduled_seq - stream.detection_interval
+                        stream.dropped_frames += max(0, skipped)
+                    stream.scheduled_seq = stream.frame_seq
+                    jobs.append((
+                        stream, stream.current_buffer.acquire(), stream.frame_seq, stream.frame_time,
+                        stream.frame_gray, stream.frame_scene
+                    ))
+
+            try:
+                self._detect(jobs)
+            except Exception as e:
+                # Never let one bad pass end the thread (the HUD would freeze on old boxes)
+                cameras = [job[0].camera_id for job in jobs]
+                logger.error(f"Detection failed for cameras {cameras}: {e}")
+                get_metrics().increment("detector.errors")
+                if len(jobs) > 1 and not self.detector_pool:
+                    self._detect_singly(jobs)
+            finally:
+                for job in jobs:
+                    job[1].release()
+
+    def _on_scene_cut(self, stream, now, scene):
+        """
+        Old boxes and the motion reference belong to the previous scene. Caller
+        holds the lock; returns the empty batch to publish once it's released.
+        """
+        stream.tracker.reset()
+        stream.latest_batch = DetectionBatch.empty(
+            self.class_names, camera_id=stream.camera_id, seq=stream.frame_seq, timestamp=now, scene=scene
+        )
+        stream.motion_gate.reset()
+        stream.detection_interval = max(1, self.settings.DETECTION_INTERVAL)
+        # Due right away
+        stream.scheduled_seq = max(0, stream.frame_seq - stream.detection_interval)
+        return stream.latest_batch
+
+    def _quality_ok(self, stream, seq, captured_at, scene):
+        """
+        Too dark or motion-blurred frames aren't worth a forward pass: defer to
+        the next frame instead. A detection is still forced every MOTION_REFRESH_SECONDS.
+        """
+        if scene.get("usable", True):
+            return True
+        last = stream.last_detection_time
+        if last is None or captured_at - last >= self.settings.MOTION_REFRESH_SECONDS:
+            return True
+        stream.quality_skips += 1
+        with self.lock:
+            stream.scheduled_seq = seq - stream.detection_interval + 1
+        return False
+
+    def _detect(self, jobs):
+        # Publish the scene state of every frame we looked at, even if YOLO is skipped
+        with self.lock:
+            for job in jobs:
+                job[0].latest_scene = job[5]
+
+        if self.settings.QUALITY_GATING:
+            jobs = [job for job in jobs if self._quality_ok(job[0], job[2], job[3], job[5])]
+
+        # Static scenes: keep the previous detections, skip the forward pass
+        if self.settings.MOTION_GATING:
+            jobs = [job for job in jobs if job[0].motion_gate.should_run(job[4], job[3])]
+        if not jobs:
+            return
+
+        if self.detector_pool:
+            # Workers run in parallel; results come back in order on the result thread.
+            # The batch shares one short wait for free ring slots
+            deadline = time.monotonic() + self.settings.DETECTION_LATENCY_BUDGET
+            for stream, buffer, seq, captured_at, _, scene in jobs:
+                timeout = max(0.0, deadline - time.monotonic())
+                if not self.detector_pool.submit(buffer.view, (stream.camera_id, seq, captured_at, scene), timeout):
+                    # Every slot is busy: skip this frame, the next one is scheduled as usual
+                    stream.dropped_frames += 1
+                    get_metrics().increment("detector.pool_full")
+            return
+
+        start = time.monotonic()
+        if len(jobs) == 1:
+            results = [self.detector.detect_objects(jobs[0][1].view)]
+        else:
+            results = self.detector.detect_batch([job[1].view for job in jobs])
+        self._adapt_batch(time.monotonic() - start)
+
+        for (stream, _, seq, captured_at, _, scene), detections in zip(jobs, results):
+            self._publish_detections(stream, detections, seq, captured_at, scene)
+
+    def _detect_singly(self, jobs):
+        """After a failed batch: one forward pass per frame, skipping frames that still fail."""
+        for stream, buffer, seq, captured_at, _, scene in jobs:
+            try:
+                detections = self.detector.detect_objects(buffer.view)
+            except Exception as e:
+                logger.error(f"Detection failed for camera {stream.camera_id}: {e}")
+                continue
+            self._publish_detections(stream, detections, seq, captured_at, scene)
+
+    def _adapt_batch(self, elapsed):
+        """
+        Shrink the batch when a forward pass blows the budget, grow it back with
+        headroom. The detector's ResolutionController steers the same budget but
+        per frame (pass time / batch size): it sets what one frame costs, this
+        decides how many frames share a pass, so the two don't trade off.
+        """
+        self.batch_latency = elapsed
+        budget = self.settings.DETECTION_LATENCY_BUDGET
+        if elapsed > budget and self.max_batch > 1:
+            self.max_batch -= 1
+        elif elapsed < budget * 0.5 and self.max_batch < len(self.streams):
+            self.max_batch += 1
+
+    def _pool_result_loop(self):
+        while not self.stop_event.is_set():
+            result = self.detector_pool.get_result(timeout=0.1)
+            if result:
+                (camera_id, seq, captured_at, scene), detections = result
+                self._publish_detections(self.streams[camera_id], detections, seq, captured_at, scene)
+
+    def _publish_detections(self, stream, detections, seq, captured_at, scene):
+        now = time.monotonic()
         with self.lock:
-            if self.current_frame is not None:
-                return self.current_frame.copy()
+            scene_changed = stream.tracker.update(detections, captured_at)
+            batch = DetectionBatch.from_tracks(
+                stream.tracker.get_tracks(captured_at), self.class_names,
+                camera_id=stream.camera_id, seq=seq, timestamp=captured_at, scene=scene
+            )
+            stream.latest_batch = batch
+            stream.detection_seq = seq
+        # Subscribers are called outside the lock
+        self.bus.publish(batch)
+        stream.detection_latency = now - captured_at
+        self._adapt_interval(stream, scene_changed)
+
+        if stream.last_detection_time is not None:
+            stream.detection_fps = self._smooth_rate(stream.detection_fps, now - stream.last_detection_time)
+        stream.last_detection_time = now
+
+    def _adapt_interval(self, stream, scene_changed):
+        """Back off while the scene is stable, snap back as soon as it changes."""
+        if not self.settings.ADAPTIVE_DETECTION:
+            return
+        base = max(1, self.settings.DETECTION_INTERVAL)
+        if scene_changed:
+            stream.detection_interval = base
+        else:
+            stream.detection_interval = min(stream.detection_interval + 1, self.settings.MAX_DETECTION_INTERVAL)
+
+    @staticmethod
+    def _smooth_rate(current, interval):
+        # Exponential moving average over the intervals (not the rates, which jitter high)
+        if interval <= 0:
+            return current
+        if current == 0:
+            return 1.0 / interval
+        return 1.0 / (0.9 / current + 0.1 * interval)
+
+    def _stream(self, camera_id):
+        return self.streams.get(self.primary_id if camera_id is None else camera_id)
+
+    def camera_ids(self):
+        return list(self.streams)
+
+    def add_frame_listener(self, callback):
+        """callback(camera_id, version) runs on the capture thread for every new frame; keep it short."""
+        self.frame_listeners = self.frame_listeners + [callback]
+
+    def get_frame_buffer(self, camera_id=None):
+        """
+        Zero-copy access to the newest frame. Returns a FrameBuffer (read-only
+        `.view`, `.version`) that must be released, e.g. `with vm.get_frame_buffer() as buf:`
+        """
+        with self.lock:
+            stream = self._stream(camera_id)
+            if stream and stream.current_buffer is not None:
+                return stream.current_buffer.acquire()
         return None
+
+    def get_frame(self, camera_id=None):
+        """Returns a private, writable copy of the newest frame."""
+        buffer = self.get_frame_buffer(camera_id)
+        if buffer is None:
+            return None
+        with buffer:
+            return buffer.copy()
     
-    def get_detections(self):
+    def get_detections(self, camera_id=None):
+        """
+        Newest DetectionBatch (iterates as (label, conf, [x, y, w, h])). Immutable,
+        so it's safe to keep; prefer bus.subscribe() to being told about updates.
+        """
         with self.lock:
-            return self.latest_detections
+            stream = self._stream(camera_id)
+            return stream.latest_batch if stream else DetectionBatch.empty(self.class_names)
+
+    def get_scene(self, camera_id=None):
+        """Brightness / sharpness / condition of the last frame the detector looked at."""
+        with self.lock:
+            stream = self._stream(camera_id)
+            return stream.latest_scene if stream else {}
+
+    def get_tracks(self, camera_id=None):
+        """Returns [(track_id, label, conf, [x, y, w, h]), ...] for the newest frame."""
+        return self.get_detections(camera_id).tracks()
 
     def get_status(self):
-        return {"active": self.is_active}
\ No newline at end of file
+        return {
+            "active": self.is_active,
+            "detector_workers": self.detector_pool.num_workers if self.detector_pool else 0,
+            "max_batch": self.max_batch,
+            "batch_latency_ms": round(self.batch_latency * 1000, 1),
+            "cameras": {cid: stream.get_status() for cid, stream in self.streams.items()},
+            "subscribers": self.bus.get_status(),
+            "summary": self.summary.get_status(),
+            "history": self.history.get_status() if self.history else None,
+            "timings": get_metrics().snapshot("camera.", "detector.", "gui.")
+        }
\ No newline at end of file
@@ -6,11 +6,15 @@ from pathlib import Path
 # Add project root to path
 sys.path.append(str(Path(__file__).parent))
 
+# Imported first so startup timings are measured from launch
+from utils.startup import get_startup
+
 def main():
     try:
         print("🚀 Launching V.A.S.U - MK.III FUTURISTIC INTERFACE")
         # Import the FUTURISTIC GUI
-        from phase2_vision_system.gui_futuristic import main as gui_main
+        with get_startup().phase("import gui"):
+            from phase2_vision_system.gui_futuristic import main as gui_main
         gui_main()
     except Exception as e:
         print(f"❌ Error launching GUI: {e}")
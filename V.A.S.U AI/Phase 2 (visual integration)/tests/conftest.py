@@ -0,0 +1,32 @@
+import sys
+import types
+from pathlib import Path
+
+# Modules import each other from the project root (like the run_*.py scripts)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# No test talks to Gemini: a stand-in client is enough where the SDK isn't installed
+try:
+    import google.generativeai  # noqa: F401
+except ImportError:
+    genai = types.ModuleType("google.generativeai")
+    genai.configure = lambda **kwargs: None
+    genai.GenerativeModel = lambda name: None
+    google = sys.modules.setdefault("google", types.ModuleType("google"))
+    google.generativeai = genai
+    sys.modules["google.generativeai"] = genai
+
+# Same for the microphone: AudioStream only needs sr.AudioData to hand out utterances
+try:
+    import speech_recognition  # noqa: F401
+except ImportError:
+    sr = types.ModuleType("speech_recognition")
+
+    class AudioData:
+        def __init__(self, frame_data, sample_rate, sample_width):
+            self.frame_data = frame_data
+            self.sample_rate = sample_rate
+            self.sample_width = sample_width
+
+    sr.AudioData = AudioData
+    sys.modules["speech_recognition"] = sr
\ No newline at end of file
@@ -0,0 +1,34 @@
+from phase1_voice_interface.ai_interface import SentenceSplitter
+
+
+def split(chunks, max_chars=200):
+    splitter = SentenceSplitter(max_chars)
+    sentences = []
+    for chunk in chunks:
+        sentences += splitter.feed(chunk)
+    return sentences + splitter.flush()
+
+
+def test_sentences_end_after_numbers_and_no():
+    assert split(["Dr. Smith said no. The answer is 5. Then more!"]) == [
+        "Dr. Smith said no.", "The answer is 5.", "Then more!"
+    ]
+
+
+def test_sentence_is_released_as_soon_as_it_ends():
+    splitter = SentenceSplitter()
+    assert splitter.feed("Hello Boss. The temp") == ["Hello Boss."]
+    assert splitter.feed("erature is 3.5 degrees") == []
+    assert splitter.flush() == ["The temperature is 3.5 degrees"]
+
+
+def test_abbreviations_and_initials_across_chunks():
+    assert split(["It is cold, e.", "g. below zero. J. R. R. Tol", "kien wrote it.\nBye"]) == [
+        "It is cold, e.g. below zero.", "J. R. R. Tolkien wrote it.", "Bye"
+    ]
+
+
+def test_long_sentence_is_cut_at_a_comma():
+    assert split(["one two three, four five six seven eight, nine ten eleven twelve"], max_chars=40) == [
+        "one two three,", "four five six seven eight,", "nine ten eleven twelve"
+    ]
\ No newline at end of file
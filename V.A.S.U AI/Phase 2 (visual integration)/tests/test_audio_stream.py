@@ -0,0 +1,149 @@
+import threading
+import numpy as np
+import pytest
+from phase1_voice_interface.audio_stream import AudioStream
+
+RATE = 16000
+CHUNK = 1024
+
+
+class FakeMicrophone:
+    """Plays scripted chunks through AudioStream's capture loop, then silence."""
+    SAMPLE_RATE = RATE
+    SAMPLE_WIDTH = 2
+    CHUNK = CHUNK
+
+    def __init__(self, chunks=()):
+        self.chunks = list(chunks)
+        self.done = threading.Event()
+        self.stream = self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def read(self, size):
+        if not self.chunks:
+            self.done.set()
+            return silence(size / RATE)[0]
+        return self.chunks.pop(0)
+
+
+def chunks(samples):
+    samples = samples.astype(np.int16)
+    return [samples[i:i + CHUNK].tobytes() for i in range(0, len(samples), CHUNK)]
+
+
+def silence(seconds):
+    return chunks(np.zeros(int(seconds * RATE)))
+
+
+def speech(seconds, amplitude=3000):
+    t = np.arange(int(seconds * RATE)) / RATE
+    return chunks(amplitude * np.sin(2 * np.pi * 220 * t))
+
+
+def talk(seconds):
+    """Words with short gaps, like real speech (a steady tone ends up counted as background)."""
+    words = []
+    for _ in range(round(seconds / 0.3)):
+        words += speech(0.25) + silence(0.05)
+    return words
+
+
+def noise(seconds, sigma):
+    return chunks(np.random.default_rng(0).normal(0, sigma, int(seconds * RATE)))
+
+
+def feed(stream, *parts):
+    for part in parts:
+        for chunk in part:
+            stream.process(chunk)
+
+
+def cut(stream):
+    """Lengths in seconds of the utterances queued so far."""
+    lengths = []
+    while True:
+        audio = stream.get(timeout=0)
+        if audio is None:
+            return lengths
+        lengths.append(len(audio.frame_data) / 2 / RATE)
+
+
+@pytest.fixture
+def started():
+    return []
+
+
+@pytest.fixture
+def stream(started):
+    return AudioStream(FakeMicrophone(), energy_threshold=300, pause_seconds=0.8, preroll_seconds=0.3,
+                       min_speech_seconds=0.15, max_utterance_seconds=3.0, buffer_seconds=10.0,
+                       on_speech_start=lambda: started.append(True))
+
+
+def test_one_utterance_with_preroll_and_tail(stream, started):
+    feed(stream, silence(1.0), speech(1.0), silence(1.5))
+    [length] = cut(stream)
+    # 1 s of speech plus up to 0.3 s before and after it (chunk-aligned)
+    assert 1.2 < length < 1.7
+    assert started == [True]
+
+
+def test_preroll_keeps_the_audio_before_speech(stream):
+    feed(stream, silence(1.0), speech(0.5), silence(1.5))
+    audio = stream.get(timeout=0)
+    samples = np.frombuffer(audio.frame_data, dtype=np.int16)
+    leading = np.argmax(np.abs(samples) > 0)
+    assert 0.2 * RATE < leading <= 0.3 * RATE + CHUNK
+
+
+def test_short_blips_and_silence_are_ignored(stream, started):
+    feed(stream, silence(1.0), speech(0.05), silence(1.5))
+    assert cut(stream) == []
+    assert started == []
+
+
+def test_over_long_speech_is_sent_in_pieces(stream, started):
+    feed(stream, silence(0.5), talk(7.0), silence(1.5))
+    lengths = cut(stream)
+    assert len(lengths) == 3
+    assert all(2.9 < length < 3.4 for length in lengths[:2])
+    assert sum(lengths) == pytest.approx(7.0, abs=0.7)
+    assert started == [True]  # One utterance for the speaker, however it's cut
+
+
+def test_barge_in_needs_louder_speech_while_vasu_talks(stream):
+    stream.output_active = True
+    feed(stream, silence(0.5), speech(1.0, amplitude=800), silence(1.5))
+    assert cut(stream) == []
+    feed(stream, speech(1.0, amplitude=6000), silence(1.5))
+    assert len(cut(stream)) == 1
+
+    stream.output_active = False
+    feed(stream, speech(1.0, amplitude=800), silence(1.5))
+    assert len(cut(stream)) == 1
+
+
+def test_rising_background_noise_ends_the_utterance():
+    stream = AudioStream(FakeMicrophone(), energy_threshold=300, max_utterance_seconds=10.0)
+    feed(stream, silence(0.5), talk(1.5), noise(6.0, sigma=800))
+    # With the floor fixed at its pre-speech level the noise would keep the utterance open
+    [length] = cut(stream)
+    assert length < 5.5
+
+
+def test_capture_thread_queues_utterances(started):
+    microphone = FakeMicrophone(silence(0.5) + speech(1.0) + silence(1.0))
+    stream = AudioStream(microphone, energy_threshold=300, on_speech_start=lambda: started.append(True))
+    stream.start()
+    try:
+        audio = stream.get(timeout=5)
+        assert microphone.done.wait(5)
+    finally:
+        stream.stop()
+    assert audio is not None and stream.error is None
+    assert started == [True]
\ No newline at end of file
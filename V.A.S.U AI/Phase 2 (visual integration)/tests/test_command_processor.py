@@ -0,0 +1,59 @@
+import time
+from types import SimpleNamespace
+import pytest
+from phase1_voice_interface.command_processor import CommandProcessor, WELCOME_REPLY
+
+NO_AI = "I am unable to access the cloud brain. Please check your API key."
+
+
+class FakeHistory:
+    """Answers like DetectionHistory: two people seen, a cup for 90 seconds."""
+    class_ids = {"person": 0, "cup": 41, "apple": 47, "pizza": 53}
+
+    def count(self, label, start=None):
+        return 2 if label == "person" else 0
+
+    def presence_intervals(self, label, start=None):
+        now = time.time()
+        return [(now - 100, now - 10)] if label == "cup" else []
+
+    def last_seen_at(self, label):
+        return {"time": time.time() - 5} if label == "person" else None
+
+
+@pytest.fixture
+def processor():
+    settings = SimpleNamespace(GEMINI_API_KEY="", GEMINI_MODEL="test", SYSTEM_PROMPT="",
+                               AI_CACHE=False, AI_SENTENCE_MAX_CHARS=200)
+    vision = SimpleNamespace(summary=None, history=FakeHistory())
+    return CommandProcessor(settings, vision)
+
+
+@pytest.mark.parametrize("question, answer", [
+    ("how many people did you see in the last 10 minutes", "I have seen 2 people in the last 10 minutes."),
+    ("how many people came in this hour", "I have seen 2 people in the last hour."),
+    ("how long was the cup in view", "A cup was in view for about 2 minutes so far."),
+    ("when did you last see a person", "I last saw a person just now."),
+    ("how many pizzas have you seen", "I have seen 0 pizzas so far."),
+])
+def test_vision_questions_use_history(processor, question, answer):
+    assert processor.process_command(question) == answer
+
+
+@pytest.mark.parametrize("question", [
+    "how many people live in new york",
+    "how long does it take to bake a pizza",
+    "how many calories in an apple",
+])
+def test_general_questions_go_to_the_ai(processor, question):
+    assert processor.process_command(question) == NO_AI
+
+
+def test_stream_mode_wraps_local_answers(processor):
+    assert list(processor.process_command("who are you", stream=True)) == [
+        "I am VASU, your virtual autonomous system utility."
+    ]
+
+
+def test_welcome_is_prerendered(processor):
+    assert WELCOME_REPLY in processor.common_phrases()
\ No newline at end of file
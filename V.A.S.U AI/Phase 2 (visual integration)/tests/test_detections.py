@@ -0,0 +1,40 @@
+from phase2_vision_system.detections import DetectionBatch, DetectionBus
+
+CLASSES = ("person", "bicycle", "cup")
+
+
+def test_unknown_class_ids_are_not_the_last_class():
+    batch = DetectionBatch([[0, 0, 5, 5]] * 3, [0.9, 0.8, 0.7], [2, -1, 7], CLASSES)
+    assert batch.labels == ["cup", "unknown", "unknown"]
+    assert batch.label(1) == "unknown"
+    assert [label for label, _, _ in batch] == ["cup", "unknown", "unknown"]
+
+
+def test_tracks_with_labels_outside_the_class_list():
+    tracks = [(4, "person", 0.75, [1, 2, 3, 4]), (5, "dragon", 0.5, [5, 6, 7, 8])]
+    batch = DetectionBatch.from_tracks(tracks, CLASSES)
+    assert batch.tracks() == [(4, "person", 0.75, [1, 2, 3, 4]), (5, "unknown", 0.5, [5, 6, 7, 8])]
+
+
+def test_batch_iterates_like_the_old_lists():
+    batch = DetectionBatch([[1, 2, 3, 4], [5, 6, 7, 8]], [0.75, 0.5], [0, 2], CLASSES)
+    assert len(batch) == 2 and batch
+    assert batch.labels == ["person", "cup"]
+    assert list(batch) == [("person", 0.75, [1, 2, 3, 4]), ("cup", 0.5, [5, 6, 7, 8])]
+    assert not DetectionBatch.empty(CLASSES)
+
+
+def test_tracks_round_trip_and_reach_every_subscriber():
+    tracks = [(4, "person", 0.75, [1, 2, 3, 4]), (5, "cup", 0.5, [5, 6, 7, 8])]
+    batch = DetectionBatch.from_tracks(tracks, CLASSES, camera_id=0, seq=3)
+    assert batch.tracks() == tracks
+
+    bus = DetectionBus()
+    seen = []
+    queued = bus.subscribe("queued", maxsize=1)
+    bus.subscribe("callback", callback=seen.append)
+    bus.publish(DetectionBatch.empty(CLASSES))
+    bus.publish(batch)
+    assert seen[-1] is batch and len(seen) == 2
+    assert queued.get(timeout=0) is batch
+    assert queued.get_status()["dropped"] == 1
\ No newline at end of file
@@ -0,0 +1,104 @@
+import queue
+import threading
+import time
+from types import SimpleNamespace
+import numpy as np
+import pytest
+from config.settings import Settings
+from phase2_vision_system.detector_pool import DetectorPool
+from phase2_vision_system.vision_manager import VisionManager
+
+
+@pytest.fixture
+def pool():
+    """A pool without worker processes: the test plays the workers through the queues."""
+    settings = SimpleNamespace(FRAME_WIDTH=8, FRAME_HEIGHT=6)
+    pool = DetectorPool(settings, num_workers=1, num_slots=2)
+    pool._allocate_ring(pool.slot_bytes)
+    pool.tasks = queue.Queue()
+    pool.results = queue.Queue()
+    pool.result_timeout = 0.3
+    pool.is_initialized = True
+    pool.collector = threading.Thread(target=pool._collect_loop, daemon=True)
+    pool.collector.start()
+    yield pool
+    pool.stop()
+
+
+def frame(value):
+    return np.full((6, 8, 3), value, dtype=np.uint8)
+
+
+def take_task(pool):
+    seq, _, _, _, slot, shape = pool.tasks.get(timeout=1)
+    return seq, slot
+
+
+def test_results_come_back_in_submit_order(pool):
+    assert pool.submit(frame(1), tag="a", timeout=1)
+    assert pool.submit(frame(2), tag="b", timeout=1)
+    (seq_a, slot_a), (seq_b, slot_b) = take_task(pool), take_task(pool)
+    assert pool.slots[slot_b, 0] == 2
+
+    # The second frame finishes first, but is held back until the first one is in
+    pool.results.put(("result", seq_b, slot_b, "B"))
+    assert pool.get_result(timeout=0.3) is None
+    pool.results.put(("result", seq_a, slot_a, "A"))
+    assert pool.get_result(timeout=1) == ("a", "A")
+    assert pool.get_result(timeout=1) == ("b", "B")
+    assert sorted(pool.free_slots) == [0, 1]
+
+
+def test_abandoned_frame_gives_its_slot_back(pool):
+    assert pool.submit(frame(1), tag="lost", timeout=1)
+    assert pool.submit(frame(2), tag="kept", timeout=1)
+    (seq_lost, slot_lost), (seq_kept, slot_kept) = take_task(pool), take_task(pool)
+    # Both slots are busy, no room for a third frame
+    assert not pool.submit(frame(3), timeout=0.05)
+
+    # The worker holding the first frame never answers
+    pool.results.put(("result", seq_kept, slot_kept, "K"))
+    assert pool.get_result(timeout=2) == ("kept", "K")
+    assert sorted(pool.free_slots) == [0, 1]
+    assert pool.submit(frame(3), timeout=1)
+
+    # A worker that only now reaches the dropped frame's task sees its slot has a new owner
+    assert pool.generations[slot_lost] != seq_lost
+
+    # A late answer for the dropped frame doesn't free its slot a second time
+    pool.results.put(("result", seq_lost, slot_lost, "late"))
+    time.sleep(0.3)
+    assert len(pool.free_slots) == 1
+    assert pool.get_result(timeout=0.1) is None
+
+
+class FullPool:
+    """A detector pool whose ring never has a free slot."""
+    def __init__(self):
+        self.timeouts = []
+
+    def submit(self, frame, tag=None, timeout=None):
+        self.timeouts.append(timeout)
+        time.sleep(timeout)
+        return False
+
+
+def test_vision_manager_drops_frames_the_full_pool_cannot_take():
+    settings = Settings()
+    settings.QUALITY_GATING = False
+    settings.MOTION_GATING = False
+    settings.DETECTION_HISTORY = False
+    settings.DETECTION_LATENCY_BUDGET = 0.05
+    manager = VisionManager(settings)
+    manager.detector_pool = FullPool()
+
+    streams = [SimpleNamespace(camera_id=i, dropped_frames=0, latest_scene=None) for i in range(3)]
+    frame = SimpleNamespace(view=np.zeros((4, 4, 3), dtype=np.uint8))
+    jobs = [(stream, frame, 1, time.time(), None, {}) for stream in streams]
+
+    start = time.monotonic()
+    manager._detect(jobs)
+    # One shared wait for the whole batch, not one per frame
+    assert time.monotonic() - start < 0.2
+    assert manager.detector_pool.timeouts[1:] == [0.0, 0.0]
+    assert [stream.dropped_frames for stream in streams] == [1, 1, 1]
\ No newline at end of file
@@ -0,0 +1,82 @@
+import time
+from types import SimpleNamespace
+import numpy as np
+import pytest
+from config.settings import Settings
+from phase2_vision_system import inference_backends
+from phase2_vision_system.inference_backends import InferenceBackend, OnnxRuntimeBackend, select_backend_name
+
+
+class StaticBatchSession:
+    """Stands in for an onnxruntime session of a model exported with a fixed batch size."""
+    def __init__(self, batch):
+        self.batch = batch
+
+    def run(self, outputs, feed):
+        blob = feed["images"]
+        assert len(blob) == self.batch
+        # Each image's rows carry the image's first pixel value, to check the order
+        marker = blob[:, 0, 0, 0].reshape(-1, 1, 1)
+        return [np.broadcast_to(marker, (self.batch, 3, 85)).copy(),
+                np.broadcast_to(marker, (self.batch, 2, 85)).copy()]
+
+
+@pytest.mark.parametrize("model_batch, frames", [(1, 3), (2, 3), (2, 4), (4, 4)])
+def test_static_batch_model_runs_any_number_of_frames(model_batch, frames):
+    backend = OnnxRuntimeBackend("onnxruntime-cpu", "YOLO_ONNX")
+    backend.session = StaticBatchSession(model_batch)
+    backend.input_name = "images"
+    backend.fixed_batch_size = model_batch
+
+    blob = np.arange(frames, dtype=np.float32).reshape(-1, 1, 1, 1) * np.ones((frames, 3, 8, 8), np.float32)
+    outs = backend.forward(blob)
+
+    assert [out.shape[:2] for out in outs] == [(frames, 3), (frames, 2)]
+    assert outs[0][:, 0, 0].tolist() == list(range(frames))
+
+
+def test_pool_workers_get_the_cached_choice_without_a_benchmark(tmp_path, monkeypatch):
+    settings = Settings()
+    settings.INFERENCE_BACKEND = "auto"
+    settings.BACKEND_CACHE_FILE = tmp_path / "backend.json"
+    inference_backends._save_cache(settings, "onnxruntime-cpu", {})
+    monkeypatch.setattr(inference_backends, "select_backend", lambda *args: pytest.fail("benchmarked"))
+    assert select_backend_name(settings, 80) == "onnxruntime-cpu"
+
+    settings.INFERENCE_BACKEND = "opencv-cpu"
+    assert select_backend_name(settings, 80) == "opencv-cpu"
+
+
+class FakeBackend(InferenceBackend):
+    """Returns empty YOLO rows after a fixed delay and counts its forward passes."""
+    def __init__(self, name, delay, calls):
+        super().__init__()
+        self.name = name
+        self.delay = delay
+        self.calls = calls
+
+    def load(self, settings):
+        return True
+
+    def forward(self, blob):
+        self.calls.append(self.name)
+        time.sleep(self.delay)
+        return [np.zeros((len(blob), 3, 85), np.float32)]
+
+
+def test_fastest_backend_wins_and_the_choice_is_cached(monkeypatch, tmp_path):
+    calls = []
+    monkeypatch.setattr(inference_backends, "BACKENDS", {
+        "slow": lambda: FakeBackend("slow", 0.02, calls),
+        "fast": lambda: FakeBackend("fast", 0.001, calls),
+    })
+    settings = SimpleNamespace(INFERENCE_BACKEND="auto", BACKEND_BENCHMARK_RUNS=2, YOLO_INPUT_SIZE=32,
+                               BACKEND_CACHE_FILE=tmp_path / "backend.json", YOLO_WEIGHTS=tmp_path / "none",
+                               YOLO_ONNX=tmp_path / "none", YOLO_ONNX_INT8=tmp_path / "none")
+
+    assert inference_backends.select_backend(settings, 80).name == "fast"
+    assert calls.count("slow") == calls.count("fast") == 3
+
+    calls.clear()
+    assert inference_backends.select_backend(settings, 80).name == "fast"
+    assert calls == []
\ No newline at end of file
@@ -0,0 +1,45 @@
+import os
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+from PyQt6.QtCore import QSize  # noqa: E402
+from PyQt6.QtGui import QPainter, QPixmap  # noqa: E402
+from PyQt6.QtWidgets import QApplication  # noqa: E402
+from phase2_vision_system.detections import DetectionBatch  # noqa: E402
+from phase2_vision_system.overlay_renderer import OverlayRenderer  # noqa: E402
+
+CLASSES = ("person", "cup")
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+def paint(renderer, batch):
+    canvas = QPixmap(320, 240)
+    painter = QPainter(canvas)
+    renderer.paint(painter, batch, 1.0, QSize(320, 240))
+    painter.end()
+
+
+@pytest.mark.parametrize("style", ["futuristic", "modern", "integrated"])
+def test_new_track_ids_reuse_the_label_sprite(app, style):
+    renderer = OverlayRenderer(style)
+    for track_id in range(20):
+        tracks = [(track_id, "person", 0.81, [40, 60, 50, 80]), (100 + track_id, "cup", 0.5, [150, 90, 20, 20])]
+        paint(renderer, DetectionBatch.from_tracks(tracks, CLASSES, seq=track_id))
+    # One sprite per (label, confidence bucket), however many tracks came and went
+    assert len(renderer.sprites) == 2
+    assert renderer.get_status()["misses"] == 2
+
+
+@pytest.mark.parametrize("style", ["futuristic", "modern", "integrated"])
+def test_labels_are_rendered_once(app, style):
+    renderer = OverlayRenderer(style)
+    tracks = [(1, "person", 0.81, [40, 60, 50, 80]), (2, "cup", 0.5, [150, 90, 20, 20])]
+    for seq in range(5):
+        paint(renderer, DetectionBatch.from_tracks(tracks, CLASSES, seq=seq))
+    assert len(renderer.sprites) == 2
+    assert renderer.get_status()["misses"] == 2
+    assert renderer.get_status()["hits"] == 8
\ No newline at end of file
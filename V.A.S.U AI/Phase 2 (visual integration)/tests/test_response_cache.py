@@ -0,0 +1,50 @@
+from phase1_voice_interface import response_cache
+from phase1_voice_interface.response_cache import ResponseCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+
+def test_key_ignores_case_and_punctuation_but_not_context():
+    cache = ResponseCache()
+    key = cache.key("What is a Cup?", "1 cup", "model", "prompt")
+    assert key == cache.key("what is a cup", "1 cup", "model", "prompt")
+    assert key != cache.key("what is a cup", "2 people", "model", "prompt")
+    assert key != cache.key("what is a cup", "1 cup", "other model", "prompt")
+
+
+def test_entries_expire(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(response_cache, "time", clock)
+    cache = ResponseCache(ttl=60, volatile_ttl=5)
+    assert cache.ttl_for("what is the weather today") == 5
+    assert cache.ttl_for("who wrote hamlet") == 60
+
+    cache.put("a", "Shakespeare.", 60)
+    clock.now += 59
+    assert cache.get("a") == "Shakespeare."
+    clock.now += 2
+    assert cache.get("a") is None
+    assert cache.get_status()["entries"] == 0
+
+
+def test_least_recently_used_is_evicted():
+    cache = ResponseCache(max_bytes=2 * (response_cache.ENTRY_OVERHEAD + 10))
+    cache.put("a", "x" * 10, 60)
+    cache.put("b", "y" * 10, 60)
+    cache.get("a")
+    cache.put("c", "z" * 10, 60)
+    assert cache.get("b") is None
+    assert cache.get("a") == "x" * 10
+    assert cache.get("c") == "z" * 10
+
+
+def test_survives_a_restart(tmp_path):
+    path = tmp_path / "cache.json"
+    ResponseCache(path).put("a", "Shakespeare.", 60)
+    assert ResponseCache(path).get("a") == "Shakespeare."
\ No newline at end of file
@@ -0,0 +1,33 @@
+from phase2_vision_system.detections import DetectionBatch
+from phase2_vision_system.scene_summary import SceneSummary, NOTHING
+
+CLASSES = ("person", "bicycle", "cup")
+
+
+def batch(class_ids, camera_id=0, scene=None):
+    boxes = [[10 * i, 10, 20, 20] for i in range(len(class_ids))]
+    return DetectionBatch(boxes, [0.9] * len(class_ids), class_ids, CLASSES, camera_id=camera_id, scene=scene)
+
+
+def test_labels_need_consecutive_hits_and_misses():
+    summary = SceneSummary(enter_hits=2, exit_misses=3)
+    summary.update(batch([0, 0, 2]))
+    assert summary.get_context() == NOTHING
+    summary.update(batch([0, 0, 2]))
+    assert summary.get_context() == "1 cup, 2 people"
+    summary.update(batch([0, 0]))
+    summary.update(batch([0, 0]))
+    assert summary.get_context() == "1 cup, 2 people"
+    summary.update(batch([0, 0]))
+    assert summary.get_context() == "2 people"
+
+
+def test_scene_cut_drops_the_camera_at_once():
+    summary = SceneSummary(enter_hits=2, exit_misses=3)
+    for _ in range(2):
+        summary.update(batch([2], camera_id=0))
+        summary.update(batch([0], camera_id=1))
+    assert summary.get_context() == "1 cup, 1 person"
+
+    summary.update(batch([], camera_id=0, scene={"scene_cut": True}))
+    assert summary.get_context() == "1 person"
\ No newline at end of file
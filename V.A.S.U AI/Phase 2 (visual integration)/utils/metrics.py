@@ -0,0 +1,104 @@
+import functools
+import threading
+import time
+from collections import deque
+
+
+class RollingHistogram:
+    """Keeps the most recent samples (milliseconds); percentiles are computed on demand."""
+    def __init__(self, size=512):
+        self.samples = deque(maxlen=size)
+        self.count = 0
+
+    def add(self, value):
+        # deque.append is atomic, so the hot path needs no lock
+        self.samples.append(value)
+        self.count += 1
+
+    def snapshot(self):
+        values = sorted(self.samples)
+        if not values:
+            return {"count": self.count}
+        n = len(values)
+        return {
+            "count": self.count,
+            "last_ms": round(self.samples[-1], 2),
+            "mean_ms": round(sum(values) / n, 2),
+            "p50_ms": round(values[int(n * 0.50)], 2),
+            "p95_ms": round(values[min(n - 1, int(n * 0.95))], 2),
+            "p99_ms": round(values[min(n - 1, int(n * 0.99))], 2)
+        }
+
+
+class Span:
+    """Times a block: `with metrics.span("detector.forward"): ...`"""
+    __slots__ = ("histogram", "start")
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.add((time.perf_counter() - self.start) * 1000)
+
+
+class Metrics:
+    """Process-wide timing spans, counters and rolling histograms."""
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.histograms = {}
+        self.counters = {}
+
+    def histogram(self, name):
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            with self.lock:
+                histogram = self.histograms.setdefault(name, RollingHistogram())
+        return histogram
+
+    def span(self, name):
+        return Span(self.histogram(name))
+
+    def record(self, name, seconds):
+        self.histogram(name).add(seconds * 1000)
+
+    def increment(self, name, amount=1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def snapshot(self, *prefixes):
+        """Spans and counters, optionally only those starting with one of `prefixes`."""
+        def wanted(name):
+            return not prefixes or name.startswith(prefixes)
+
+        with self.lock:
+            histograms = dict(self.histograms)
+            counters = dict(self.counters)
+        return {
+            "spans": {name: h.snapshot() for name, h in sorted(histograms.items()) if wanted(name)},
+            "counters": {name: value for name, value in sorted(counters.items()) if wanted(name)}
+        }
+
+
+_metrics = Metrics()
+
+
+def get_metrics():
+    """Returns the shared Metrics registry."""
+    return _metrics
+
+
+def timed(name):
+    """Decorator version of span(), for whole methods such as update_frame."""
+    def decorator(func):
+        histogram = _metrics.histogram(name)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with Span(histogram):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
\ No newline at end of file
@@ -0,0 +1,162 @@
+import threading
+import time
+from contextlib import contextmanager
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Taken when the launcher first imports this module, i.e. right after Python starts
+LAUNCH_TIME = time.perf_counter()
+
+
+class StartupTask:
+    """One subsystem brought up in the background (camera, detector, mic, AI...)."""
+    def __init__(self, name, func, after):
+        self.name = name
+        self.func = func
+        self.after = after
+        self.ready = threading.Event()
+        self.ok = False
+        self.result = None
+        self.started_at = None
+        self.finished_at = None
+
+
+class Startup:
+    """
+    Brings subsystems up on background threads so the window can be shown
+    straight away. Each task gets a readiness event; listeners are called
+    with (name, ok) as tasks finish, and once everything is done a timing
+    report (imports, milestones, tasks) goes to the log.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.tasks = {}
+        self.listeners = []
+        self.phases = []      # (name, start, end) relative to launch, synchronous steps
+        self.milestones = []  # (name, time) relative to launch
+        self.budget = None
+        self.reported = False
+
+    def since_launch(self):
+        return time.perf_counter() - LAUNCH_TIME
+
+    @contextmanager
+    def phase(self, name):
+        """Times a synchronous step such as an import: `with startup.phase("import gui"): ...`"""
+        start = self.since_launch()
+        try:
+            yield
+        finally:
+            self.phases.append((name, start, self.since_launch()))
+
+    def mark(self, name):
+        self.milestones.append((name, self.since_launch()))
+
+    def subscribe(self, callback):
+        """callback(name, ok) is called from the task's thread when it finishes."""
+        self.listeners.append(callback)
+
+    def add(self, name, func, after=()):
+        """Registers a task; it runs once start() is called and the tasks in `after` are done."""
+        self.tasks[name] = StartupTask(name, func, tuple(after))
+
+    def start(self, budget=None):
+        self.budget = budget
+        for task in list(self.tasks.values()):
+            if task.started_at is None:
+                task.started_at = -1  # Claimed, the thread sets the real time
+                threading.Thread(target=self._run, args=(task,), name=f"startup-{task.name}", daemon=True).start()
+
+    def _run(self, task):
+        # Dependencies only order the work, the task itself decides what a failed one means
+        for dependency in task.after:
+            self.tasks[dependency].ready.wait()
+
+        task.started_at = self.since_launch()
+        try:
+            task.result = task.func()
+            task.ok = task.result is not False
+        except Exception as e:
+            logger.error(f"Startup task '{task.name}' failed: {e}")
+        task.finished_at = self.since_launch()
+        task.ready.set()
+
+        for callback in self.listeners:
+            try:
+                callback(task.name, task.ok)
+            except Exception as e:
+                logger.warning(f"Startup listener failed: {e}")
+
+        with self.lock:
+            done = all(t.ready.is_set() for t in self.tasks.values()) and not self.reported
+            if done:
+                self.reported = True
+        if done:
+            self.report()
+
+    def is_ready(self, name):
+        task = self.tasks.get(name)
+        return task is not None and task.ready.is_set()
+
+    def wait(self, name, timeout=None):
+        """Blocks until the task is done; returns False on timeout."""
+        task = self.tasks.get(name)
+        return task is not None and task.ready.wait(timeout)
+
+    def wait_all(self, timeout=None):
+        """Used on shutdown so nothing is torn down while a task is still bringing it up."""
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        for task in list(self.tasks.values()):
+            remaining = None if deadline is None else max(0.0, deadline - time.perf_counter())
+            if not task.ready.wait(remaining):
+                return False
+        return True
+
+    def result(self, name):
+        task = self.tasks.get(name)
+        return task.result if task else None
+
+    def get_report(self):
+        tasks = {
+            t.name: {
+                "ok": t.ok,
+                "started_s": round(t.started_at, 3) if t.finished_at is not None else None,
+                "duration_s": round(t.finished_at - t.started_at, 3) if t.finished_at is not None else None,
+                "ready_s": round(t.finished_at, 3) if t.finished_at is not None else None
+            }
+            for t in self.tasks.values()
+        }
+        finished = [t.finished_at for t in self.tasks.values() if t.finished_at is not None]
+        return {
+            "phases": {name: round(end - start, 3) for name, start, end in self.phases},
+            "milestones": {name: round(at, 3) for name, at in self.milestones},
+            "tasks": tasks,
+            "all_ready_s": round(max(finished), 3) if finished else None,
+            "budget_s": self.budget
+        }
+
+    def report(self):
+        report = self.get_report()
+        lines = ["Startup timing (seconds since launch):"]
+        for name, duration in report["phases"].items():
+            lines.append(f"  {name:<20} {duration:>7.3f} s")
+        for name, at in report["milestones"].items():
+            lines.append(f"  {name:<20} at {at:>5.3f} s")
+        for name, task in report["tasks"].items():
+            state = "ok" if task["ok"] else "FAILED"
+            lines.append(f"  {name:<20} {task['duration_s']:>7.3f} s  ready at {task['ready_s']:.3f} s  [{state}]")
+        lines.append(f"  {'all ready':<20} at {report['all_ready_s']:>5.3f} s")
+        logger.info("\n".join(lines))
+
+        if self.budget and report["all_ready_s"] > self.budget:
+            logger.warning(f"Cold start took {report['all_ready_s']:.2f} s, over the {self.budget:.1f} s budget")
+        return report
+
+
+_startup = Startup()
+
+
+def get_startup():
+    """Returns the shared Startup orchestrator (launcher and GUI use the same one)."""
+    return _startup
\ No newline at end of file
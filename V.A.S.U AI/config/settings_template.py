@@ -24,6 +24,13 @@ class Settings:
         # 📷 CAMERA SETTINGS
         # ==========================================
         self.CAMERA_INDEX = 0      # 0 is usually the default webcam
+        # Sources: webcam index, video file, image folder or "synthetic", e.g. [0, 1, "clips/lobby.mp4"]
+        self.CAMERA_SOURCES = [self.CAMERA_INDEX]
+        # Override without editing this file:  VASU_SOURCES="synthetic" python run_final_gui.py
+        if os.environ.get("VASU_SOURCES"):
+            self.CAMERA_SOURCES = [s.strip() for s in os.environ["VASU_SOURCES"].split(",")]
+        self.PLAYBACK_SPEED = 1.0  # Recorded sources: 1.0 = real-time, 0 = as fast as possible
+        self.PLAYBACK_LOOP = True  # Restart files/folders when they end
         self.FRAME_WIDTH = 640     # Lower resolution = faster processing
         self.FRAME_HEIGHT = 480
         self.FPS = 30
@@ -34,11 +41,55 @@ class Settings:
         self.YOLO_CONFIG = self.MODELS_DIR / "yolov4-tiny.cfg"
         self.YOLO_WEIGHTS = self.MODELS_DIR / "yolov4-tiny.weights"
         self.YOLO_CLASSES = self.MODELS_DIR / "coco.names"
+        self.YOLO_INPUT_SIZE = 416         # Network input (256, 320, 416 or 608)
+        self.ADAPTIVE_RESOLUTION = True    # Change input size at runtime to meet the latency budget
+        self.YOLO_ONNX = self.MODELS_DIR / "yolov4-tiny.onnx"            # Optional ONNX Runtime export
+        self.YOLO_ONNX_INT8 = self.MODELS_DIR / "yolov4-tiny.int8.onnx"  # Optional INT8-quantized export
+        self.INFERENCE_BACKEND = "auto"    # "auto" benchmarks all backends at startup, or e.g. "opencv-cpu"
+        self.BACKEND_BENCHMARK_RUNS = 5    # Timed forward passes per backend
+        self.BACKEND_CACHE_FILE = self.DATA_DIR / "inference_backend.json"
         
         # Detection Thresholds
         self.CONFIDENCE_THRESHOLD = 0.5  # Minimum probability (50%) to show a box
         self.NMS_THRESHOLD = 0.4         # Lower value = less overlapping boxes
 
+        # Tracking (YOLO runs every Nth frame, the tracker fills the gaps)
+        self.DETECTION_INTERVAL = 3        # Run the detector on every 3rd captured frame
+        self.ADAPTIVE_DETECTION = True     # Stretch the interval while the scene is stable
+        self.MAX_DETECTION_INTERVAL = 10   # Upper bound for the adaptive interval
+
+        # Motion gating (skip YOLO while the room is static)
+        self.MOTION_GATING = True
+        self.MOTION_THRESHOLD = 0.01       # Fraction of pixels that must change (1%)
+        self.MOTION_PIXEL_DELTA = 15       # Grey-level change that counts as motion
+        self.MOTION_REFRESH_SECONDS = 5.0  # Force a fresh detection every K seconds
+
+        # Scene quality (skip YOLO on frames too dark or blurred to be useful)
+        self.QUALITY_GATING = True
+        self.SCENE_ANALYSIS_WIDTH = 160    # Analysis image width, shared with the motion gate
+        self.DARK_THRESHOLD = 40           # Smoothed mean grey level below which the room is too dark
+        self.BLUR_RATIO = 0.5              # Frames less sharp than half the usual count as motion blur
+        self.SCENE_CUT_THRESHOLD = 40      # Mean grey-level jump between frames that counts as a scene cut
+
+        # Multi-process detection (0 = single in-process ObjectDetector)
+        self.DETECTOR_WORKERS = 0          # Worker processes, each with its own YOLO net
+        self.DETECTOR_SLOTS = 0            # Shared-memory frame slots (0 = 2 per worker)
+
+        # Latency budget: adaptive resolution keeps one frame's share of a pass inside it,
+        # multi-camera batching then fits as many frames per pass as the budget allows
+        self.DETECTION_LATENCY_BUDGET = 0.1  # Seconds per forward pass
+
+        # Detection history ("when did you last see...", "how many people this hour")
+        self.DETECTION_HISTORY = True
+        self.HISTORY_CAPACITY = 100000     # Sightings kept in memory (~2.4 MB)
+        self.HISTORY_RESOLUTION = 1.0      # Record each tracked object at most once per second
+        self.HISTORY_SPILL_SECONDS = 60.0  # Append new sightings to data/history/ this often
+        self.HISTORY_SPILL_RESOLUTION = 10.0  # Seconds per object kept on disk (0 = keep everything)
+
+        # Visual context summary (debounced label counts for the AI prompt)
+        self.SUMMARY_ENTER_HITS = 2        # Detector results in a row before a label/count is reported
+        self.SUMMARY_EXIT_MISSES = 3       # Detector results without it before a label is dropped
+
         # Face Recognition Data Path
         self.FACE_ENCODINGS_FILE = self.FACES_DIR / "encodings.pickle"
 
@@ -48,11 +99,24 @@ class Settings:
         # Text-to-Speech (TTS)
         self.SPEECH_RATE = 170     # Speed of talking (default is ~200)
         self.SPEECH_VOLUME = 1.0   # Volume (0.0 to 1.0)
+        self.TTS_CACHE = True         # Play common phrases from pre-synthesized WAVs in data/tts/
+        self.TTS_CACHE_MB = 50        # Disk space for the cache (least recently played dropped first)
+        self.TTS_CACHE_ADMIT_AFTER = 2  # Cache other replies once they have been spoken this often
         
         # Speech Recognition
         self.ENERGY_THRESHOLD = 300  # Adjust for background noise (higher = less sensitive)
         self.PAUSE_THRESHOLD = 0.8   # Seconds of silence before processing
 
+        # Continuous capture (one open mic stream, speech cut into utterances as you pause)
+        self.AUDIO_BUFFER_SECONDS = 30.0      # Ring buffer of raw mic audio
+        self.VAD_PREROLL_SECONDS = 0.3        # Audio kept from just before speech was detected
+        self.VAD_MIN_SPEECH_SECONDS = 0.15    # Voiced audio needed before an utterance starts
+        self.VAD_MAX_UTTERANCE_SECONDS = 10.0 # Longer speech is cut and sent in pieces
+
+        # Barge-in (start talking while VASU speaks to cut it short)
+        self.BARGE_IN = True
+        self.BARGE_IN_RATIO = 3.0             # How much louder than usual speech must be while VASU talks
+
         # ==========================================
         # 🧠 ARTIFICIAL INTELLIGENCE (Google Gemini)
         # ==========================================
@@ -61,6 +125,15 @@ class Settings:
         
         # Model Selection ('gemini-1.5-flash' is fast and ideal for assistants)
         self.GEMINI_MODEL = "gemini-2.5-pro"
+        self.AI_STREAMING = True          # Speak the answer sentence by sentence while it is being generated
+        self.AI_SENTENCE_MAX_CHARS = 200  # Longer sentences are cut at a comma for speech
+
+        # Response cache (repeated questions are answered without calling Gemini)
+        self.AI_CACHE = True
+        self.AI_CACHE_TTL = 86400          # Seconds an answer stays valid (1 day)
+        self.AI_CACHE_VOLATILE_TTL = 300   # For time-sensitive questions (weather, news, prices...)
+        self.AI_CACHE_MB = 1.0             # Memory for cached answers (least recently used dropped first)
+        self.AI_CACHE_PERSIST = True       # Keep the cache in data/ai_cache.json across restarts
         
         # System Persona (Instructions for how VASU should act)
         self.SYSTEM_PROMPT = (
@@ -75,4 +148,8 @@ class Settings:
         self.THEME_COLOR = "#00ffcc"  # Cyan/Teal (Iron Man HUD style)
         self.BG_COLOR = "#0d0d0d"     # Almost Black
         self.TEXT_COLOR = "#ffffff"   # White
-        self.ERROR_COLOR = "#ff3333"  # Red
\ No newline at end of file
+        self.ERROR_COLOR = "#ff3333"  # Red
+        self.SHOW_DIAGNOSTICS = False # Timing panel on start-up (toggle any time with F3)
+        self.STARTUP_BUDGET = 5.0     # Seconds until every subsystem is ready (logged as a warning if exceeded)
+        self.SHUTDOWN_WAIT = 3.0      # Seconds closing the window waits for subsystems still starting (a hung camera or mic is abandoned)
+        self.LOG_CONSOLE_LINES = 500  # Chat log lines kept on screen (everything also goes to logs/vasu.log)
\ No newline at end of file